@@ -0,0 +1,248 @@
+"""
+Micro-benchmarks for the parsers, every tool action and MCP call dispatch, run offline
+against the synthetic Spotify stand-in (spotify_mcp.spotify.replay).
+
+    uv run python benchmarks/bench.py               # run and compare with benchmarks/baseline.json
+    uv run python benchmarks/bench.py --save        # run and store the results as the new baseline
+    uv run python benchmarks/bench.py -k GetInfo    # only cases whose name contains 'GetInfo'
+
+A case regresses when its median time exceeds the baseline median by more than --threshold;
+the run then exits with status 1. Baselines are machine specific: record them on the machine
+(or CI runner) that does the comparison.
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Placeholder credentials and no network for anything that reaches the server's own client,
+# and no rate limit so paging is measured, not throttled.
+os.environ.update({
+    "SPOTIFY_CLIENT_ID": "offline",
+    "SPOTIFY_CLIENT_SECRET": "offline",
+    "SPOTIFY_REDIRECT_URI": "http://127.0.0.1:8080/callback",
+    "SPOTIFY_MCP_HTTP_WARM_UP": "false",
+    "SPOTIFY_MCP_RATE_LIMIT": "1000000",
+    "SPOTIFY_MCP_RATE_BURST": "1000000",
+    "SPOTIFY_MCP_LIBRARY_DB": ":memory:",
+})
+
+from spotify_mcp import log, server, utils
+from spotify_mcp.spotify import Spotify, SpotifyClient
+from spotify_mcp.spotify.playlist_diff import plan_sync
+from spotify_mcp.spotify.replay import FixtureSet, Replay
+from spotify_mcp.tools import GetInfo, Playback, Playlist, Queue, Recommend, Search, Stats, ToolRegistry, User
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[[], Any]
+    setup: Optional[Callable[[], None]] = None
+    number: int = 100
+    repeat: int = 7
+
+
+def measure(case: Case, repeat: Optional[int] = None) -> Dict[str, float]:
+    """Seconds per call: min and median over `repeat` rounds of `number` calls, setup excluded."""
+    # One untimed warm-up call (imports, first-use caches, lazily opened connections).
+    if case.setup is not None:
+        case.setup()
+    case.fn()
+    rounds = []
+    for _ in range(repeat or case.repeat):
+        elapsed = 0.0
+        for _ in range(case.number):
+            if case.setup is not None:
+                case.setup()
+            started = time.perf_counter()
+            case.fn()
+            elapsed += time.perf_counter() - started
+        rounds.append(elapsed / case.number)
+    return {'min': min(rounds), 'median': statistics.median(rounds)}
+
+
+class Bench:
+    """Offline Spotify facade, tools and registry wired to a synthetic FixtureSet."""
+
+    def __init__(self, latency: float = 0.0, playlist_size: int = 10_000) -> None:
+        self.fixtures = FixtureSet.synthetic(playlist_size=playlist_size)
+        self.client = SpotifyClient(
+            client_id="offline",
+            client_secret="offline",
+            redirect_uri="http://127.0.0.1:8080/callback",
+            transport=Replay(self.fixtures, latency=latency, seed=0)
+        )
+        self.spotify = Spotify(client=self.client)
+        self.spotify.library.sync()
+        self.spotify.search.recommender.update()
+        self.registry = ToolRegistry([
+            GetInfo(self.spotify),
+            Playback(self.spotify),
+            Playlist(self.spotify),
+            Queue(self.spotify),
+            Recommend(self.spotify),
+            Search(self.spotify),
+            Stats(self.spotify),
+            User(self.spotify),
+        ])
+        # handle_call_tool dispatches through the module-level registry.
+        server.registry = self.registry
+        self.loop = asyncio.new_event_loop()
+
+        fx = self.fixtures
+        self.track_id = fx.playlist_items['big'][0]['track']['id']
+        self.album_id = fx.playlist_items['big'][0]['track']['album']['id']
+        self.artist_id = fx.playlist_items['big'][0]['track']['artists'][0]['id']
+        self.small_playlist = next(p for p in fx.playlists if p != 'big')
+        self.batch_ids = [item['track']['id'] for item in fx.playlist_items['big'][:100]]
+        self.raw_search = fx.respond("GET", "search", None, {'q': "night", 'type': "track,album,artist,playlist", 'limit': 50})
+        self.raw_track = fx.tracks[self.track_id]
+        self.raw_playlist_items = fx.playlist_items['big']
+        self.big_ids = [item['track']['id'] for item in fx.playlist_items['big']]
+        edited = self.big_ids[:100] + self.big_ids[101:5000] + [self.big_ids[100]] + self.big_ids[5000:]
+        self.big_ids_edited = edited[:7000] + [self.track_id] + edited[7005:]
+        self._player = dict(fx.player)
+        self._queue = list(fx.queue)
+
+    def cold(self) -> None:
+        """Forget everything cached client-side, so a call goes back to the (stand-in) API."""
+        for cache in (self.client.metadata_cache, self.client.search_cache, self.client.playlist_cache):
+            cache.clear()
+        self.spotify.playback.snapshot.invalidate()
+
+    def reset_player(self) -> None:
+        self.fixtures.player.update(self._player)
+        self.fixtures.queue[:] = self._queue
+        self.spotify.playback.snapshot.invalidate()
+
+    def action(self, tool: str, **arguments) -> Callable[[], Any]:
+        handler, validated = self.registry.resolve(tool, arguments)
+        return lambda: handler(validated)
+
+    def dispatch(self, tool: str, **arguments) -> Callable[[], Any]:
+        return lambda: self.loop.run_until_complete(server.handle_call_tool(tool, arguments))
+
+    def cases(self) -> List[Case]:
+        cold, reset = self.cold, self.reset_player
+        return [
+            Case("parse_search_results[50x4]", lambda: utils.parse_search_results(self.raw_search, "track,album,artist,playlist"), number=200),
+            Case("parse_track[detailed]", lambda: utils.parse_track(self.raw_track, detailed=True), number=5000),
+            Case("parse_playlist_tracks[10k]", lambda: utils.parse_playlist_tracks(self.raw_playlist_items), number=5),
+
+            Case("plan_sync[10k, 3 edits]", lambda: plan_sync(self.big_ids, self.big_ids_edited), number=10),
+
+            Case("GetInfo.get[track]", self.action("SpotifyGetInfo", action="get", item_id=self.track_id, qtype="track"), cold),
+            Case("GetInfo.get[album]", self.action("SpotifyGetInfo", action="get", item_id=self.album_id, qtype="album"), cold),
+            Case("GetInfo.get[artist]", self.action("SpotifyGetInfo", action="get", item_id=self.artist_id, qtype="artist"), cold, number=20),
+            Case("GetInfo.get[playlist 10k, cold]", self.action("SpotifyGetInfo", action="get", item_id="big", qtype="playlist"), cold, number=1, repeat=5),
+            Case("GetInfo.get[playlist 10k, same snapshot]", self.action("SpotifyGetInfo", action="get", item_id="big", qtype="playlist"),
+                 self.client.metadata_cache.clear, number=5),
+            Case("GetInfo.get[batch 100 tracks]", self.action("SpotifyGetInfo", action="get", item_ids=self.batch_ids, qtype="track"), cold, number=20),
+            Case("Playback.get", self.action("SpotifyPlayback", action="get"), reset),
+            Case("Playback.start", self.action("SpotifyPlayback", action="start", track_id=self.track_id), reset),
+            Case("Playback.pause", self.action("SpotifyPlayback", action="pause"), reset),
+            Case("Playback.skip[1]", self.action("SpotifyPlayback", action="skip", num_skips=1), reset),
+            Case("Playback.skip[5]", self.action("SpotifyPlayback", action="skip", num_skips=5), reset),
+            Case("Playlist.add", self.action("SpotifyPlaylist", action="add", playlist_id=self.small_playlist, items=[self.track_id])),
+            Case("Playlist.remove", self.action("SpotifyPlaylist", action="remove", playlist_id=self.small_playlist, items=[self.track_id])),
+            Case("Queue.get", self.action("SpotifyQueue", action="get"), reset),
+            Case("Queue.add", self.action("SpotifyQueue", action="add", track_id=self.track_id), reset),
+            Case("Search.search[spotify, 50]", self.action("SpotifySearch", action="search", query="midnight city", qtype="track,album", limit=50), cold, number=50),
+            Case("Recommend.get[track seed]", self.action("SpotifyRecommend", action="get", track_ids=[self.track_id])),
+            Case("Recommend.get[artist seed]", self.action("SpotifyRecommend", action="get", artist_ids=[self.artist_id])),
+            Case("Search.search[library]", self.action("SpotifySearch", action="search", query="midnight", qtype="track,playlist", source="library")),
+            Case("Stats.get", self.action("SpotifyStats", action="get")),
+            Case("User.get", self.action("SpotifyUser", action="get", user="offline"), cold, number=50),
+
+            Case("handle_call_tool[invalid action]", self.dispatch("SpotifyGetInfo", action="nope", item_id=self.track_id), number=200),
+            Case("handle_call_tool[GetInfo cached]", self.dispatch("SpotifyGetInfo", action="get", item_id=self.track_id, qtype="track"), number=200),
+        ]
+
+    def close(self) -> None:
+        self.loop.close()
+        self.spotify.library.close()
+        self.client.close()
+        server.pool.close()
+
+
+def fmt(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", help="only run cases whose name contains this text")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file (default: %(default)s)")
+    parser.add_argument("--save", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown over the baseline median, as a fraction (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, help="override the number of rounds per case")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated API round trip in milliseconds (default: 0)")
+    args = parser.parse_args(argv)
+
+    # The server's logging pipeline at its default level, written nowhere: the cost of the
+    # log calls on each path is part of what is measured.
+    listener = log.configure(path=os.devnull)
+
+    baseline: Dict[str, Any] = {}
+    if not args.save and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('latency_ms', 0.0) != args.latency:
+            print(f"warning: baseline was recorded with --latency {baseline.get('latency_ms', 0.0)}", file=sys.stderr)
+
+    bench = Bench(latency=args.latency / 1000)
+    results: Dict[str, Dict[str, float]] = {}
+    regressions = []
+    try:
+        for case in bench.cases():
+            if args.filter and args.filter not in case.name:
+                continue
+            results[case.name] = timing = measure(case, args.repeat)
+            line = f"{case.name:<44} {fmt(timing['median']):>10}  (min {fmt(timing['min'])})"
+            if (base := baseline.get('results', {}).get(case.name)) is not None:
+                change = timing['median'] / base['median'] - 1
+                line += f"  {change:+.0%} vs baseline"
+                if change > args.threshold:
+                    regressions.append(case.name)
+                    line += "  REGRESSION"
+            print(line, flush=True)
+    finally:
+        bench.close()
+        listener.stop()
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({
+                'recorded_at': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                'python': platform.python_version(),
+                'machine': platform.platform(),
+                'latency_ms': args.latency,
+                'results': results,
+            }, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    elif not baseline:
+        print(f"No baseline at {args.baseline}; run with --save to record one.")
+
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Startup benchmark: launches the stdio server as an MCP host would and times
+
+- initialize: from process start to the `initialize` response,
+- list_tools: from process start to the first `tools/list` response,
+
+alongside a bare interpreter start for reference. No Spotify credentials or network are needed.
+
+    uv run python benchmarks/startup.py                  # compare with benchmarks/startup-baseline.json
+    uv run python benchmarks/startup.py --save           # store this run as the baseline
+
+Exits with status 1 when a median is more than --threshold slower than the baseline.
+"""
+import argparse
+from datetime import datetime, timezone
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "startup-baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+SERVER = "import spotify_mcp; spotify_mcp.main()"
+
+ENV = {
+    "SPOTIFY_CLIENT_ID": "offline",
+    "SPOTIFY_CLIENT_SECRET": "offline",
+    "SPOTIFY_REDIRECT_URI": "http://127.0.0.1:8080/callback",
+    "SPOTIFY_MCP_HTTP_WARM_UP": "false",
+}
+
+def _send(proc: subprocess.Popen, message: Dict[str, Any]) -> None:
+    proc.stdin.write((json.dumps(message) + "\n").encode())
+    proc.stdin.flush()
+
+def _receive(proc: subprocess.Popen, request_id: int) -> Dict[str, Any]:
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"server exited before answering request {request_id}: {proc.stderr.read().decode()[-2000:]}")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            if "error" in message:
+                raise RuntimeError(f"request {request_id} failed: {message['error']}")
+            return message
+
+
+def run_once() -> Dict[str, float]:
+    """Seconds from spawn to the initialize response and to the first tools/list response."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", SERVER],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        env={**os.environ, **ENV},
+    )
+    try:
+        _send(proc, {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "startup-benchmark", "version": "0"},
+        }})
+        _receive(proc, 1)
+        initialized = time.perf_counter() - started
+        _send(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        _send(proc, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools = _receive(proc, 2)["result"]["tools"]
+        listed = time.perf_counter() - started
+        if not tools:
+            raise RuntimeError("server listed no tools")
+    finally:
+        proc.kill()
+        proc.wait()
+    return {'initialize': initialized, 'list_tools': listed}
+
+
+def interpreter_start() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return time.perf_counter() - started
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--runs", type=int, default=10, help="server launches to time (default: %(default)s)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file (default: %(default)s)")
+    parser.add_argument("--save", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown over the baseline median, as a fraction (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    baseline: Dict[str, Any] = {}
+    if not args.save and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    interpreter_start()  # warm the OS file cache before timing
+    samples: Dict[str, List[float]] = {'interpreter': [], 'initialize': [], 'list_tools': []}
+    for _ in range(args.runs):
+        samples['interpreter'].append(interpreter_start())
+        for name, seconds in run_once().items():
+            samples[name].append(seconds)
+
+    results = {name: {'min': min(values), 'median': statistics.median(values)} for name, values in samples.items()}
+    regressions = []
+    for name, timing in results.items():
+        line = f"{name:<12} {timing['median'] * 1e3:8.1f} ms  (min {timing['min'] * 1e3:.1f} ms)"
+        if name != 'interpreter' and (base := baseline.get('results', {}).get(name)) is not None:
+            change = timing['median'] / base['median'] - 1
+            line += f"  {change:+.0%} vs baseline"
+            if change > args.threshold:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({
+                'recorded_at': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                'python': platform.python_version(),
+                'machine': platform.platform(),
+                'results': results,
+            }, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+
+    if regressions:
+        print(f"Startup slower than baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import json
+import os
+from typing import Any, Literal, Optional
+
+try:
+    import orjson
+except ImportError:  # optional: pip install spotify-mcp[fast]
+    orjson = None
+
+ResponseFormat = Literal['compact', 'pretty']
+
+class ResponseEncoder:
+    """
+    Serializes tool results to JSON text.
+
+    'compact' drops indentation and whitespace and keeps non-ASCII characters as-is, which cuts
+    payload size on the stdio pipe and tokens in the model context. 'pretty' is indented
+    with two spaces. If orjson is installed it is used for both, otherwise the stdlib encoder,
+    set up to produce the same text (floats below 1e-4 aside, which the stdlib writes as e.g.
+    1e-05 and orjson as 0.00001).
+    """
+
+    def __init__(self, format: Optional[ResponseFormat] = None, backend: Optional[str] = None) -> None:
+        """
+        Args:
+            format: Default output format. If None, reads SPOTIFY_MCP_RESPONSE_FORMAT from the
+                environment, falling back to 'compact'.
+            backend: 'orjson' or 'json'. If None, uses orjson when it is installed.
+        """
+        format = format or os.getenv("SPOTIFY_MCP_RESPONSE_FORMAT", "compact")
+        if format not in ('compact', 'pretty'):
+            raise ValueError(f"unknown response format {format}")
+        if backend is None:
+            backend = 'orjson' if orjson is not None else 'json'
+        if backend == 'orjson' and orjson is None:
+            raise ValueError("orjson backend requested but orjson is not installed")
+        if backend not in ('orjson', 'json'):
+            raise ValueError(f"unknown JSON backend {backend}")
+        self.format: ResponseFormat = format
+        self.backend = backend
+
+    def encode(self, data: Any, format: Optional[ResponseFormat] = None) -> str:
+        pretty = (format or self.format) == 'pretty'
+        if self.backend == 'orjson':
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+        if pretty:
+            return json.dumps(data, indent=2, separators=(',', ': '), ensure_ascii=False)
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+encoder = ResponseEncoder()
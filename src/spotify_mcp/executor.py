@@ -0,0 +1,132 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import functools
+import os
+from typing import Any, Callable, Optional
+import warnings
+
+import anyio
+from mcp.server import Server, request_ctx
+from mcp.server.models import InitializationOptions
+from mcp.server.session import ServerSession
+from mcp.shared.context import RequestContext
+from mcp.shared.exceptions import McpError
+from mcp.shared.session import RequestResponder
+import mcp.types as types
+
+from .log import get_logger
+
+DEFAULT_MAX_WORKERS = 8
+
+logger = get_logger("server")
+
+def request_meta(message: RequestResponder, req: Any) -> Optional[types.RequestParams.Meta]:
+    """
+    The request's `_meta`. mcp 1.0 declares it as a private attribute of the params, so the
+    session never fills `request_meta` and the value ends up among the params' extra fields.
+    """
+    if message.request_meta is not None:
+        return message.request_meta
+    params = getattr(req, 'params', None)
+    if (meta := getattr(params, 'meta', None)) is not None:
+        return meta
+    raw = (getattr(params, 'model_extra', None) or {}).get('_meta')
+    return types.RequestParams.Meta.model_validate(raw) if isinstance(raw, dict) else None
+
+
+class ToolExecutor:
+    """Runs blocking tool actions on a bounded worker pool so the event loop stays responsive."""
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """
+        Args:
+            max_workers: Maximum number of tool calls executing at once. If None, reads
+                SPOTIFY_MCP_MAX_WORKERS from the environment, falling back to DEFAULT_MAX_WORKERS.
+        """
+        if max_workers is None:
+            max_workers = int(os.getenv("SPOTIFY_MCP_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="spotify-mcp")
+
+    async def run(self, handler: Callable[..., Any], *args, **kwargs) -> Any:
+        """Execute a tool action handler on the worker pool and await its result."""
+        loop = asyncio.get_running_loop()
+        # Like asyncio.to_thread, run in a copy of the caller's context (see metrics.current_call).
+        call = functools.partial(contextvars.copy_context().run, handler, *args, **kwargs)
+        return await loop.run_in_executor(self._pool, call)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+class ConcurrentServer(Server):
+    """
+    MCP server that handles each incoming request in its own task.
+
+    The stock `Server.run` awaits every handler before reading the next message, so a slow
+    tool call delays everything queued behind it. Here requests are spawned into a task group
+    and responses are sent as each one finishes; notifications are still handled in order.
+
+    This mirrors mcp 1.0's `Server.run` and `RequestContext`, which later releases changed;
+    pyproject.toml pins mcp below 1.1 for that reason.
+    """
+
+    async def run(
+        self,
+        read_stream,
+        write_stream,
+        initialization_options: InitializationOptions,
+        raise_exceptions: bool = False,
+    ):
+        with warnings.catch_warnings(record=True) as w:
+            async with ServerSession(
+                read_stream, write_stream, initialization_options
+            ) as session:
+                async with anyio.create_task_group() as tg:
+                    async for message in session.incoming_messages:
+                        logger.debug("Received message: %s", message)
+
+                        match message:
+                            case RequestResponder(request=types.ClientRequest(root=req)):
+                                tg.start_soon(self._handle_request, message, req, session, raise_exceptions)
+                            case types.ClientNotification(root=notify):
+                                await self._handle_notification(notify)
+
+                    for warning in w:
+                        logger.info("Warning: %s: %s", warning.category.__name__, warning.message)
+
+    async def _handle_request(self, message: RequestResponder, req: Any, session: ServerSession, raise_exceptions: bool) -> None:
+        logger.debug("Processing request of type %s", type(req).__name__)
+        handler = self.request_handlers.get(type(req))
+        if handler is None:
+            await message.respond(types.ErrorData(code=types.METHOD_NOT_FOUND, message="Method not found"))
+            return
+
+        token = None
+        try:
+            token = request_ctx.set(RequestContext(message.request_id, request_meta(message, req), session))
+            response = await handler(req)
+        except McpError as err:
+            response = err.error
+        except Exception as err:
+            if raise_exceptions:
+                raise err
+            response = types.ErrorData(code=0, message=str(err), data=None)
+        finally:
+            if token is not None:
+                request_ctx.reset(token)
+
+        await message.respond(response)
+        logger.debug("Response sent")
+
+    async def _handle_notification(self, notify: Any) -> None:
+        handler = self.notification_handlers.get(type(notify))
+        if handler is None:
+            return
+        try:
+            await handler(notify)
+        except Exception as err:
+            logger.error("Uncaught exception in notification handler: %s", err)
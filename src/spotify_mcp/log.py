@@ -0,0 +1,164 @@
+from datetime import datetime, timezone
+import json
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = "spotify_mcp"
+
+DEFAULT_LEVEL = "WARNING"
+# Records per second allowed for any one message template below WARNING.
+DEFAULT_SAMPLE_RATE = 10
+# Distinct message templates tracked by the sampler before its table is reset.
+MAX_SAMPLED_KEYS = 1024
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Attributes every LogRecord has; anything else on a record came from `extra=` and is emitted
+# as a field of its own by JsonFormatter.
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {'message', 'asctime'}
+
+def _logger_name(subsystem: str) -> str:
+    """'spotify.scheduler' -> 'spotify_mcp.spotify.scheduler'; 'mcp...' and full names are kept."""
+    if subsystem == "mcp" or subsystem.startswith(("mcp.", ROOT)):
+        return subsystem
+    return f"{ROOT}.{subsystem}"
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """Logger for one part of the server, e.g. 'server', 'tools', 'spotify.scheduler'."""
+    return logging.getLogger(_logger_name(subsystem))
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Lets through at most `per_second` records per second for each (logger, message template)
+    pair below WARNING; warnings and errors always pass. The first record after a suppressed
+    stretch carries the number dropped as `suppressed`.
+    """
+
+    def __init__(self, per_second: int = DEFAULT_SAMPLE_RATE) -> None:
+        super().__init__()
+        self.per_second = per_second
+        self._lock = threading.Lock()
+        self._windows: Dict[Tuple[str, Any], List[int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.per_second <= 0 or record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.msg)
+        second = int(time.monotonic())
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or window[0] != second:
+                if len(self._windows) >= MAX_SAMPLED_KEYS:
+                    self._windows.clear()
+                if window is not None and window[2]:
+                    record.suppressed = window[2]
+                self._windows[key] = [second, 1, 0]
+                return True
+            if window[1] < self.per_second:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that hands the record over as-is. The stock `prepare` formats the message
+    (and traceback) in the logging thread; here that is left to the background writer.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, thread and any `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    """'spotify.scheduler=DEBUG,tools=INFO' -> subsystem to level name."""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        name, level = name.strip(), level.strip()
+        if name and level:
+            levels[name] = level
+    return levels
+
+
+def configure(
+    level: Optional[str] = None,
+    levels: Optional[Dict[str, str]] = None,
+    path: Optional[str] = None,
+    format: Optional[str] = None,
+    sample_rate: Optional[int] = None
+) -> QueueListener:
+    """
+    Route the server's (and the mcp library's) logging through a queue drained by a background
+    writer, so a log call on the request path only checks its level and enqueues the record.
+
+    Args:
+        level: Level of the 'spotify_mcp' and 'mcp' loggers. If None, reads SPOTIFY_MCP_LOG_LEVEL,
+            falling back to DEFAULT_LEVEL.
+        levels: Per-subsystem overrides, e.g. {'spotify.scheduler': 'DEBUG'}. If None, parsed
+            from SPOTIFY_MCP_LOG_LEVELS ('spotify.scheduler=DEBUG,tools=INFO').
+        path: Append to this file instead of stderr (stdout carries the MCP protocol). If None,
+            reads SPOTIFY_MCP_LOG_FILE.
+        format: 'json' (one structured record per line) or 'text'. If None, reads
+            SPOTIFY_MCP_LOG_FORMAT, falling back to 'json'.
+        sample_rate: Records per second allowed per message template below WARNING; 0 keeps
+            everything. If None, reads SPOTIFY_MCP_LOG_SAMPLE, falling back to DEFAULT_SAMPLE_RATE.
+
+    Returns:
+        The started listener; call `stop()` on shutdown to flush pending records.
+    """
+    level = (level or os.getenv("SPOTIFY_MCP_LOG_LEVEL", DEFAULT_LEVEL)).upper()
+    levels = levels if levels is not None else _parse_levels(os.getenv("SPOTIFY_MCP_LOG_LEVELS", ""))
+    path = path or os.getenv("SPOTIFY_MCP_LOG_FILE")
+    format = format or os.getenv("SPOTIFY_MCP_LOG_FORMAT", "json")
+    if format not in ('json', 'text'):
+        raise ValueError(f"unknown log format {format}")
+    if sample_rate is None:
+        sample_rate = int(os.getenv("SPOTIFY_MCP_LOG_SAMPLE", DEFAULT_SAMPLE_RATE))
+
+    writer: logging.Handler = logging.FileHandler(path) if path else logging.StreamHandler(sys.stderr)
+    writer.setFormatter(JsonFormatter() if format == 'json' else logging.Formatter(TEXT_FORMAT))
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(records)
+    handler.addFilter(SamplingFilter(sample_rate))
+
+    for name in (ROOT, "mcp"):
+        logger = logging.getLogger(name)
+        logger.handlers = [handler]
+        logger.propagate = False
+        logger.setLevel(level)
+    for subsystem, override in levels.items():
+        logging.getLogger(_logger_name(subsystem)).setLevel(override.upper())
+
+    listener = QueueListener(records, writer)
+    listener.start()
+    return listener
@@ -0,0 +1,255 @@
+import bisect
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .encoding import encoder
+from .log import get_logger
+
+# Histogram bucket upper bounds in milliseconds: 12% apart, from 0.05 ms to about two minutes.
+BUCKETS: List[float] = [0.05 * 1.12 ** i for i in range(130)]
+
+DEFAULT_DUMP_INTERVAL = 60.0
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram. Recording is a bisect and two additions; percentiles are
+    read back as the upper bound of the bucket they fall in (within 12% of the true value).
+    """
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 3) if self.count else 0.0,
+            'p50': round(self.percentile(0.50), 3),
+            'p95': round(self.percentile(0.95), 3),
+            'p99': round(self.percentile(0.99), 3),
+            'max': round(self.max, 3),
+        }
+
+
+class ToolCall:
+    """Counters for one tool invocation, updated from every thread the call fans out to."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.upstream = 0
+        self.bytes = 0
+        self.error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def add_upstream(self) -> None:
+        with self._lock:
+            self.upstream += 1
+
+    def add_bytes(self, count: int) -> None:
+        with self._lock:
+            self.bytes += count
+
+    def fail(self, error: BaseException) -> None:
+        """Mark the call failed with an error that was handled (and so never raised past `tool_call`)."""
+        self.error = error_type(error)
+
+
+# The tool call being served by the current task/thread. ToolExecutor and FanOut copy the
+# context into their worker threads, so Spotify requests are attributed to the call that issued them.
+current_call: ContextVar[Optional[ToolCall]] = ContextVar("spotify_mcp_tool_call", default=None)
+
+def error_type(error: BaseException) -> str:
+    """'SpotifyException 429' for HTTP errors, otherwise the exception class name."""
+    status = getattr(error, 'http_status', None)
+    return f"{type(error).__name__} {status}" if status is not None else type(error).__name__
+
+
+class _ToolStats:
+    __slots__ = ('latency', 'upstream', 'bytes', 'errors')
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.upstream = Histogram()
+        self.bytes = 0
+        self.errors = 0
+
+
+class _EndpointStats:
+    __slots__ = ('latency', 'bytes', 'errors')
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.bytes = 0
+        self.errors = 0
+
+
+class Metrics:
+    """
+    In-process counters for tool calls and the Spotify requests they make.
+
+    - tools: latency (ms), upstream requests per invocation, bytes received and errors, keyed
+      by 'Tool.action'
+    - endpoints: latency (ms), bytes received and errors per Web API endpoint template, e.g.
+      'GET playlists/{id}/tracks'
+    - errors: counts by error type across tools and endpoints
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = time.time()
+            self.tools: Dict[str, _ToolStats] = {}
+            self.endpoints: Dict[str, _EndpointStats] = {}
+            self.errors: Counter[str] = Counter()
+
+    @contextmanager
+    def tool_call(self, name: str) -> Iterator[ToolCall]:
+        """Time the enclosed tool invocation and attribute upstream requests made inside it to `name`."""
+        call = ToolCall(name)
+        token = current_call.set(call)
+        started = time.perf_counter()
+        try:
+            yield call
+        except BaseException as e:
+            call.error = error_type(e)
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            current_call.reset(token)
+            with self._lock:
+                stats = self.tools.get(call.name) or self.tools.setdefault(call.name, _ToolStats())
+                stats.latency.record(elapsed)
+                stats.upstream.record(call.upstream)
+                stats.bytes += call.bytes
+                if call.error:
+                    stats.errors += 1
+                    self.errors[call.error] += 1
+
+    def upstream(self, endpoint: str, seconds: float, error: Optional[BaseException] = None) -> None:
+        """Record one request sent to Spotify (each retry counts as its own request)."""
+        if (call := current_call.get()) is not None:
+            call.add_upstream()
+        with self._lock:
+            stats = self.endpoints.get(endpoint) or self.endpoints.setdefault(endpoint, _EndpointStats())
+            stats.latency.record(seconds * 1000)
+            if error is not None:
+                stats.errors += 1
+                self.errors[error_type(error)] += 1
+
+    def received(self, endpoint: str, count: int) -> None:
+        """Record `count` response bytes read from `endpoint`."""
+        if (call := current_call.get()) is not None:
+            call.add_bytes(count)
+        with self._lock:
+            stats = self.endpoints.get(endpoint) or self.endpoints.setdefault(endpoint, _EndpointStats())
+            stats.bytes += count
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'uptime_seconds': round(time.time() - self.started_at, 1),
+                'tools': {
+                    name: {
+                        'latency_ms': s.latency.summary(),
+                        'upstream_per_call': {
+                            k: v if k == 'mean' else round(v) for k, v in s.upstream.summary().items() if k != 'count'
+                        },
+                        'bytes_received': s.bytes,
+                        'errors': s.errors,
+                    }
+                    for name, s in sorted(self.tools.items())
+                },
+                'endpoints': {
+                    name: {
+                        'latency_ms': s.latency.summary(),
+                        'bytes_received': s.bytes,
+                        'errors': s.errors,
+                    }
+                    for name, s in sorted(self.endpoints.items())
+                },
+                'errors': dict(self.errors.most_common()),
+            }
+
+
+class StatsDumper:
+    """Daemon thread that writes `collect()` as JSON to `path` every `interval` seconds."""
+
+    def __init__(
+        self,
+        path: str,
+        collect: Callable[[], Dict[str, Any]],
+        interval: float = DEFAULT_DUMP_INTERVAL,
+        logger: Optional[logging.Logger] = None
+    ) -> None:
+        self.path = path
+        self.collect = collect
+        self.interval = interval
+        self.logger = logger or get_logger("metrics")
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="spotify-mcp-stats", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread after writing one final dump."""
+        self._stopped.set()
+        self._thread.join(timeout=5)
+
+    def dump(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(encoder.encode(self.collect(), "pretty"))
+        os.replace(tmp, self.path)
+
+    def _run(self) -> None:
+        while True:
+            stopped = self._stopped.wait(self.interval)
+            try:
+                self.dump()
+            except Exception as e:
+                self.logger.error("Writing stats to %s failed: %s", self.path, e, exc_info=True)
+            if stopped:
+                return
+
+    @classmethod
+    def from_env(cls, collect: Callable[[], Dict[str, Any]], logger: Optional[logging.Logger] = None) -> Optional["StatsDumper"]:
+        """A dumper for SPOTIFY_MCP_STATS_FILE every SPOTIFY_MCP_STATS_INTERVAL seconds, or None if no file is set."""
+        path = os.getenv("SPOTIFY_MCP_STATS_FILE")
+        if not path:
+            return None
+        interval = float(os.getenv("SPOTIFY_MCP_STATS_INTERVAL", DEFAULT_DUMP_INTERVAL))
+        return cls(path, collect, interval=interval, logger=logger)
+
+
+metrics = Metrics()
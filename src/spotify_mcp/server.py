@@ -1,15 +1,27 @@
-from typing import List
+import logging
+from typing import Any, Callable, Dict, List
 
-from mcp.server import Server, logger, stdio_server
+from mcp.server import stdio_server
 import mcp.types as types
-from spotipy import SpotifyException
+from pydantic import AnyUrl
 
-from .spotify import Spotify
-from .tools import GetInfo, Playback, Playlist, Queue, Search, User
+from . import log
+from .encoding import encoder
+from .executor import ConcurrentServer, ToolExecutor
+from .metrics import StatsDumper, metrics
+from .spotify.pool import DEFAULT_USER, ClientPool, PooledSpotify, UserNotAuthorized
+from .tools import GetInfo, InvalidToolCall, Playback, Playlist, Queue, Recommend, Search, Stats, ToolRegistry, User, stats_report
 from .tools.tool_model import ToolModel
 
-server = Server("spotify-mcp")
-spotify = Spotify(logger=logger)
+logger = log.get_logger("server")
+
+server = ConcurrentServer("spotify-mcp")
+pool = ClientPool()
+# Tools are built once against this stand-in; each call binds it to the caller's facade.
+spotify = PooledSpotify(pool)
+executor = ToolExecutor()
+
+STATS_URI = "spotify-mcp://stats"
 
 
 mcp_tools: List[ToolModel] = [
@@ -17,16 +29,35 @@ mcp_tools: List[ToolModel] = [
     Playback(spotify), 
     Playlist(spotify),
     Queue(spotify),
+    Recommend(spotify),
     Search(spotify),
+    Stats(spotify),
     User(spotify),
 ]
+registry = ToolRegistry(mcp_tools)
+
+def request_user() -> str:
+    """The Spotify user a call acts for: the request's `_meta.spotify_user`, else DEFAULT_USER."""
+    try:
+        meta = server.request_context.meta
+    except LookupError:
+        return DEFAULT_USER
+    return getattr(meta, 'spotify_user', None) or DEFAULT_USER
+
+
+def _run_as(user: str, handler: Callable[[Dict[str, Any]], Any], arguments: Dict[str, Any]) -> Any:
+    # On the worker thread, so waiting for a free client never blocks the event loop.
+    with pool.bind(user):
+        return handler(arguments)
+
 
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """List available tools."""
     logger.info("Listing available tools")
-    tools = [tool.as_tool() for tool in mcp_tools]
-    logger.info(f"Available tools: {[tool.name for tool in tools]}")
+    tools = registry.tools
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Available tools: %s", [tool.name for tool in tools])
     return tools
 
 
@@ -35,33 +66,74 @@ async def handle_call_tool(
         name: str, arguments: dict
 ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
     """Handle tool execution requests."""
-    logger.info(f"Tool called: {name} with arguments: {arguments}")
-    assert name[:7] == "Spotify", f"Unknown tool: {name}"
+    user = request_user()
+    logger.info("Tool called: %s with arguments: %s", name, arguments, extra={'tool': name, 'user': user})
 
-    tool = next(iter([tool for tool in mcp_tools if type(tool).__name__ == name[7:]]), None)
-    assert tool != None, f"Unknown tool: {name}"
+    # Recorded under the tool name until the action is known to be valid, then as 'Tool.action'
+    # (unknown names share one entry, so they cannot grow the metrics without bound).
+    with metrics.tool_call(name if name in registry else "unknown") as call:
+        try:
+            handler, validated = registry.resolve(name, arguments)
+        except InvalidToolCall as e:
+            call.fail(e)
+            logger.error("%s", e, extra={'tool': name})
+            return [types.TextContent(
+                type="text",
+                text=str(e)
+            )]
+        call.name = f"{name}.{validated['action']}"
 
-    action: str | None = arguments.get("action")
-    assert action != None, f"No arguments provided for tool: {name}"
+        try:
+            return await executor.run(_run_as, user, handler, validated)
 
-    try:
-        return tool.execute(action, arguments)
-
-    except SpotifyException as se:
-        error_msg = f"Spotify Client error occurred: {str(se)}"
-        logger.error(error_msg, exc_info=True)
-        return [types.TextContent(
-            type="text",
-            text=f"An error occurred with the Spotify Client: {str(se)}"
-        )]
-    except Exception as e:
-        error_msg = f"Unexpected error occurred: {str(e)}"
-        logger.error(error_msg, exc_info=True)
-        raise
+        except UserNotAuthorized as e:
+            call.fail(e)
+            logger.error("%s", e, extra={'tool': call.name, 'user': user})
+            return [types.TextContent(
+                type="text",
+                text=str(e)
+            )]
+        except Exception as e:
+            # Imported here rather than at module level to keep spotipy off the startup path;
+            # any Spotify request has loaded it by the time it can raise.
+            from spotipy import SpotifyException
+            if isinstance(e, SpotifyException):
+                call.fail(e)
+                logger.error("Spotify Client error occurred: %s", e, exc_info=True, extra={'tool': call.name})
+                return [types.TextContent(
+                    type="text",
+                    text=f"An error occurred with the Spotify Client: {str(e)}"
+                )]
+            logger.error("Unexpected error occurred: %s", e, exc_info=True, extra={'tool': call.name})
+            raise
+
+
+@server.list_resources()
+async def handle_list_resources() -> list[types.Resource]:
+    """List available resources."""
+    return [types.Resource(
+        uri=AnyUrl(STATS_URI),
+        name="Spotify MCP statistics",
+        description="Latency percentiles per tool and Spotify endpoint, requests per tool call, "
+                    "bytes received, cache hit ratios and errors, as JSON.",
+        mimeType="application/json"
+    )]
+
+
+@server.read_resource()
+async def handle_read_resource(uri: AnyUrl) -> str:
+    """Serve the statistics resource."""
+    if str(uri) != STATS_URI:
+        raise ValueError(f"Unknown resource: {uri}")
+    return encoder.encode(stats_report(spotify), "pretty")
 
 
 async def main():
+    listener = log.configure()
     logger.info("Starting Spotify MCP server")
+    dumper = StatsDumper.from_env(lambda: stats_report(spotify))
+    if dumper:
+        dumper.start()
     try:
         options = server.create_initialization_options()
         async with stdio_server() as (read_stream, write_stream):
@@ -72,5 +144,11 @@ async def main():
                 options
             )
     except Exception as e:
-        logger.error(f"Server error occurred: {str(e)}", exc_info=True)
+        logger.error("Server error occurred: %s", e, exc_info=True)
         raise
+    finally:
+        if dumper:
+            dumper.stop()
+        executor.shutdown(wait=False)
+        pool.close()
+        listener.stop()
@@ -1,10 +1,9 @@
+import importlib
 import logging
 import os
-from typing import List, Optional
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from dotenv import load_dotenv
-
-from .client import SCOPES, SpotifyClient
 from .models import (
     AlbumInfo,
     ArtistInfo,
@@ -15,75 +14,193 @@ from .models import (
     SpotifyDevice,
     TrackInfo,
 )
-from .playback import PlaybackManager
-from .playlists import PlaylistManager
-from .search import SearchManager
+
+if TYPE_CHECKING:
+    from .cache import MetadataCache, SearchCache
+    from .client import SCOPES, SharedResources, SpotifyClient
+    from .library import LibraryIndex
+    from .playback import PlaybackManager
+    from .playlists import PlaylistManager
+    from .search import SearchManager
+
+# Exports resolved on first access, so importing the package (e.g. for the models) does not
+# pull in spotipy, requests and sqlite3.
+_LAZY_EXPORTS = {
+    'SpotifyClient': '.client',
+    'SCOPES': '.client',
+    'SharedResources': '.client',
+    'MetadataCache': '.cache',
+    'SearchCache': '.cache',
+    'PlaybackManager': '.playback',
+    'PlaylistManager': '.playlists',
+    'SearchManager': '.search',
+    'LibraryIndex': '.library',
+}
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class Spotify:
-    """Main interface for Spotify API interactions"""
-    
+    """
+    Main interface for Spotify API interactions
+
+    The client and managers are built on first use, not in the constructor, so a server can
+    answer the MCP handshake and list its tools before spotipy is even imported.
+    """
+
     def __init__(
         self,
         client_id: Optional[str] = None,
         client_secret: Optional[str] = None,
         redirect_uri: Optional[str] = None,
         scopes: Optional[List[str]] = None,
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        client: Optional["SpotifyClient"] = None,
+        cache_path: Optional[str] = None,
+        library_path: Optional[str] = None,
+        shared: Optional["SharedResources"] = None
     ):
         """Initialize Spotify interface
-        
+
         If auth parameters are not provided, attempts to load them from environment variables:
         - SPOTIFY_CLIENT_ID
         - SPOTIFY_CLIENT_SECRET
         - SPOTIFY_REDIRECT_URI
-        
+
         Args:
             client_id: Spotify API client ID
             client_secret: Spotify API client secret
             redirect_uri: OAuth redirect URI
             scopes: List of Spotify API scopes to request
             logger: Optional logger instance
+            client: Use this already-configured client (e.g. an offline replay client) instead
+                of building one from the auth parameters
+            cache_path: Token cache file. If None, uses spotipy's default
+            library_path: SQLite file of the library index. If None, reads SPOTIFY_MCP_LIBRARY_DB
+            shared: Session, scheduler and fan-out pool to build the client on (see pool.ClientPool)
         """
-        # Load from environment if not provided
-        if any(param is None for param in [client_id, client_secret, redirect_uri]):
-            load_dotenv()
-            client_id = client_id or os.getenv("SPOTIFY_CLIENT_ID")
-            client_secret = client_secret or os.getenv("SPOTIFY_CLIENT_SECRET")
-            redirect_uri = redirect_uri or os.getenv("SPOTIFY_REDIRECT_URI")
-            
-        if not all([client_id, client_secret, redirect_uri]):
-            raise ValueError(
-                "Missing required authentication parameters. "
-                "Either provide them directly or set them in environment variables."
-            )
-        
-        self.client = SpotifyClient(
-            client_id=client_id,
-            client_secret=client_secret,
-            redirect_uri=redirect_uri,
-            scopes=scopes,
-            logger=logger
-        )
-        self.playback = PlaybackManager(self.client)
-        self.playlists = PlaylistManager(self.client)
-        self.search = SearchManager(self.client)
-    
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._redirect_uri = redirect_uri
+        self._scopes = scopes
+        self._logger = logger
+        self._cache_path = cache_path
+        self._library_path = library_path
+        self._shared = shared
+        self._lock = threading.Lock()
+        self._client: Optional["SpotifyClient"] = None
+        if client is not None:
+            self._init_managers(client)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the client has been built yet"""
+        return self._client is not None
+
+    def _load(self) -> None:
+        if self._client is not None:
+            return
+        with self._lock:
+            if self._client is not None:
+                return
+            from dotenv import load_dotenv
+            from .client import SpotifyClient
+
+            client_id, client_secret, redirect_uri = self._client_id, self._client_secret, self._redirect_uri
+            # Load from environment if not provided
+            if any(param is None for param in [client_id, client_secret, redirect_uri]):
+                load_dotenv()
+                client_id = client_id or os.getenv("SPOTIFY_CLIENT_ID")
+                client_secret = client_secret or os.getenv("SPOTIFY_CLIENT_SECRET")
+                redirect_uri = redirect_uri or os.getenv("SPOTIFY_REDIRECT_URI")
+
+            if not all([client_id, client_secret, redirect_uri]):
+                raise ValueError(
+                    "Missing required authentication parameters. "
+                    "Either provide them directly or set them in environment variables."
+                )
+
+            self._init_managers(SpotifyClient(
+                client_id=client_id,
+                client_secret=client_secret,
+                redirect_uri=redirect_uri,
+                scopes=self._scopes,
+                logger=self._logger,
+                cache_path=self._cache_path,
+                shared=self._shared
+            ))
+
+    def _init_managers(self, client: "SpotifyClient") -> None:
+        from .library import LibraryIndex
+        from .playback import PlaybackManager
+        from .playlists import PlaylistManager
+        from .search import SearchManager
+
+        self._playback = PlaybackManager(client)
+        self._playlists = PlaylistManager(client)
+        self._search = SearchManager(client, self._playlists)
+        self._library = LibraryIndex(client, self._playlists, path=self._library_path)
+        # Set last: other threads treat a non-None client as "fully loaded".
+        self._client = client
+
+    @property
+    def client(self) -> "SpotifyClient":
+        self._load()
+        return self._client
+
+    @property
+    def playback(self) -> "PlaybackManager":
+        self._load()
+        return self._playback
+
+    @property
+    def playlists(self) -> "PlaylistManager":
+        self._load()
+        return self._playlists
+
+    @property
+    def search(self) -> "SearchManager":
+        self._load()
+        return self._search
+
+    @property
+    def library(self) -> "LibraryIndex":
+        self._load()
+        return self._library
+
     @property
     def is_authenticated(self) -> bool:
         """Check if the client is authenticated"""
         return self.client.auth_ok()
-    
+
     def refresh_auth(self) -> None:
         """Refresh the authentication token"""
         self.client.auth_refresh()
 
+    def stats(self) -> Dict[str, Any]:
+        """Cache and scheduler counters of the client, or nothing if it has not been built"""
+        return self._client.stats() if self._client is not None else {}
+
+    def close(self) -> None:
+        """Close the library index and the client, if they were built"""
+        if self._client is not None:
+            self._library.close()
+            self._client.close()
+
 # For easier imports
 __all__ = [
     'Spotify',
     'SpotifyClient',
+    'SharedResources',
+    'MetadataCache',
+    'SearchCache',
     'PlaybackManager',
     'PlaylistManager',
     'SearchManager',
+    'LibraryIndex',
     'QType',
     'SpotifyDevice',
     'PlaylistInfo',
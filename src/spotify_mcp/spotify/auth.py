@@ -0,0 +1,182 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from spotipy.cache_handler import CacheFileHandler, CacheHandler
+
+# Refresh this many seconds before the access token actually expires.
+DEFAULT_REFRESH_MARGIN = 60
+
+# Backoff between failed refreshes: doubles from the first delay up to the cap (seconds).
+DEFAULT_RETRY_DELAY = 1.0
+DEFAULT_MAX_RETRY_DELAY = 5 * 60
+
+# OAuth error codes after which retrying with the same refresh token cannot succeed.
+PERMANENT_ERRORS = ('invalid_grant', 'invalid_client', 'unauthorized_client')
+
+class TokenStore(CacheHandler):
+    """
+    In-memory holder for the OAuth token, backed by spotipy's cache file.
+
+    The cache file is read once on first access and written only when the access token
+    actually changes, so token checks on the request path never touch the disk.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, logger: Optional[logging.Logger] = None) -> None:
+        self._file = CacheFileHandler(cache_path=cache_path)
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._token: Optional[Dict[str, Any]] = None
+        self._expires_at: float = 0.0
+        self.changed = threading.Condition(self._lock)
+
+    @property
+    def cache_path(self) -> str:
+        return self._file.cache_path
+
+    @property
+    def expires_at(self) -> float:
+        """Unix timestamp at which the current access token expires (0 if there is no token)."""
+        self._ensure_loaded()
+        return self._expires_at
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._set(self._file.get_cached_token())
+                self._loaded = True
+
+    def _set(self, token_info: Optional[Dict[str, Any]]) -> None:
+        self._token = token_info
+        self._expires_at = float(token_info.get("expires_at", 0)) if token_info else 0.0
+
+    def is_expired(self, margin: float = 0) -> bool:
+        """Check the precomputed expiry; no I/O."""
+        self._ensure_loaded()
+        return self._token is None or time.time() + margin >= self._expires_at
+
+    def get_cached_token(self) -> Optional[Dict[str, Any]]:
+        self._ensure_loaded()
+        return self._token
+
+    def seed(self, token_info: Dict[str, Any]) -> None:
+        """Hold `token_info` in memory only, without reading or writing the cache file."""
+        with self._lock:
+            self._set(token_info)
+            self._loaded = True
+            self.changed.notify_all()
+
+    def save_token_to_cache(self, token_info: Dict[str, Any]) -> None:
+        self._ensure_loaded()
+        with self._lock:
+            rotated = self._token is None or self._token.get("access_token") != token_info.get("access_token")
+            self._set(token_info)
+            if rotated:
+                self._file.save_token_to_cache(token_info)
+                self.logger.info("Spotify access token rotated; cache file updated")
+            self.changed.notify_all()
+
+
+class TokenRefresher:
+    """
+    Daemon thread that refreshes the access token shortly before it expires.
+
+    A failed refresh is retried with exponential backoff, from `retry_delay` up to
+    `max_retry_delay` seconds. A token without a refresh token, or one the auth server rejects
+    for good (e.g. `invalid_grant` once the user revoked access), is not retried: the thread
+    waits until a new token is saved. `stats()` reports which of these states it is in.
+    """
+
+    def __init__(
+        self,
+        store: TokenStore,
+        refresh: Callable[[], None],
+        margin: float = DEFAULT_REFRESH_MARGIN,
+        logger: Optional[logging.Logger] = None,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        max_retry_delay: float = DEFAULT_MAX_RETRY_DELAY
+    ) -> None:
+        self.store = store
+        self.refresh = refresh
+        self.margin = margin
+        self.logger = logger or logging.getLogger(__name__)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.state = 'no_token'
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.refreshed_at: Optional[float] = None
+        self._stopped = False
+        # The token the refresher gave up on; it idles until the store holds another one.
+        self._given_up_on: Optional[Dict[str, Any]] = None
+        self._thread = threading.Thread(target=self._run, name="spotify-token-refresh", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self.store.changed:
+            self._stopped = True
+            self.store.changed.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """State ('no_token', 'ok', 'retrying' or 'failed'), consecutive failures and last error."""
+        with self.store.changed:
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'last_error': self.last_error,
+                'refreshed_at': self.refreshed_at,
+                'expires_at': self.store.expires_at or None,
+            }
+
+    def _give_up(self, token: Dict[str, Any], reason: str) -> None:
+        self.state = 'failed'
+        self.last_error = reason
+        self._given_up_on = token
+        self.logger.error("Background token refresh stopped until the user authorizes again: %s", reason)
+
+    def _run(self) -> None:
+        delay = self.retry_delay
+        while True:
+            with self.store.changed:
+                if self._stopped:
+                    return
+                token = self.store.get_cached_token()
+                if token is None or token is self._given_up_on:
+                    # Nothing to refresh until the user completes the OAuth flow.
+                    self.store.changed.wait()
+                    continue
+                if not token.get("refresh_token"):
+                    self._give_up(token, "token has no refresh token")
+                    continue
+                if self.state in ('no_token', 'failed'):
+                    self.state = 'ok'
+                wait = self.store.expires_at - self.margin - time.time()
+                if wait > 0:
+                    self.store.changed.wait(timeout=wait)
+                    continue
+            try:
+                self.refresh()
+            except Exception as e:
+                with self.store.changed:
+                    self.failures += 1
+                    if getattr(e, 'error', None) in PERMANENT_ERRORS:
+                        self._give_up(token, str(e))
+                        delay = self.retry_delay
+                        continue
+                    self.state = 'retrying'
+                    self.last_error = str(e)
+                    self.logger.error("Background token refresh failed, retrying in %.0fs: %s", delay, e, exc_info=True)
+                    self.store.changed.wait(timeout=delay)
+                delay = min(delay * 2, self.max_retry_delay)
+            else:
+                delay = self.retry_delay
+                with self.store.changed:
+                    self.state = 'ok'
+                    self.failures = 0
+                    self.refreshed_at = time.time()
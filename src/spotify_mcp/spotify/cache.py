@@ -0,0 +1,277 @@
+from collections import OrderedDict
+from concurrent.futures import Future, wait
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# Default per-type TTLs in seconds. Track/album metadata is effectively immutable, artists
+# drift slowly (popularity, new releases), and playlists change whenever someone edits them.
+DEFAULT_TTLS: Dict[str, float] = {
+    'track': 24 * 60 * 60,
+    'album': 24 * 60 * 60,
+    'artist': 60 * 60,
+    'playlist': 5 * 60,
+}
+
+DEFAULT_SEARCH_TTL = 10 * 60
+
+# Playlist contents are revalidated by snapshot_id on every read, so they can live long.
+DEFAULT_CONTENTS_TTL = 7 * 24 * 60 * 60
+
+def approx_size(obj: Any) -> int:
+    """Rough deep size in bytes of a JSON-like object (dicts, lists, scalars)."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += approx_size(k) + approx_size(v)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            size += approx_size(v)
+    return size
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry expiry and a memory cap.
+
+    Entries are evicted least-recently-used first when either `max_entries` or `max_bytes`
+    would be exceeded. Expired entries are dropped lazily on access.
+    """
+
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 32 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[Hashable, Tuple[float, int, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, _, value = entry
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Like get, without counting a hit or miss or refreshing the entry's LRU position."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return entry[2]
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        size = approx_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (time.monotonic() + ttl, size, value)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._pop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _pop(self, key: Hashable) -> bool:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[1]
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._data),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class MetadataCache(TTLCache):
+    """Cache of parsed `get_info` results keyed by (qtype, item_id), with per-type TTLs."""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+
+    def get_item(self, qtype: str, item_id: str) -> Optional[Any]:
+        return self.get((qtype, item_id))
+
+    def set_item(self, qtype: str, item_id: str, value: Any) -> None:
+        ttl = self.ttls.get(qtype, 0)
+        if ttl > 0 and value is not None:
+            self.set((qtype, item_id), value, ttl)
+
+    def invalidate_item(self, qtype: str, item_id: str) -> bool:
+        return self.invalidate((qtype, item_id))
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key into one execution.
+
+    Each call has a `size` (e.g. a result limit). The first caller for a key runs `fn`; callers
+    arriving while it is in flight block on the same future and receive its result (or
+    exception) if the flight is at least their size. A larger caller waits for the flight to
+    finish and then runs `fn` itself, with the largest size any such caller asked for, so all
+    the callers that queued up behind one flight are served by at most one more execution.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Tuple[int, Future]] = {}
+        # Largest size of the callers waiting for a smaller flight of the key to finish.
+        self._wanted: Dict[Hashable, int] = {}
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[int], T], size: int = 0) -> T:
+        """Run `fn(n)` for some n >= size, or share the result of a flight that already does."""
+        while True:
+            with self._lock:
+                flight = self._inflight.get(key)
+                if flight is None:
+                    size = max(size, self._wanted.pop(key, 0))
+                    future: Future = Future()
+                    self._inflight[key] = (size, future)
+                    break
+                flight_size, future = flight
+                if flight_size >= size:
+                    self.shared += 1
+                else:
+                    self._wanted[key] = max(size, self._wanted.get(key, 0))
+            if flight_size >= size:
+                return future.result()
+            wait([future])
+
+        try:
+            result = fn(size)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+SearchKey = Tuple[str, FrozenSet[str]]
+
+class SearchCache(TTLCache):
+    """
+    Cache of parsed search results keyed on the normalized query and set of qtypes.
+
+    Each entry remembers the `limit` it was fetched with, so a cached larger page can answer
+    a smaller request. Concurrent searches for the same key are merged through `SingleFlight`,
+    whatever their limits: a smaller one shares the in-flight page, a larger one waits for it
+    and, if it was not the last page, fetches once with the largest limit waiting.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_SEARCH_TTL, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.ttl = ttl
+        self.flights = SingleFlight()
+
+    @staticmethod
+    def key(query: str, qtype: str) -> SearchKey:
+        normalized = " ".join(query.lower().split())
+        qtypes = frozenset(q.strip() for q in qtype.split(",") if q.strip())
+        return normalized, qtypes
+
+    def lookup(self, key: SearchKey, limit: int, count: bool = True) -> Optional[Dict[str, List[Any]]]:
+        entry = self.get(key) if count else self.peek(key)
+        if entry is None:
+            return None
+        cached_limit, complete, results = entry
+        if limit > cached_limit and not complete:
+            return None
+        return {k: v[:limit] for k, v in results.items()}
+
+    def fetch(
+        self,
+        key: SearchKey,
+        limit: int,
+        fn: Callable[[int], Dict[str, Any]],
+        parse: Callable[[Dict[str, Any]], Dict[str, List[Any]]]
+    ) -> Dict[str, List[Any]]:
+        """
+        Return cached results for `key` if they cover `limit`, otherwise run `fn(n)` (the raw
+        search response for a limit n >= `limit`) once, `parse` it and cache the parsed results.
+        """
+        if (cached := self.lookup(key, limit)) is not None:
+            return cached
+
+        def load(fetch_limit: int) -> Dict[str, List[Any]]:
+            # The flight this call waited for may have reached the last page.
+            if (cached := self.lookup(key, fetch_limit, count=False)) is not None:
+                return cached
+            response = fn(fetch_limit)
+            results = parse(response)
+            # Complete when Spotify has no further page for any type. Counting the parsed items
+            # would not do: null items are dropped, so a full page can look short.
+            complete = all(not page.get('next') for page in response.values() if isinstance(page, dict))
+            self.set(key, (fetch_limit, complete, results), self.ttl)
+            return results
+
+        results = self.flights.do(key, load, limit)
+        return {k: v[:limit] for k, v in results.items()}
+
+
+class PlaylistContentsCache(TTLCache):
+    """
+    Parsed playlist track lists keyed by playlist id, each tagged with the `snapshot_id` it
+    was read at. A lookup only hits when the caller's current snapshot matches.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CONTENTS_TTL, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024) -> None:
+        super().__init__(max_entries=max_entries, max_bytes=max_bytes)
+        self.ttl = ttl
+
+    def get_contents(self, playlist_id: str, snapshot_id: str) -> Optional[List[Any]]:
+        entry = self.get(playlist_id)
+        if entry is None:
+            return None
+        cached_snapshot, tracks = entry
+        if cached_snapshot != snapshot_id:
+            # get() counted a hit for a stale snapshot; record it as the miss it is.
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+            return None
+        return tracks
+
+    def set_contents(self, playlist_id: str, snapshot_id: str, tracks: List[Any]) -> None:
+        self.set(playlist_id, (snapshot_id, tracks), self.ttl)
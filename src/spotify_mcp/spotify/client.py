@@ -1,10 +1,20 @@
+from dataclasses import dataclass
 import logging
-from typing import List, Optional
+import time
+from typing import Any, Dict, List, Optional
 
+import requests
 import spotipy
-from spotipy.cache_handler import CacheFileHandler
 from spotipy.oauth2 import SpotifyOAuth
 
+from ..log import get_logger
+from ..metrics import metrics
+from .auth import DEFAULT_REFRESH_MARGIN, TokenRefresher, TokenStore
+from .cache import MetadataCache, PlaylistContentsCache, SearchCache
+from .fanout import FanOut
+from .http import HttpConfig, build_session, warm_up
+from .scheduler import RequestScheduler, ScheduledSpotify, Transport, endpoint_name
+
 SCOPES = [
     # spotify connect
     "user-read-currently-playing",
@@ -27,6 +37,39 @@ SCOPES = [
     "user-library-read",
 ]
 
+@dataclass
+class SharedResources:
+    """
+    The parts of a client that are not tied to a Spotify account: the pooled HTTP session, the
+    request scheduler (Spotify rate-limits per app, not per user) and the fan-out pool. Clients
+    built with the same SharedResources (see pool.ClientPool) share them; closing a client
+    leaves them open.
+    """
+    http_config: HttpConfig
+    session: requests.Session
+    scheduler: RequestScheduler
+    fanout: FanOut
+
+    @classmethod
+    def create(cls, http_config: Optional[HttpConfig] = None, logger: Optional[logging.Logger] = None) -> "SharedResources":
+        logger = logger or get_logger("spotify")
+        http_config = http_config or HttpConfig.from_env()
+        session = build_session(http_config)
+        session.hooks['response'].append(SpotifyClient._record_response)
+        if http_config.warm_up:
+            warm_up(session, http_config, logger=logger.getChild("http"))
+        return cls(
+            http_config=http_config,
+            session=session,
+            scheduler=RequestScheduler(logger=logger.getChild("scheduler")),
+            fanout=FanOut(logger=logger.getChild("fanout")),
+        )
+
+    def close(self) -> None:
+        self.fanout.shutdown(wait=False)
+        self.session.close()
+
+
 class SpotifyClient:
     def __init__(
         self,
@@ -34,7 +77,13 @@ class SpotifyClient:
         client_secret: str,
         redirect_uri: str,
         scopes: Optional[List[str]] = None,
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        cache_path: Optional[str] = None,
+        auto_refresh: bool = True,
+        http_config: Optional[HttpConfig] = None,
+        transport: Optional[Transport] = None,
+        recorder: Optional[Any] = None,
+        shared: Optional[SharedResources] = None
     ) -> None:
         """Initialize Spotify client with necessary permissions
         
@@ -44,34 +93,118 @@ class SpotifyClient:
             redirect_uri: OAuth redirect URI
             scopes: List of Spotify API scopes to request. If None, uses default scopes
             logger: Optional logger instance. If None, creates a new logger
+            cache_path: Path of the token cache file. If None, uses spotipy's default
+            auto_refresh: Refresh the access token in a background thread before it expires
+            http_config: Connection pool, timeout and retry settings. If None, read from the environment
+            transport: Answers Web API calls instead of HTTP (e.g. replay.Replay). The client then
+                runs offline: it uses a placeholder token and never contacts the auth server
+            recorder: Receives every Web API response (e.g. replay.FixtureSet) for later replay
+            shared: Use this session, scheduler and fan-out pool (and its http_config) instead of
+                creating them, e.g. to serve several accounts over one connection pool
         """
-        self.logger = logger or logging.getLogger(__name__)
+        self.logger = logger or get_logger("spotify")
         
         scope = ",".join(scopes if scopes is not None else SCOPES)
         
+        self.shared = shared
+        if shared is None:
+            self.http_config = http_config or HttpConfig.from_env()
+            # One pooled session for both the Web API and the OAuth token endpoint.
+            self.session = build_session(self.http_config)
+            self.session.hooks['response'].append(self._record_response)
+        else:
+            self.http_config = shared.http_config
+            self.session = shared.session
+
         try:
-            self.sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
-                scope=scope,
-                client_id=client_id,
-                client_secret=client_secret,
-                redirect_uri=redirect_uri
-            ))
+            self.token_store = TokenStore(cache_path=cache_path, logger=self.logger.getChild("auth"))
+            self.scheduler = shared.scheduler if shared else RequestScheduler(logger=self.logger.getChild("scheduler"))
+            self.sp = ScheduledSpotify(
+                auth_manager=SpotifyOAuth(
+                    scope=scope,
+                    client_id=client_id,
+                    client_secret=client_secret,
+                    redirect_uri=redirect_uri,
+                    cache_handler=self.token_store,
+                    requests_session=self.session,
+                    requests_timeout=self.http_config.timeout
+                ),
+                requests_session=self.session,
+                requests_timeout=self.http_config.timeout,
+                scheduler=self.scheduler,
+                transport=transport,
+                recorder=recorder
+            )
             self.auth_manager: SpotifyOAuth = self.sp.auth_manager
-            self.cache_handler: CacheFileHandler = self.auth_manager.cache_handler
+            self.cache_handler: TokenStore = self.token_store
         except Exception as e:
-            self.logger.error(f"Failed to initialize Spotify client: {str(e)}", exc_info=True)
+            self.logger.error("Failed to initialize Spotify client: %s", e, exc_info=True)
             raise
 
+        self.metadata_cache = MetadataCache()
+        self.search_cache = SearchCache()
+        self.playlist_cache = PlaylistContentsCache()
+        self.fanout = shared.fanout if shared else FanOut(logger=self.logger.getChild("fanout"))
+
+        if transport is not None:
+            self.token_store.seed({
+                "access_token": "offline",
+                "token_type": "Bearer",
+                "scope": scope,
+                "expires_at": time.time() + 10 * 365 * 24 * 60 * 60,
+            })
+            auto_refresh = False
+        elif self.http_config.warm_up and shared is None:
+            warm_up(self.session, self.http_config, logger=self.logger.getChild("http"))
+
+        self.token_refresher: Optional[TokenRefresher] = None
+        if auto_refresh:
+            self.token_refresher = TokenRefresher(
+                self.token_store,
+                self.auth_refresh,
+                margin=DEFAULT_REFRESH_MARGIN,
+                logger=self.token_store.logger
+            )
+            self.token_refresher.start()
+
     def auth_ok(self) -> bool:
         """Check if the current authentication token is valid"""
         try:
-            result = self.auth_manager.is_token_expired(self.cache_handler.get_cached_token())
-            self.logger.info(f"Auth check result: {'valid' if not result else 'expired'}")
-            return result
+            return not self.token_store.is_expired(margin=DEFAULT_REFRESH_MARGIN)
         except Exception as e:
-            self.logger.error(f"Error checking auth status: {str(e)}", exc_info=True)
+            self.logger.error("Error checking auth status: %s", e, exc_info=True)
             raise
 
     def auth_refresh(self) -> None:
         """Refresh the authentication token"""
-        self.auth_manager.validate_token(self.cache_handler.get_cached_token())
+        token_info = self.token_store.get_cached_token()
+        if token_info and token_info.get("refresh_token"):
+            self.auth_manager.refresh_access_token(token_info["refresh_token"])
+        else:
+            self.auth_manager.validate_token(token_info)
+
+    @staticmethod
+    def _record_response(response, *args, **kwargs) -> None:
+        metrics.received(endpoint_name(response.request.method, response.url), len(response.content))
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache and request scheduler counters, and the token refresher's state"""
+        report: Dict[str, Any] = {
+            'caches': {
+                'metadata': self.metadata_cache.stats(),
+                'search': self.search_cache.stats(),
+                'playlist_contents': self.playlist_cache.stats(),
+            },
+            'scheduler': self.scheduler.stats(),
+        }
+        if self.token_refresher:
+            report['auth'] = self.token_refresher.stats()
+        return report
+
+    def close(self) -> None:
+        """Stop background work owned by the client"""
+        if self.token_refresher:
+            self.token_refresher.stop()
+        if self.shared is None:
+            self.fanout.shutdown(wait=False)
+            self.session.close()
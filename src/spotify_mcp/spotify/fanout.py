@@ -0,0 +1,86 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextvars
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+DEFAULT_FANOUT_WORKERS = 8
+
+# Which FanOut, if any, the current thread is a worker of.
+_worker = threading.local()
+
+class FanOut:
+    """
+    Runs independent Spotify requests concurrently on a shared worker pool.
+
+    Composite lookups (e.g. artist + albums + top tracks) finish in roughly the time of the
+    slowest request instead of the sum of all of them.
+
+    Each call runs in a copy of the submitting thread's context, so context variables (e.g. the
+    tool call that metrics attribute requests to) carry over to the pool.
+
+    Calls submitted from one of the pool's own workers (e.g. paging a playlist's tracks inside
+    a batched playlist lookup) run inline on that worker. Queued behind the pool instead, they
+    could wait on workers that are all blocked waiting for them.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, logger: Optional[logging.Logger] = None) -> None:
+        """
+        Args:
+            max_workers: Size of the request pool. If None, reads SPOTIFY_MCP_FANOUT_WORKERS from
+                the environment, falling back to DEFAULT_FANOUT_WORKERS.
+            logger: Optional logger instance
+        """
+        if max_workers is None:
+            max_workers = int(os.getenv("SPOTIFY_MCP_FANOUT_WORKERS", DEFAULT_FANOUT_WORKERS))
+        self.max_workers = max(1, max_workers)
+        self.logger = logger or logging.getLogger(__name__)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="spotify-fanout",
+            initializer=self._register_worker
+        )
+
+    def _register_worker(self) -> None:
+        _worker.fanout = self
+
+    def gather(self, calls: Dict[str, Callable[[], Any]]) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+        """
+        Run every call concurrently and wait for all of them.
+
+        Returns:
+            (results, errors): results keyed by call name for the calls that succeeded, and the
+            exception raised by each call that failed. A failure never cancels the other calls.
+        """
+        futures = {name: self.submit(fn) for name, fn in calls.items()}
+        results: Dict[str, Any] = {}
+        errors: Dict[str, Exception] = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                self.logger.warning("Sub-request '%s' failed: %s", name, e)
+                errors[name] = e
+        return results, errors
+
+    def submit(self, fn: Callable[..., R], *args, **kwargs) -> Future:
+        if getattr(_worker, 'fanout', None) is not self:
+            return self._pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+        future: Future = Future()
+        try:
+            future.set_result(contextvars.copy_context().run(fn, *args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+        """Apply `fn` to each item concurrently, yielding results in input order."""
+        futures = [self.submit(fn, item) for item in items]
+        return (future.result() for future in futures)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
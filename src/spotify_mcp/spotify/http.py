@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+import logging
+import os
+import threading
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+import urllib3
+
+API_URL = "https://api.spotify.com/v1/"
+ACCOUNTS_URL = "https://accounts.spotify.com/api/token"
+
+@dataclass
+class HttpConfig:
+    """
+    Connection settings for the session shared by the Web API client and the OAuth manager.
+
+    Attributes:
+        pool_connections: Number of per-host connection pools to keep (api + accounts by default)
+        pool_maxsize: Maximum open connections per host; should cover the worker and fan-out pools
+        pool_block: Wait for a free connection instead of opening an unpooled one when the pool is full
+        connect_timeout: Seconds to wait for a TCP/TLS connection
+        read_timeout: Seconds to wait for a response once connected
+        retries: Retries on connection errors, and on 5xx responses to GETs and DELETEs (429s
+            are left to the scheduler)
+        backoff_factor: urllib3 exponential backoff factor between those retries
+        warm_up: Open connections to the API and token hosts in the background at startup
+    """
+    pool_connections: int = 2
+    pool_maxsize: int = 16
+    pool_block: bool = True
+    connect_timeout: float = 3.05
+    read_timeout: float = 10.0
+    retries: int = 3
+    backoff_factor: float = 0.3
+    warm_up: bool = True
+
+    @classmethod
+    def from_env(cls) -> "HttpConfig":
+        """Defaults overridden by SPOTIFY_MCP_HTTP_* environment variables."""
+        defaults = cls()
+        return cls(
+            pool_connections=int(os.getenv("SPOTIFY_MCP_HTTP_POOL_HOSTS", defaults.pool_connections)),
+            pool_maxsize=int(os.getenv("SPOTIFY_MCP_HTTP_POOL_SIZE", defaults.pool_maxsize)),
+            pool_block=os.getenv("SPOTIFY_MCP_HTTP_POOL_BLOCK", str(defaults.pool_block)).lower() == "true",
+            connect_timeout=float(os.getenv("SPOTIFY_MCP_HTTP_CONNECT_TIMEOUT", defaults.connect_timeout)),
+            read_timeout=float(os.getenv("SPOTIFY_MCP_HTTP_READ_TIMEOUT", defaults.read_timeout)),
+            retries=int(os.getenv("SPOTIFY_MCP_HTTP_RETRIES", defaults.retries)),
+            backoff_factor=float(os.getenv("SPOTIFY_MCP_HTTP_BACKOFF", defaults.backoff_factor)),
+            warm_up=os.getenv("SPOTIFY_MCP_HTTP_WARM_UP", str(defaults.warm_up)).lower() == "true",
+        )
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+
+def build_session(config: HttpConfig) -> requests.Session:
+    """Create a keep-alive session with a sized connection pool and retry policy."""
+    retry = urllib3.Retry(
+        total=config.retries,
+        connect=None,
+        read=False,
+        # No POST or PUT: a 5xx to e.g. a playlist add, skip or reorder may still have been
+        # applied, and repeating it would add the tracks, skip or move the range twice.
+        allowed_methods=frozenset(["GET", "DELETE"]),
+        status=config.retries,
+        backoff_factor=config.backoff_factor,
+        status_forcelist=(500, 502, 503, 504),
+        # Leave 429s to the scheduler, which blocks the shared bucket for their Retry-After;
+        # urllib3 would otherwise sleep them out and retry inside the one request.
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def warm_up(session: requests.Session, config: HttpConfig, logger: Optional[logging.Logger] = None) -> threading.Thread:
+    """
+    Open pooled connections to the API and token hosts on a background thread, so the first
+    tool call does not pay for DNS and the TLS handshake. Failures are only logged.
+    """
+    logger = logger or logging.getLogger(__name__)
+
+    def run() -> None:
+        for url in (API_URL, ACCOUNTS_URL):
+            try:
+                session.head(url, timeout=config.timeout)
+            except requests.RequestException as e:
+                logger.info("Connection warm-up to %s failed: %s", url, e)
+
+    thread = threading.Thread(target=run, name="spotify-http-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,267 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .. import utils
+from .client import SpotifyClient
+from .models import AlbumInfo, PlaylistInfo, QType, TrackInfo
+from .pagination import paginate
+from .playlists import PlaylistManager
+
+DEFAULT_LIBRARY_PATH = ".spotify-library.db"
+
+# Bumped when SCHEMA gains tables an existing index lacks; such an index counts as never synced.
+SCHEMA_VERSION = 2
+
+# Playlist item fields the index reads: what parse_track needs plus the artists' ids.
+ITEM_FIELDS = "total,items(track(id,name,artists(id,name),is_playable))"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    artist TEXT NOT NULL,
+    saved INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS albums (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    artist TEXT NOT NULL,
+    release_date TEXT,
+    total_tracks INTEGER
+);
+CREATE TABLE IF NOT EXISTS playlists (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    owner TEXT,
+    tracks_total INTEGER,
+    public INTEGER
+);
+CREATE TABLE IF NOT EXISTS playlist_tracks (
+    playlist_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    track_id TEXT NOT NULL,
+    PRIMARY KEY (playlist_id, position)
+);
+CREATE TABLE IF NOT EXISTS track_artists (
+    track_id TEXT NOT NULL,
+    artist_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (track_id, artist_id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS tracks_fts USING fts5(name, artist, content='tracks', content_rowid='rowid');
+CREATE VIRTUAL TABLE IF NOT EXISTS albums_fts USING fts5(name, artist, content='albums', content_rowid='rowid');
+CREATE VIRTUAL TABLE IF NOT EXISTS playlists_fts USING fts5(name, owner, content='playlists', content_rowid='rowid');
+CREATE VIRTUAL TABLE IF NOT EXISTS track_artists_fts USING fts5(name, content='track_artists', content_rowid='rowid');
+"""
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# A track and the (id, name) of each artist it credits.
+CreditedTrack = Tuple[TrackInfo, List[Tuple[str, str]]]
+
+def _parse_item(item: Dict[str, Any]) -> Optional[CreditedTrack]:
+    track = item.get('track') if item else None
+    if not (info := utils.parse_track(track)) or not info.get('id'):
+        return None
+    return info, [(a['id'], a['name']) for a in track['artists'] if a.get('id')]
+
+def _artist_text(item: Union[TrackInfo, AlbumInfo]) -> str:
+    if 'artists' in item:
+        return ", ".join(a if isinstance(a, str) else a['name'] for a in item['artists'])
+    return item.get('artist', '')
+
+def fts_query(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching every word as a prefix."""
+    tokens = _TOKEN.findall(text)
+    if not tokens:
+        return None
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+class LibraryIndex:
+    """
+    Local SQLite/FTS5 index of the current user's playlists, saved tracks and saved albums.
+
+    `sync()` pulls the library through the paginated endpoints (playlist tracks via
+    PlaylistManager) and rebuilds the index; `search()` then answers "in my library" queries
+    without a network round trip. The database is opened on first use.
+    """
+
+    def __init__(self, client: SpotifyClient, playlists: PlaylistManager, path: Optional[str] = None):
+        """
+        Args:
+            client: Spotify client used for syncing
+            playlists: Playlist manager used to page through playlist tracks
+            path: SQLite file. If None, reads SPOTIFY_MCP_LIBRARY_DB from the environment,
+                falling back to DEFAULT_LIBRARY_PATH. ':memory:' keeps the index in memory.
+        """
+        self.client = client
+        self.sp = client.sp
+        self.logger = client.logger.getChild("library")
+        self.playlists = playlists
+        self.path = path or os.getenv("SPOTIFY_MCP_LIBRARY_DB", DEFAULT_LIBRARY_PATH)
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript(SCHEMA)
+            if self._db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                with self._db:
+                    self._db.execute("DELETE FROM meta WHERE key = 'synced_at'")
+                    self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return self._db
+
+    @utils.validate
+    def sync(self) -> Dict[str, Any]:
+        """Rebuild the index from the user's library. Returns the index stats."""
+        started = time.time()
+        saved_tracks = list(paginate(
+            lambda offset, limit: self.sp.current_user_saved_tracks(limit=limit, offset=offset),
+            _parse_item,
+            self.client.fanout,
+            page_size=50
+        ))
+        saved_albums = list(paginate(
+            lambda offset, limit: self.sp.current_user_saved_albums(limit=limit, offset=offset),
+            lambda item: utils.parse_album(item.get('album')),
+            self.client.fanout,
+            page_size=50
+        ))
+        playlists = list(paginate(
+            lambda offset, limit: self.sp.current_user_playlists(limit=limit, offset=offset),
+            utils.parse_playlist,
+            self.client.fanout,
+            page_size=50
+        ))
+        playlist_tracks = [
+            (p, list(self.playlists.iter_playlist_items(p['id'], ITEM_FIELDS, _parse_item)))
+            for p in playlists
+        ]
+
+        with self._lock, self.db as db:
+            for table in ('tracks', 'track_artists', 'albums', 'playlists', 'playlist_tracks'):
+                db.execute(f"DELETE FROM {table}")
+            self._insert_tracks(db, [(t, False) for _, tracks in playlist_tracks for t in tracks])
+            self._insert_tracks(db, [(t, True) for t in saved_tracks])
+            db.executemany(
+                "INSERT OR REPLACE INTO albums (id, name, artist, release_date, total_tracks) VALUES (?, ?, ?, ?, ?)",
+                [(a['id'], a['name'], a['artist'], a.get('release_date'), a.get('total_tracks')) for a in saved_albums]
+            )
+            db.executemany(
+                "INSERT OR REPLACE INTO playlists (id, name, owner, tracks_total, public) VALUES (?, ?, ?, ?, ?)",
+                [(p['id'], p['name'], p['owner'], p['tracks_total'], int(bool(p['public']))) for p in playlists]
+            )
+            db.executemany(
+                "INSERT INTO playlist_tracks (playlist_id, position, track_id) VALUES (?, ?, ?)",
+                [(p['id'], i, t['id']) for p, tracks in playlist_tracks for i, (t, _) in enumerate(tracks)]
+            )
+            for fts in ('tracks_fts', 'albums_fts', 'playlists_fts', 'track_artists_fts'):
+                db.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('synced_at', ?)", (str(time.time()),))
+
+        self.logger.info("Library index synced in %.1fs", time.time() - started)
+        return self.stats()
+
+    @staticmethod
+    def _insert_tracks(db: sqlite3.Connection, tracks: List[Tuple[CreditedTrack, bool]]) -> None:
+        db.executemany(
+            "INSERT INTO tracks (id, name, artist, saved) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET saved = MAX(saved, excluded.saved)",
+            [(t['id'], t['name'], _artist_text(t), int(saved)) for (t, _), saved in tracks]
+        )
+        db.executemany(
+            "INSERT OR IGNORE INTO track_artists (track_id, artist_id, name) VALUES (?, ?, ?)",
+            [(t['id'], artist_id, name) for (t, credits), _ in tracks for artist_id, name in credits]
+        )
+
+    def search(self, query: str, qtype: Union[QType, str] = 'track', limit: int = 10) -> Dict[str, List[Any]]:
+        """
+        Full-text search over the indexed library, returning the same shape as
+        SearchManager.search. Artists are those credited on indexed tracks, matched by their own
+        name and counted once per track however many other artists share the credit.
+        """
+        expr = fts_query(query)
+        results: Dict[str, List[Any]] = {}
+        if expr is None:
+            return results
+
+        with self._lock:
+            db = self.db
+            for q in qtype.split(","):
+                match q.strip():
+                    case 'track':
+                        rows = db.execute(
+                            "SELECT t.id, t.name, t.artist FROM tracks_fts JOIN tracks t ON t.rowid = tracks_fts.rowid "
+                            "WHERE tracks_fts MATCH ? ORDER BY rank LIMIT ?", (expr, limit)
+                        ).fetchall()
+                        results['tracks'] = [{'id': r[0], 'name': r[1], 'artist': r[2]} for r in rows]
+                    case 'album':
+                        rows = db.execute(
+                            "SELECT a.id, a.name, a.artist, a.release_date, a.total_tracks FROM albums_fts "
+                            "JOIN albums a ON a.rowid = albums_fts.rowid WHERE albums_fts MATCH ? ORDER BY rank LIMIT ?",
+                            (expr, limit)
+                        ).fetchall()
+                        results['albums'] = [
+                            {'id': r[0], 'name': r[1], 'artist': r[2], 'release_date': r[3] or '', 'total_tracks': r[4] or 0}
+                            for r in rows
+                        ]
+                    case 'playlist':
+                        rows = db.execute(
+                            "SELECT p.id, p.name, p.owner, p.tracks_total, p.public FROM playlists_fts "
+                            "JOIN playlists p ON p.rowid = playlists_fts.rowid WHERE playlists_fts MATCH ? ORDER BY rank LIMIT ?",
+                            (expr, limit)
+                        ).fetchall()
+                        results['playlists'] = [
+                            {'id': r[0], 'name': r[1], 'owner': r[2], 'tracks_total': r[3], 'public': bool(r[4])}
+                            for r in rows
+                        ]
+                    case 'artist':
+                        rows = db.execute(
+                            "SELECT ta.artist_id, MIN(ta.name), COUNT(*) AS n FROM track_artists_fts "
+                            "JOIN track_artists ta ON ta.rowid = track_artists_fts.rowid WHERE track_artists_fts MATCH ? "
+                            "GROUP BY ta.artist_id ORDER BY n DESC, MIN(ta.name) LIMIT ?",
+                            (expr, limit)
+                        ).fetchall()
+                        results['artists'] = [{'id': r[0], 'name': r[1], 'tracks_in_library': r[2]} for r in rows]
+                    case _:
+                        raise ValueError(f"unknown qtype {qtype}")
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Row counts, database size and how long ago the index was synced."""
+        with self._lock:
+            db = self.db
+            counts = {
+                table: db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('tracks', 'albums', 'playlists')
+            }
+            row = db.execute("SELECT value FROM meta WHERE key = 'synced_at'").fetchone()
+        synced_at = float(row[0]) if row else None
+        size = os.path.getsize(self.path) if self.path != ':memory:' and os.path.exists(self.path) else None
+        return {
+            **counts,
+            'bytes': size,
+            'synced_at': synced_at,
+            'age_seconds': round(time.time() - synced_at, 1) if synced_at else None,
+        }
+
+    @property
+    def is_synced(self) -> bool:
+        return self.stats()['synced_at'] is not None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -1,4 +1,4 @@
-from typing import List, Literal, Optional, TypedDict
+from typing import List, Literal, NotRequired, Optional, TypedDict
 
 QType = Literal['track', 'album', 'artist', 'playlist']
 
@@ -13,6 +13,8 @@ class PlaylistInfo(TypedDict):
     owner: str
     tracks_total: int
     public: bool
+    snapshot_id: NotRequired[str]
+    tracks: NotRequired[List['TrackInfo']]
 
 class PlaylistResponse(TypedDict):
     playlists: List[PlaylistInfo]
@@ -41,3 +43,4 @@ class AlbumInfo(TypedDict):
     artist: str
     release_date: str
     total_tracks: int
+    tracks: NotRequired[List[TrackInfo]]
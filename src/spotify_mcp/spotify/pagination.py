@@ -0,0 +1,68 @@
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, TypeVar
+
+from .fanout import FanOut
+
+T = TypeVar('T')
+
+DEFAULT_PAGE_CONCURRENCY = 4
+
+def paginate(
+    fetch_page: Callable[[int, int], Dict[str, Any]],
+    parse: Callable[[Dict[str, Any]], Optional[T]],
+    fanout: FanOut,
+    page_size: int = 50,
+    max_items: Optional[int] = None,
+    max_concurrency: int = DEFAULT_PAGE_CONCURRENCY
+) -> Iterator[T]:
+    """
+    Walks a Spotify paging object, fetching the remaining pages concurrently.
+
+    The first page is fetched on its own to learn `total`; the remaining offsets are then
+    requested through `fanout` with at most `max_concurrency` pages in flight. Parsed items are
+    yielded in order as each page arrives, and a raw page is dropped as soon as it is parsed.
+
+    Args:
+        fetch_page: Called as fetch_page(offset, limit); returns a Spotify paging object
+        parse: Turns one raw item into a parsed one; falsy results are skipped
+        fanout: Pool used for the concurrent page requests
+        page_size: Items per request (Spotify's maximum is usually 50)
+        max_items: Stop after this many raw items. If None, reads every page
+        max_concurrency: Maximum number of page requests in flight
+    """
+    first_limit = page_size if max_items is None else min(page_size, max_items)
+    if first_limit <= 0:
+        return
+    first = fetch_page(0, first_limit)
+    if not first:
+        return
+
+    total = first.get('total') or 0
+    if max_items is not None:
+        total = min(total, max_items)
+
+    yield from _parse_page(first, parse)
+    del first
+
+    offsets = iter(range(page_size, total, page_size))
+    pending: Deque = deque()
+
+    def submit_next() -> None:
+        offset = next(offsets, None)
+        if offset is not None:
+            pending.append(fanout.submit(fetch_page, offset, min(page_size, total - offset)))
+
+    for _ in range(max(1, max_concurrency)):
+        submit_next()
+
+    while pending:
+        page = pending.popleft().result()
+        submit_next()
+        if page:
+            yield from _parse_page(page, parse)
+
+
+def _parse_page(page: Dict[str, Any], parse: Callable[[Dict[str, Any]], Optional[T]]) -> Iterator[T]:
+    for item in page.get('items') or []:
+        if item and (parsed := parse(item)):
+            yield parsed
@@ -1,19 +1,74 @@
-from typing import Any, Dict, List, Optional, cast
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+
+from spotipy import SpotifyException
 
 from .. import utils
 from .client import SpotifyClient
 from .models import QueueInfo, SpotifyDevice, TrackInfo
 
+# How long a fetched playback state may be reused by later calls, in seconds.
+DEFAULT_SNAPSHOT_TTL = 1.0
+
+# A queue jump costs at least 4 requests (playback state, queue, a page of the context's
+# tracks, start_playback), so stepping with next_track is cheaper below this many skips.
+JUMP_MIN_SKIPS = 5
+
+# Context types that accept a start_playback offset, with the page size their tracks are read in.
+CONTEXT_PAGE_SIZES = {'album': 50, 'playlist': 100}
+OFFSET_CONTEXTS = tuple(CONTEXT_PAGE_SIZES)
+
+def _pages(total: int, page_size: int) -> int:
+    return max(1, -(-total // page_size))
+
+class PlaybackSnapshot:
+    """
+    Short-lived cache of the `current_playback` response.
+
+    Several PlaybackManager methods need the same state (is something playing, what track,
+    on which device). Within `ttl` seconds they share one upstream request; any call that
+    changes playback invalidates the snapshot.
+    """
+
+    def __init__(self, fetch: Callable[[], Optional[Dict[str, Any]]], ttl: float = DEFAULT_SNAPSHOT_TTL) -> None:
+        self._fetch = fetch
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._state: Optional[Dict[str, Any]] = None
+        self._fetched_at: Optional[float] = None
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self._fetched_at is None or time.monotonic() - self._fetched_at > self.ttl:
+                self._state = self._fetch()
+                self._fetched_at = time.monotonic()
+            return self._state
+
+    def peek(self) -> Optional[Dict[str, Any]]:
+        """Return the cached state if it is still fresh, without fetching."""
+        with self._lock:
+            if self._fetched_at is not None and time.monotonic() - self._fetched_at <= self.ttl:
+                return self._state
+            return None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._state = None
+            self._fetched_at = None
+
+
 class PlaybackManager:
-    def __init__(self, client: SpotifyClient):
+    def __init__(self, client: SpotifyClient, snapshot_ttl: float = DEFAULT_SNAPSHOT_TTL):
         self.client = client
         self.sp = client.sp
-        self.logger = client.logger
+        self.logger = client.logger.getChild("playback")
+        self.snapshot = PlaybackSnapshot(lambda: self.sp.current_playback(), ttl=snapshot_ttl)
 
     def get_current_track(self) -> Optional[TrackInfo]:
         """Get information about the currently playing track"""
         try:
-            current = self.sp.current_user_playing_track()
+            current = self.snapshot.get()
             if not current:
                 self.logger.info("No playback session found")
                 return None
@@ -27,8 +82,7 @@ class PlaybackManager:
             if 'is_playing' in current:
                 track_info['is_playing'] = current['is_playing']
 
-            self.logger.info(
-                f"Current track: {track_info.get('name', 'Unknown')} by {track_info.get('artist', 'Unknown')}")
+            self.logger.info("Current track: %s by %s", track_info.get('name', 'Unknown'), track_info.get('artist', 'Unknown'))
             return track_info
         except Exception as e:
             self.logger.error("Error getting current track info", exc_info=True)
@@ -48,24 +102,33 @@ class PlaybackManager:
             device_id = device.get('id') if device else None
 
             result = self.sp.start_playback(uris=uris, device_id=device_id)
-            self.logger.info(f"Playback started successfully{' for track_id: ' + track_id if track_id else ''}")
+            self.snapshot.invalidate()
+            self.logger.info("Playback started successfully for track_id: %s", track_id)
             return result
         except Exception as e:
-            self.logger.error(f"Error starting playback: {str(e)}", exc_info=True)
+            self.logger.error("Error starting playback: %s", e, exc_info=True)
             raise e
 
     @utils.validate
     def pause_playback(self, device: Optional[SpotifyDevice] = None) -> None:
-        playback = self.sp.current_playback()
+        playback = self.snapshot.get()
         if playback and playback.get('is_playing'):
             self.sp.pause_playback(device.get('id') if device else None)
+            self.snapshot.invalidate()
 
     @utils.validate
     def get_queue(self, device: Optional[SpotifyDevice] = None) -> QueueInfo:
         queue_info = self.sp.queue()
-        self.logger.info(f"currently playing keys {queue_info['currently_playing'].keys()}")
 
-        current_track = self.get_current_track()
+        # The queue response already carries the current item; only `is_playing` is missing,
+        # and it is filled in from a fresh playback snapshot when one is available.
+        current_track = None
+        currently_playing = queue_info.get('currently_playing')
+        if currently_playing and currently_playing.get('type', 'track') == 'track':
+            current_track = utils.parse_track(currently_playing)
+            if current_track and (state := self.snapshot.peek()) and 'is_playing' in state:
+                current_track['is_playing'] = state['is_playing']
+
         parsed_queue: List[TrackInfo] = []
         
         for track in queue_info.pop('queue', []):
@@ -94,9 +157,9 @@ class PlaybackManager:
             device_id = device.get('id') if device else None
             
             self.sp.add_to_queue(uri, device_id=device_id)
-            self.logger.info(f"Added track {track_id} to queue")
+            self.logger.info("Added track %s to queue", track_id)
         except Exception as e:
-            self.logger.error(f"Error adding track to queue: {str(e)}", exc_info=True)
+            self.logger.error("Error adding track to queue: %s", e, exc_info=True)
             raise e
 
     def is_track_playing(self) -> bool:
@@ -105,12 +168,133 @@ class PlaybackManager:
             return False
         return curr_track.get('is_playing', False)
 
-    def skip_track(self, n: int = 1) -> None:
-        for _ in range(n):
-            self.sp.next_track()
+    def skip_track(self, n: int = 1) -> Dict[str, Any]:
+        """
+        Skips forward n tracks.
+
+        For n >= JUMP_MIN_SKIPS, reads the current album/playlist's track ids and the queue and
+        starts playback at the position n tracks on, when that takes fewer requests than n
+        next_track calls. Falls back to next_track when there is no such context, when the
+        current track occurs more than once in it, or when the queue is not simply the
+        context's next tracks (manually queued tracks, shuffle). A jump dropped because the
+        context is too long costs at most the playback state and the context's first page on
+        top of the n next_track calls, and nothing when the snapshot is fresh and the context's
+        size is cached.
+
+        Returns:
+            The path taken ('jump' or 'next'), the number of upstream requests, and the elapsed
+            time in milliseconds, so the two paths can be compared.
+        """
+        started = time.perf_counter()
+        requests = 0
+        method = 'next'
+        if n >= JUMP_MIN_SKIPS:
+            jumped, requests = self._jump_forward(n)
+            if jumped:
+                method = 'jump'
+        if method == 'next':
+            for _ in range(n):
+                self.sp.next_track()
+            requests += n
+        self.snapshot.invalidate()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.logger.info("Skipped %d tracks via %s in %.0fms (%d requests)", n, method, elapsed_ms, requests)
+        return {'method': method, 'requests': requests, 'elapsed_ms': round(elapsed_ms, 1)}
+
+    def _jump_forward(self, n: int) -> Tuple[bool, int]:
+        """
+        Try to start playback n tracks further into the context. Returns (succeeded, requests made).
+
+        The checks run cheapest first, so a jump that cannot pay off is dropped before it costs
+        anything it can avoid. The playback state rules out other contexts and shuffle; it is
+        free while the snapshot is fresh. A context whose cached size is already too large to
+        read within the budget is dropped next. Only then are the context's pages and the
+        queue requested.
+        """
+        requests = 0 if self.snapshot.peek() else 1
+        state = self.snapshot.get() or {}
+        context = state.get('context') or {}
+        current_id = (state.get('item') or {}).get('id')
+        if context.get('type') not in OFFSET_CONTEXTS or state.get('shuffle_state') or not current_id:
+            return False, requests
+
+        # Worth it only if the context's pages, the queue and start_playback beat n next_track
+        # calls: the pages may cost at most this many requests.
+        budget = n - requests - 3
+        known = self._cached_context_size(context)
+        if budget < 1 or (known is not None and _pages(known, CONTEXT_PAGE_SIZES[context['type']]) > budget):
+            return False, requests
+
+        track_ids, pages = self._context_track_ids(context, budget)
+        requests += pages
+        if track_ids is None:
+            return False, requests
+        positions = [i for i, track_id in enumerate(track_ids) if track_id == current_id]
+        if len(positions) != 1:
+            return False, requests
+        start = positions[0] + 1
+
+        queue_info = self.sp.queue()
+        requests += 1
+        queue = queue_info.get('queue') or []
+        # Manually queued tracks play before the context's, and shuffle reorders it; either
+        # way the queue no longer lines up with the context and next_track is the safe path.
+        if (
+            len(queue) < n
+            or (queue_info.get('currently_playing') or {}).get('id') != current_id
+            or [(t or {}).get('id') for t in queue[:n]] != track_ids[start:start + n]
+        ):
+            return False, requests
+
+        try:
+            self.sp.start_playback(context_uri=context['uri'], offset={'position': start + n - 1})
+            return True, requests + 1
+        except SpotifyException as e:
+            self.logger.info("Jump to position %d failed, falling back to next_track: %s", start + n - 1, e)
+            return False, requests + 1
+
+    def _cached_context_size(self, context: Dict[str, Any]) -> Optional[int]:
+        """Number of tracks of an album or playlist context, if the client's caches know it."""
+        context_id = context['uri'].rsplit(":", 1)[-1]
+        if context['type'] == 'playlist':
+            cached = self.client.playlist_cache.peek(context_id)
+            return len(cached[1]) if cached else None
+        album = self.client.metadata_cache.peek(('album', context_id))
+        return album.get('total_tracks') if album else None
+
+    def _context_track_ids(self, context: Dict[str, Any], budget: int) -> Tuple[Optional[List[Optional[str]]], int]:
+        """
+        Track ids of an album or playlist context in play order (None for unavailable items),
+        or None if reading them takes more than `budget` requests. Also returns the requests made.
+        """
+        if budget < 1:
+            return None, 0
+        context_id = context['uri'].rsplit(":", 1)[-1]
+        page_size = CONTEXT_PAGE_SIZES[context['type']]
+        if context['type'] == 'playlist':
+            fetch = lambda offset: self.sp.playlist_items(
+                context_id, fields="total,items(track(id))", limit=page_size, offset=offset,
+                market="from_token", additional_types=("track",)
+            )
+            item_id = lambda item: (item.get('track') or {}).get('id')
+        else:
+            fetch = lambda offset: self.sp.album_tracks(context_id, limit=page_size, offset=offset, market="from_token")
+            item_id = lambda item: item.get('id')
+
+        first = fetch(0)
+        total = first.get('total') or 0
+        pages = _pages(total, page_size)
+        if pages > budget:
+            return None, 1
+        track_ids = []
+        for page in [first, *self.client.fanout.map(fetch, range(page_size, total, page_size))]:
+            track_ids.extend(item_id(item) if item else None for item in page.get('items') or [])
+        return track_ids, pages
 
     def previous_track(self) -> None:
         self.sp.previous_track()
+        self.snapshot.invalidate()
 
     def get_devices(self) -> List[SpotifyDevice]:
         return cast(List[SpotifyDevice], self.sp.devices()['devices'])
@@ -127,5 +311,5 @@ class PlaybackManager:
             if device.get('is_active'):
                 return device
                 
-        self.logger.info(f"No active device, assigning {devices[0]['name']}.")
+        self.logger.info("No active device, assigning %s.", devices[0]['name'])
         return devices[0]
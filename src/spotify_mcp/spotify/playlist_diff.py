@@ -0,0 +1,150 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+# Spotify accepts at most this many items per add, remove or replace request.
+WRITE_LIMIT = 100
+
+def chunks(items: List[str], size: int = WRITE_LIMIT) -> List[List[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+@dataclass
+class SyncPlan:
+    """
+    Requests that turn a playlist's current track ids into a target list, to be sent in order:
+    removals, then moves, then inserts. `replace` is set instead when rewriting the whole
+    playlist takes fewer requests.
+
+    Attributes:
+        remove: Ids to remove; Spotify removes every occurrence of each
+        moves: (range_start, insert_before, range_length) reorders, positions as of each request
+        inserts: (position, ids) adds, each at most WRITE_LIMIT ids
+        replace: The full target list, when the playlist is rewritten rather than patched
+    """
+    remove: List[str] = field(default_factory=list)
+    moves: List[Tuple[int, int, int]] = field(default_factory=list)
+    inserts: List[Tuple[int, List[str]]] = field(default_factory=list)
+    replace: Optional[List[str]] = None
+
+    @property
+    def requests(self) -> int:
+        if self.replace is not None:
+            return replace_requests(self.replace)
+        return len(chunks(self.remove)) + len(self.moves) + len(self.inserts)
+
+
+def replace_requests(target: List[str]) -> int:
+    """One replace with the first WRITE_LIMIT ids, then one add per further chunk."""
+    return max(1, len(chunks(target)))
+
+
+def plan_sync(current: List[str], target: List[str]) -> SyncPlan:
+    """
+    Plan the fewest requests that make `current` equal to `target` (both lists of track ids in
+    playlist order, duplicates allowed).
+
+    - Ids with more copies than `target` wants are removed outright (removal is by id, not by
+      position); the copies still wanted are inserted again.
+    - Of the tracks that stay, those on a longest increasing run of target positions keep their
+      place; the rest are moved, with neighbours that travel together moved as one range.
+    - Missing tracks are inserted left to right, one request per contiguous run.
+    """
+    want, have = Counter(target), Counter(current)
+    remove = [i for i in have if have[i] > want[i]]
+    removed = set(remove)
+    kept = [i for i in current if i not in removed]
+
+    # Target position of each kept track, matching duplicate occurrences in order.
+    if len(want) == len(target):
+        index = {track_id: position for position, track_id in enumerate(target)}
+        order = [index[i] for i in kept]
+    else:
+        slots: Dict[str, Deque[int]] = defaultdict(deque)
+        for position, track_id in enumerate(target):
+            slots[track_id].append(position)
+        order = [slots[i].popleft() for i in kept]
+
+    inserts: List[Tuple[int, List[str]]] = []
+    if len(order) < len(target):
+        present = set(order)
+        run_start = None
+        for position in range(len(target) + 1):
+            if position < len(target) and position not in present:
+                if run_start is None:
+                    run_start = position
+            elif run_start is not None:
+                for offset, ids in zip(range(0, position - run_start, WRITE_LIMIT), chunks(target[run_start:position])):
+                    inserts.append((run_start + offset, ids))
+                run_start = None
+
+    budget = replace_requests(target)
+    stay = _longest_increasing(order)
+    fixed = len(chunks(remove)) + len(inserts)
+    if fixed + (len(stay) < len(order)) > budget:
+        return SyncPlan(replace=list(target))
+    moves = _moves(order, stay, budget - fixed)
+    if moves is None:
+        return SyncPlan(replace=list(target))
+    return SyncPlan(remove=remove, moves=moves, inserts=inserts)
+
+
+def _longest_increasing(values: List[int]) -> List[int]:
+    """The values on one longest strictly increasing subsequence, in order (patience sorting)."""
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous = [-1] * len(values)
+    for i, value in enumerate(values):
+        k = bisect_left(tails, value)
+        if k == len(tails):
+            tails.append(value)
+            tail_index.append(i)
+        else:
+            tails[k] = value
+            tail_index[k] = i
+        previous[i] = tail_index[k - 1] if k else -1
+    result = []
+    i = tail_index[-1] if tail_index else -1
+    while i >= 0:
+        result.append(values[i])
+        i = previous[i]
+    return result[::-1]
+
+
+def _moves(order: List[int], stay: List[int], limit: int) -> Optional[List[Tuple[int, int, int]]]:
+    """
+    Reorders that sort `order` while leaving `stay` in place, or None if more than `limit` are
+    needed. Tracks are placed in increasing target order, each right after the placed track
+    that precedes it.
+    """
+    work = list(order)
+    placed = sorted(stay)
+    unplaced = sorted(set(order) - set(stay))
+    moves: List[Tuple[int, int, int]] = []
+    k = 0
+    while k < len(unplaced):
+        value = unplaced[k]
+        start = work.index(value)
+        # Take along the following tracks that belong directly after this one.
+        after = bisect_right(placed, value)
+        bound = placed[after] if after < len(placed) else len(order) + len(unplaced)
+        length = 1
+        while (k + length < len(unplaced) and start + length < len(work)
+               and work[start + length] == unplaced[k + length] and unplaced[k + length] < bound):
+            length += 1
+
+        before = bisect_left(placed, value)
+        insert_before = work.index(placed[before - 1]) + 1 if before else 0
+        if not start <= insert_before <= start + length:
+            if len(moves) == limit:
+                return None
+            block = work[start:start + length]
+            del work[start:start + length]
+            at = insert_before if insert_before < start else insert_before - length
+            work[at:at] = block
+            moves.append((start, insert_before, length))
+        for moved in unplaced[k:k + length]:
+            insort(placed, moved)
+        k += length
+    return moves
@@ -1,35 +1,151 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
 
 from .. import utils
 from .client import SpotifyClient
-from .models import PlaylistInfo, PlaylistResponse
+from .models import PlaylistInfo, PlaylistResponse, TrackInfo
+from .pagination import paginate
+from .playlist_diff import WRITE_LIMIT, chunks, plan_sync
+
+T = TypeVar('T')
+
+def _snapshot(result: Optional[Dict[str, Any]]) -> Optional[str]:
+    return (result or {}).get('snapshot_id')
 
 class PlaylistManager:
     def __init__(self, client: SpotifyClient):
         self.client = client
         self.sp = client.sp
-        self.logger = client.logger
+        self.logger = client.logger.getChild("playlists")
 
-    def get_user_playlists(self, user: str) -> PlaylistResponse:
+    def get_user_playlists(self, user: str, max_items: Optional[int] = None) -> PlaylistResponse:
         """
         Returns list of playlists belonging to user
         - user: username of user
+        - max_items: maximum number of playlists to return. If None, returns all of them
         """
         try:
-            results = self.sp.user_playlists(user)
-            if not results or 'items' not in results:
-                return {"playlists": []}
-                
-            playlists: List[PlaylistInfo] = []
-            for item in results['items']:
-                if playlist := utils.parse_playlist(item):
-                    playlists.append(playlist)
-                
-            return {"playlists": playlists}
+            return {"playlists": list(self.iter_user_playlists(user, max_items=max_items))}
         except Exception as e:
-            self.logger.error(f"Error getting user playlists: {str(e)}", exc_info=True)
+            self.logger.error("Error getting user playlists: %s", e, exc_info=True)
             raise
 
+    def iter_user_playlists(self, user: str, max_items: Optional[int] = None) -> Iterator[PlaylistInfo]:
+        """
+        Yields the user's playlists page by page, fetching pages after the first concurrently.
+        - user: username of user
+        - max_items: maximum number of playlists to yield. If None, yields all of them
+        """
+        return paginate(
+            lambda offset, limit: self.sp.user_playlists(user, limit=limit, offset=offset),
+            utils.parse_playlist,
+            self.client.fanout,
+            page_size=50,
+            max_items=max_items
+        )
+
+    def iter_playlist_tracks(self, playlist_id: str, max_items: Optional[int] = None) -> Iterator[TrackInfo]:
+        """
+        Yields the tracks of a playlist in order, 100 per page with pages fetched concurrently.
+        Only the fields `utils.parse_track` reads are requested from Spotify.
+        - playlist_id: the id of the playlist.
+        - max_items: maximum number of tracks to yield. If None, yields all of them
+        """
+        return self.iter_playlist_items(playlist_id, utils.PLAYLIST_ITEM_FIELDS, utils.parse_playlist_item, max_items)
+
+    def iter_playlist_items(
+        self,
+        playlist_id: str,
+        fields: str,
+        parse: Callable[[Dict[str, Any]], Optional[T]],
+        max_items: Optional[int] = None
+    ) -> Iterator[T]:
+        """
+        Like iter_playlist_tracks, for callers that need other fields of each item.
+        - fields: Spotify `fields=` filter for the items page, e.g. "total,items(track(id))"
+        - parse: turns one raw playlist item into a parsed one; falsy results are skipped
+        """
+        return paginate(
+            lambda offset, limit: self._page(playlist_id, offset, limit, fields),
+            parse,
+            self.client.fanout,
+            page_size=100,
+            max_items=max_items
+        )
+
+    def get_playlist_tracks(
+        self,
+        playlist_id: str,
+        snapshot_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[TrackInfo]:
+        """
+        Returns all tracks of a playlist, reusing the cached list while the playlist's
+        snapshot_id is unchanged.
+        - playlist_id: the id of the playlist.
+        - snapshot_id: the playlist's current snapshot_id, if the caller already has it (e.g.
+                       from a playlist listing). If None, only the header is fetched to learn it.
+        - fields: track keys the caller keeps (see utils.project_fields). On a cache miss only
+                  these are requested, and the partial tracks are not cached.
+        """
+        if snapshot_id is None:
+            snapshot_id = self.sp.playlist(playlist_id, fields="snapshot_id").get('snapshot_id')
+
+        cache = self.client.playlist_cache
+        if snapshot_id and (tracks := cache.get_contents(playlist_id, snapshot_id)) is not None:
+            return tracks
+
+        item_fields = utils.playlist_item_fields(fields)
+        if item_fields != utils.PLAYLIST_ITEM_FIELDS:
+            return list(self.iter_playlist_items(playlist_id, item_fields, utils.parse_playlist_item))
+        tracks = list(self.iter_playlist_tracks(playlist_id))
+        if snapshot_id:
+            cache.set_contents(playlist_id, snapshot_id, tracks)
+        return tracks
+
+    def _page(self, playlist_id: str, offset: int, limit: int, fields: str = utils.PLAYLIST_ITEM_FIELDS) -> Dict[str, Any]:
+        return self.sp.playlist_items(
+            playlist_id,
+            fields=fields,
+            limit=limit,
+            offset=offset,
+            market="from_token",
+            additional_types=("track",)
+        )
+
+    def _after_add(self, playlist_id: str, added: int, snapshot_id: Optional[str]) -> None:
+        """
+        Bring the cached contents up to `snapshot_id` by fetching only the appended range.
+        The page's total doubles as a check that nobody else changed the playlist meanwhile.
+        """
+        cache = self.client.playlist_cache
+        cached = cache.peek(playlist_id)
+        if not cached or not snapshot_id or added > WRITE_LIMIT:
+            cache.invalidate(playlist_id)
+            return
+        _, tracks = cached
+        raw_count = len(tracks)
+        page = self._page(playlist_id, offset=raw_count, limit=added)
+        if page.get('total') != raw_count + added or len(page.get('items') or []) != added:
+            cache.invalidate(playlist_id)
+            return
+        new_tracks = utils.parse_playlist_tracks(page['items'])
+        cache.set_contents(playlist_id, snapshot_id, tracks + new_tracks)
+
+    def _after_remove(self, playlist_id: str, removed: List[str], snapshot_id: Optional[str]) -> None:
+        """Drop the removed ids from the cached contents, verifying the resulting length."""
+        cache = self.client.playlist_cache
+        cached = cache.peek(playlist_id)
+        if not cached or not snapshot_id:
+            cache.invalidate(playlist_id)
+            return
+        removed_ids = set(removed)
+        tracks = [t for t in cached[1] if t.get('id') not in removed_ids]
+        header = self.sp.playlist(playlist_id, fields="tracks(total)")
+        if header.get('tracks', {}).get('total') != len(tracks):
+            cache.invalidate(playlist_id)
+            return
+        cache.set_contents(playlist_id, snapshot_id, tracks)
+
     @utils.validate
     def add_items(self, playlist_id: str, items: List[str]) -> None:
         """
@@ -37,9 +153,13 @@ class PlaylistManager:
         - playlist_id: the id of the playlist.
         - items: a list of track URIs or URLs in the form `spotify:track:{track_id}`
         """
-        formatted_items = [f"spotify:track:{id}" for id in items]
-        self.sp.playlist_add_items(playlist_id, formatted_items)
-        self.logger.info(f"Added {len(items)} tracks to playlist {playlist_id}")
+        snapshot_id = None
+        # Spotify takes at most 100 items per request; chunks are appended in order.
+        for chunk in chunks([f"spotify:track:{id}" for id in items]):
+            snapshot_id = _snapshot(self.sp.playlist_add_items(playlist_id, chunk))
+        self.client.metadata_cache.invalidate_item('playlist', playlist_id)
+        self._after_add(playlist_id, len(items), snapshot_id)
+        self.logger.info("Added %d tracks to playlist %s", len(items), playlist_id)
 
     @utils.validate
     def remove_items(self, playlist_id: str, items: List[str]) -> None:
@@ -54,19 +174,88 @@ class PlaylistManager:
             SpotifyException: If the API request fails
         """
         try:
-            formatted_items = [f"spotify:track:{id}" for id in items]
-            self.sp.playlist_remove_all_occurrences_of_items(playlist_id, formatted_items)
-            self.logger.info(f"Successfully removed {len(items)} tracks from playlist {playlist_id}")
+            snapshot_id = None
+            for chunk in chunks([f"spotify:track:{id}" for id in items]):
+                snapshot_id = _snapshot(self.sp.playlist_remove_all_occurrences_of_items(
+                    playlist_id, chunk, snapshot_id=snapshot_id
+                ))
+            self.client.metadata_cache.invalidate_item('playlist', playlist_id)
+            self._after_remove(playlist_id, items, snapshot_id)
+            self.logger.info("Successfully removed %d tracks from playlist %s", len(items), playlist_id)
         except Exception as e:
-            self.logger.error(f"Error removing items from playlist: {str(e)}", exc_info=True)
+            self.logger.error("Error removing items from playlist: %s", e, exc_info=True)
             raise
 
+    @utils.validate
+    def sync_items(self, playlist_id: str, items: List[str]) -> Dict[str, Any]:
+        """
+        Makes the playlist's tracks exactly `items`, in order, with the fewest requests: only
+        the tracks that differ are removed, moved or inserted (see playlist_diff.plan_sync),
+        each request carrying the snapshot_id returned by the one before it.
+
+        Args:
+            playlist_id: the id of the playlist
+            items: the track ids the playlist should hold, in order
+
+        Returns:
+            The resulting snapshot_id and how many tracks were removed, moved and added
+
+        Raises:
+            ValueError: If the playlist holds local files or unavailable tracks, which have no
+                track id to sync against
+        """
+        header = self.sp.playlist(playlist_id, fields="snapshot_id,tracks(total)")
+        snapshot_id = header.get('snapshot_id')
+        tracks = self.get_playlist_tracks(playlist_id, snapshot_id=snapshot_id)
+        current = [t.get('id') for t in tracks]
+        if None in current or len(current) != header.get('tracks', {}).get('total'):
+            raise ValueError(f"Playlist {playlist_id} contains local or unavailable tracks and cannot be synced")
+
+        plan = plan_sync(current, items)
+        uri = lambda track_id: f"spotify:track:{track_id}"
+        if plan.replace is not None:
+            first, *rest = chunks(plan.replace) or [[]]
+            snapshot_id = _snapshot(self.sp.playlist_replace_items(playlist_id, [uri(i) for i in first]))
+            for chunk in rest:
+                snapshot_id = _snapshot(self.sp.playlist_add_items(playlist_id, [uri(i) for i in chunk]))
+        else:
+            for chunk in chunks(plan.remove):
+                snapshot_id = _snapshot(self.sp.playlist_remove_all_occurrences_of_items(
+                    playlist_id, [uri(i) for i in chunk], snapshot_id=snapshot_id
+                ))
+            for range_start, insert_before, range_length in plan.moves:
+                snapshot_id = _snapshot(self.sp.playlist_reorder_items(
+                    playlist_id, range_start, insert_before, range_length=range_length, snapshot_id=snapshot_id
+                ))
+            for position, ids in plan.inserts:
+                snapshot_id = _snapshot(self.sp.playlist_add_items(playlist_id, [uri(i) for i in ids], position=position))
+
+        self.client.metadata_cache.invalidate_item('playlist', playlist_id)
+        # Without adds every resulting track is already parsed; otherwise reload on next read.
+        by_id = {t['id']: t for t in tracks}
+        if plan.requests and snapshot_id and all(i in by_id for i in items):
+            self.client.playlist_cache.set_contents(playlist_id, snapshot_id, [by_id[i] for i in items])
+        elif plan.requests:
+            self.client.playlist_cache.invalidate(playlist_id)
+
+        added = len(items) if plan.replace is not None else sum(len(ids) for _, ids in plan.inserts)
+        summary = {
+            'snapshot_id': snapshot_id,
+            'removed': len(current) - (len(items) - added),
+            'moved': sum(length for _, _, length in plan.moves),
+            'added': added,
+            'requests': plan.requests,
+            'replaced': plan.replace is not None,
+        }
+        self.logger.info("Synced playlist %s in %d requests: %s", playlist_id, plan.requests, summary)
+        return summary
+
     @utils.validate
     def get_playlist(self, playlist_id: str) -> Optional[PlaylistInfo]:
         """Get detailed information about a specific playlist"""
         try:
-            playlist = self.sp.playlist(playlist_id)
+            playlist = self.sp.playlist(playlist_id, fields=utils.PLAYLIST_FIELDS)
             return utils.parse_playlist(playlist, detailed=True)
         except Exception as e:
-            self.logger.error(f"Error getting playlist {playlist_id}: {str(e)}")
+            self.logger.error("Error getting playlist %s: %s", playlist_id, e)
             return None
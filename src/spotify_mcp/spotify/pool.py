@@ -0,0 +1,256 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import os
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+from ..log import get_logger
+from . import Spotify
+
+if TYPE_CHECKING:
+    from .client import SharedResources
+
+# The user a call acts for when the request names none. It keeps the single-user file
+# locations: spotipy's default token cache and SPOTIFY_MCP_LIBRARY_DB as is.
+DEFAULT_USER = "default"
+
+DEFAULT_MAX_CLIENTS = 32
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+# Seconds a call for a user without an open client waits for a busy one to be released.
+DEFAULT_ACQUIRE_TIMEOUT = 30.0
+
+# User keys become part of file names, so they are limited to a safe character set.
+_USER_KEY = re.compile(r"[A-Za-z0-9_.@-]{1,128}")
+
+# The facade of the user the current tool call acts for. Set by ClientPool.bind; ToolExecutor
+# and FanOut copy it into their worker threads along with the rest of the context.
+current_spotify: ContextVar[Optional[Spotify]] = ContextVar("spotify_mcp_spotify", default=None)
+
+
+class UserNotAuthorized(RuntimeError):
+    """The user has no token in the token cache, so a call for them cannot be made."""
+
+
+class _Entry:
+    __slots__ = ('spotify', 'in_use', 'last_used')
+
+    def __init__(self, spotify: Spotify) -> None:
+        self.spotify = spotify
+        self.in_use = 0
+        self.last_used = time.monotonic()
+
+
+class ClientPool:
+    """
+    One Spotify facade per user, so a single process can act for several accounts.
+
+    Each user gets their own token cache, client caches and library index; the HTTP session,
+    request scheduler and fan-out pool are shared by all of them (see SharedResources). At most
+    `max_clients` facades are open at once: opening another closes the least recently used one
+    that is not serving a call, or waits up to `acquire_timeout` for one to be released.
+    Facades left unused for `idle_timeout` seconds are closed on the next acquire.
+
+    Users other than DEFAULT_USER must already have a token in their cache file: the pool never
+    starts spotipy's interactive OAuth flow, which would block a worker thread on a redirect
+    server or on the MCP server's own stdin.
+    """
+
+    def __init__(
+        self,
+        max_clients: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        token_dir: Optional[str] = None,
+        acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT,
+        logger: Optional[logging.Logger] = None
+    ) -> None:
+        """
+        Args:
+            max_clients: Most facades open at once. If None, reads SPOTIFY_MCP_MAX_CLIENTS,
+                falling back to DEFAULT_MAX_CLIENTS.
+            idle_timeout: Seconds after which an unused facade is closed. If None, reads
+                SPOTIFY_MCP_CLIENT_IDLE_TIMEOUT, falling back to DEFAULT_IDLE_TIMEOUT.
+            token_dir: Directory of the per-user token caches ('<user>.json'). If None, reads
+                SPOTIFY_MCP_TOKEN_DIR; without one, tokens go to spotipy's '.cache-<user>'.
+            acquire_timeout: Seconds to wait for a facade when all of them are busy
+            logger: Optional logger instance
+        """
+        self.max_clients = max_clients if max_clients is not None else int(os.getenv("SPOTIFY_MCP_MAX_CLIENTS", DEFAULT_MAX_CLIENTS))
+        if self.max_clients < 1:
+            raise ValueError(f"max_clients must be at least 1, got {self.max_clients}")
+        self.idle_timeout = idle_timeout if idle_timeout is not None else float(os.getenv("SPOTIFY_MCP_CLIENT_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT))
+        self.token_dir = token_dir or os.getenv("SPOTIFY_MCP_TOKEN_DIR")
+        self.acquire_timeout = acquire_timeout
+        self.logger = logger or get_logger("spotify.pool")
+        self._cond = threading.Condition()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._shared: Optional["SharedResources"] = None
+        self._shared_lock = threading.Lock()
+        self.opened = 0
+        self.evicted = 0
+
+    @property
+    def shared(self) -> "SharedResources":
+        """Session, scheduler and fan-out pool of every facade, created with the first one"""
+        if self._shared is None:
+            with self._shared_lock:
+                if self._shared is None:
+                    from .client import SharedResources
+                    self._shared = SharedResources.create(logger=get_logger("spotify"))
+        return self._shared
+
+    @contextmanager
+    def acquire(self, user: str = DEFAULT_USER) -> Iterator[Spotify]:
+        """`user`'s facade, kept open until the block exits."""
+        entry = self._checkout(user)
+        try:
+            yield entry.spotify
+        finally:
+            with self._cond:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+                if not entry.in_use:
+                    self._cond.notify()
+
+    @contextmanager
+    def bind(self, user: str = DEFAULT_USER) -> Iterator[Spotify]:
+        """Acquire `user`'s facade and make it `current_spotify` for the enclosed block."""
+        with self.acquire(user) as spotify:
+            token = current_spotify.set(spotify)
+            try:
+                yield spotify
+            finally:
+                current_spotify.reset(token)
+
+    def _checkout(self, user: str) -> _Entry:
+        if not _USER_KEY.fullmatch(user):
+            raise ValueError(f"Invalid Spotify user key: {user!r}")
+        if user != DEFAULT_USER and user not in self._entries and not self.authorized(user):
+            raise UserNotAuthorized(f"Spotify user {user!r} is not authorized: no token in {self.cache_path(user)}")
+        shared = self.shared
+        deadline = time.monotonic() + self.acquire_timeout
+        closing: List[Spotify] = []
+        try:
+            with self._cond:
+                closing.extend(self._expire(keep=user))
+                while (entry := self._entries.get(user)) is None:
+                    if len(self._entries) < self.max_clients:
+                        entry = self._entries[user] = _Entry(self._open(user, shared))
+                        break
+                    idle = next((key for key, e in self._entries.items() if not e.in_use), None)
+                    if idle is not None:
+                        closing.append(self._entries.pop(idle).spotify)
+                        self.evicted += 1
+                        continue
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RuntimeError(f"All {self.max_clients} Spotify clients are busy")
+                    self._cond.wait(remaining)
+                self._entries.move_to_end(user)
+                entry.in_use += 1
+                return entry
+        finally:
+            # Outside the lock: closing stops the client's token refresher thread.
+            for spotify in closing:
+                self._close(spotify)
+
+    def _expire(self, keep: str) -> List[Spotify]:
+        """Remove the facades idle for longer than idle_timeout, except `keep`'s; returns them."""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [key for key, e in self._entries.items() if key != keep and not e.in_use and e.last_used < cutoff]
+        self.evicted += len(expired)
+        return [self._entries.pop(key).spotify for key in expired]
+
+    def _open(self, user: str, shared: "SharedResources") -> Spotify:
+        self.opened += 1
+        self.logger.info("Opening Spotify client for user %s", user)
+        if user == DEFAULT_USER:
+            return Spotify(shared=shared)
+        return Spotify(cache_path=self.cache_path(user), library_path=self.library_path(user), shared=shared)
+
+    def _close(self, spotify: Spotify) -> None:
+        try:
+            spotify.close()
+        except Exception as e:
+            self.logger.error("Closing Spotify client failed: %s", e, exc_info=True)
+
+    def authorized(self, user: str) -> bool:
+        """Whether `user`'s token cache holds a token that is valid or can be refreshed"""
+        from .auth import TokenStore
+        store = TokenStore(cache_path=self.cache_path(user), logger=self.logger)
+        token = store.get_cached_token()
+        return token is not None and bool(token.get("refresh_token") or not store.is_expired())
+
+    def cache_path(self, user: str) -> str:
+        if self.token_dir:
+            return os.path.join(self.token_dir, f"{user}.json")
+        return f".cache-{user}"
+
+    def library_path(self, user: str) -> str:
+        from .library import DEFAULT_LIBRARY_PATH
+        path = os.getenv("SPOTIFY_MCP_LIBRARY_DB", DEFAULT_LIBRARY_PATH)
+        if path == ":memory:":
+            return path
+        root, ext = os.path.splitext(path)
+        return f"{root}-{user}{ext}"
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            report: Dict[str, Any] = {
+                'clients': {
+                    'open': len(self._entries),
+                    'in_use': sum(1 for e in self._entries.values() if e.in_use),
+                    'max': self.max_clients,
+                    'opened': self.opened,
+                    'evicted': self.evicted,
+                },
+            }
+        if self._shared is not None:
+            report['scheduler'] = self._shared.scheduler.stats()
+        return report
+
+    def close(self) -> None:
+        """Close every facade and the shared resources"""
+        with self._cond:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._close(entry.spotify)
+        if self._shared is not None:
+            self._shared.close()
+
+
+class PooledSpotify:
+    """
+    Stands in for a Spotify facade and forwards to the one bound to the current call (see
+    ClientPool.bind), so tools built on a single facade serve whichever user the call is for.
+    """
+
+    def __init__(self, pool: ClientPool) -> None:
+        self.pool = pool
+
+    @property
+    def current(self) -> Spotify:
+        spotify = current_spotify.get()
+        if spotify is None:
+            raise RuntimeError("No Spotify user is bound to this call")
+        return spotify
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.current, name)
+
+    @property
+    def loaded(self) -> bool:
+        spotify = current_spotify.get()
+        return spotify is not None and spotify.loaded
+
+    def stats(self) -> Dict[str, Any]:
+        """The bound user's cache counters (if any) plus the pool's and the shared scheduler's"""
+        spotify = current_spotify.get()
+        return {**(spotify.stats() if spotify is not None else {}), **self.pool.stats()}
+
+    def close(self) -> None:
+        self.pool.close()
@@ -0,0 +1,286 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install spotify-mcp[recommend]
+    np = None
+
+from .. import utils
+from .client import SpotifyClient
+from .models import ArtistInfo, TrackInfo
+from .pagination import paginate
+from .playlists import PlaylistManager
+
+# Playlist item fields the index reads: what parse_track needs plus the artists' ids.
+ITEM_FIELDS = "total,items(track(id,name,artists(id,name),is_playable))"
+
+# Weight of genre similarity next to playlist co-occurrence; both are scaled to [0, 1].
+GENRE_WEIGHT = 0.3
+
+DEFAULT_MAX_AGE = 60 * 60
+
+ArtistLookup = Callable[[List[str]], List[ArtistInfo]]
+
+def _parse_item(item: Dict[str, Any]) -> Optional[Tuple[TrackInfo, List[str]]]:
+    track = item.get('track')
+    if not (info := utils.parse_track(track)) or not info.get('id'):
+        return None
+    return info, [a['id'] for a in track['artists'] if a.get('id')]
+
+
+class RecommendationIndex:
+    """
+    Offline track recommendations from the current user's playlists.
+
+    Two tracks are similar when they share playlists: a candidate's score is the cosine between
+    its playlist-membership vector and each seed's, computed for every track at once as two
+    sparse matrix-vector products over the (playlist, track) pairs. Artists add a genre term:
+    the cosine between the candidate artists' genres (from parse_artist) and the seeds'.
+
+    `update()` pages through only the playlists whose snapshot_id changed since the last update,
+    so keeping the index current costs one playlist listing when nothing changed. Requires numpy.
+    """
+
+    def __init__(
+        self,
+        client: SpotifyClient,
+        playlists: PlaylistManager,
+        lookup_artists: ArtistLookup,
+        max_age: Optional[float] = None
+    ):
+        """
+        Args:
+            client: Spotify client used to list the user's playlists
+            playlists: Playlist manager used to page through playlist items
+            lookup_artists: Returns parsed artists (with genres) for a list of artist ids
+            max_age: Seconds after which `recommend` updates the index first. If None, reads
+                SPOTIFY_MCP_RECOMMEND_MAX_AGE, falling back to DEFAULT_MAX_AGE.
+        """
+        self.client = client
+        self.sp = client.sp
+        self.logger = client.logger.getChild("recommend")
+        self.playlists = playlists
+        self.lookup_artists = lookup_artists
+        self.max_age = max_age if max_age is not None else float(os.getenv("SPOTIFY_MCP_RECOMMEND_MAX_AGE", DEFAULT_MAX_AGE))
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self.updated_at: Optional[float] = None
+
+        # Vocabularies only grow; a track that left every playlist keeps its slot with degree 0.
+        self._tracks: List[TrackInfo] = []
+        self._track_index: Dict[str, int] = {}
+        self._track_artists: List[List[int]] = []
+        self._artist_index: Dict[str, int] = {}
+        self._artist_genres: Dict[int, List[int]] = {}
+        self._genre_index: Dict[str, int] = {}
+        # Artist seeds whose lookup failed; not asked for again until the next update.
+        self._failed_artists: Set[str] = set()
+        # playlist id -> (snapshot_id, track indexes)
+        self._playlists: Dict[str, Tuple[Optional[str], Any]] = {}
+        self._arrays: Optional[Dict[str, Any]] = None
+
+    @property
+    def available(self) -> bool:
+        return np is not None
+
+    def update(self) -> Dict[str, Any]:
+        """Bring the index up to date with the user's playlists. Returns the index stats."""
+        if np is None:
+            raise RuntimeError("numpy is required for offline recommendations: pip install spotify-mcp[recommend]")
+        with self._update_lock:
+            return self._update()
+
+    def _update(self) -> Dict[str, Any]:
+        started = time.time()
+        current = {
+            p['id']: p.get('snapshot_id') for p in paginate(
+                lambda offset, limit: self.sp.current_user_playlists(limit=limit, offset=offset),
+                utils.parse_playlist,
+                self.client.fanout,
+                page_size=50
+            )
+        }
+        with self._lock:
+            known = {pid: snapshot for pid, (snapshot, _) in self._playlists.items()}
+            self._failed_artists.clear()
+        changed = [pid for pid, snapshot in current.items() if not snapshot or known.get(pid) != snapshot]
+        removed = [pid for pid in known if pid not in current]
+
+        fetched = {pid: list(self.playlists.iter_playlist_items(pid, ITEM_FIELDS, _parse_item)) for pid in changed}
+        with self._lock:
+            new_artists = {
+                artist_id for items in fetched.values() for _, artist_ids in items for artist_id in artist_ids
+                if artist_id not in self._artist_index
+            }
+        genres = self._fetch_genres(list(new_artists))
+
+        with self._lock:
+            for artist_id, artist_genres in genres.items():
+                self._add_artist(artist_id, artist_genres)
+            for pid, items in fetched.items():
+                self._playlists[pid] = (current[pid], np.fromiter(
+                    (self._add_track(info, artist_ids) for info, artist_ids in items), dtype=np.int32, count=len(items)
+                ))
+            for pid in removed:
+                del self._playlists[pid]
+            if changed or removed or self._arrays is None:
+                self._build_arrays()
+            self.updated_at = time.time()
+
+        self.logger.info(
+            "Recommendation index updated in %.2fs (%d playlists fetched, %d removed)",
+            time.time() - started, len(changed), len(removed)
+        )
+        return self.stats()
+
+    def recommend(
+        self,
+        tracks: Optional[List[str]] = None,
+        artists: Optional[List[str]] = None,
+        limit: int = 20
+    ) -> Optional[List[TrackInfo]]:
+        """
+        Tracks from the user's playlists most similar to the seed tracks and artists, best first.
+        Returns None when none of the seeds is known to the index.
+        """
+        if self._is_stale():
+            with self._update_lock:
+                # Another caller may have updated the index while this one waited.
+                if self._is_stale():
+                    self._update()
+        with self._lock:
+            unknown = [a for a in artists or [] if a not in self._artist_index and a not in self._failed_artists]
+        if unknown:
+            genres = self._fetch_genres(unknown)
+            with self._lock:
+                self._failed_artists.update(a for a in unknown if a not in genres)
+                for artist_id, artist_genres in genres.items():
+                    self._add_artist(artist_id, artist_genres)
+                if genres:
+                    self._build_arrays()
+
+        with self._lock:
+            arrays = self._arrays
+            seed_tracks = [self._track_index[t] for t in tracks or [] if t in self._track_index]
+            seed_artists = [self._artist_index[a] for a in artists or [] if a in self._artist_index]
+            if not arrays or not (seed_tracks or seed_artists):
+                return None
+            top = self._score(arrays, seed_tracks, seed_artists, limit)
+            return [self._tracks[i] for i in top]
+
+    def _is_stale(self) -> bool:
+        return self.updated_at is None or time.time() - self.updated_at > self.max_age
+
+    def _score(self, arrays: Dict[str, Any], seed_tracks: List[int], seed_artists: List[int], limit: int) -> List[int]:
+        n_tracks = len(arrays['degree'])
+        degree = arrays['degree']
+        norm = np.sqrt(np.maximum(degree, 1))
+
+        # Seed weights over tracks: 1 per seed track, and 1 per seed artist spread over the
+        # artist's tracks in the library.
+        seed = np.zeros(n_tracks, dtype=np.float32)
+        seed[seed_tracks] = 1.0
+        for artist in seed_artists:
+            by_artist = arrays['ta_track'][arrays['ta_artist'] == artist]
+            if len(by_artist):
+                seed[by_artist] += 1.0 / len(by_artist)
+
+        # Cosine co-occurrence: weight each playlist by the seeds it holds, then sum the
+        # playlist weights of every track, normalized by the track's playlist count.
+        playlist_weight = np.bincount(arrays['entry_playlist'], weights=(seed / norm)[arrays['entry_track']],
+                                      minlength=arrays['n_playlists'])
+        scores = np.bincount(arrays['entry_track'], weights=playlist_weight[arrays['entry_playlist']],
+                             minlength=n_tracks) / norm
+        if (peak := scores.max(initial=0.0)) > 0:
+            scores /= peak
+
+        # Genre term: the seed genre profile is the seed artists' genres plus those of the
+        # seed tracks' artists.
+        profile_artists = list(seed_artists) + [a for t in seed_tracks for a in self._track_artists[t]]
+        profile = np.zeros(arrays['n_genres'], dtype=np.float32)
+        for artist in profile_artists:
+            profile[self._artist_genres.get(artist, [])] += 1.0
+        if arrays['n_genres'] and (profile_norm := np.linalg.norm(profile)) > 0:
+            artist_sim = np.bincount(arrays['ag_artist'], weights=profile[arrays['ag_genre']],
+                                     minlength=arrays['n_artists']) / (arrays['artist_norm'] * profile_norm)
+            track_sim = np.bincount(arrays['ta_track'], weights=artist_sim[arrays['ta_artist']],
+                                    minlength=n_tracks) / np.maximum(arrays['artist_count'], 1)
+            scores += GENRE_WEIGHT * track_sim
+
+        scores[degree == 0] = 0.0
+        scores[seed_tracks] = 0.0
+        limit = min(limit, n_tracks)
+        if limit <= 0:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [int(i) for i in top if scores[i] > 0]
+
+    def _fetch_genres(self, artist_ids: List[str]) -> Dict[str, List[str]]:
+        if not artist_ids:
+            return {}
+        return {
+            artist['id']: artist.get('genres') or []
+            for artist in self.lookup_artists(artist_ids) if 'error' not in artist
+        }
+
+    def _add_artist(self, artist_id: str, genres: List[str]) -> int:
+        index = self._artist_index.setdefault(artist_id, len(self._artist_index))
+        self._artist_genres[index] = [self._genre_index.setdefault(g, len(self._genre_index)) for g in genres]
+        return index
+
+    def _add_track(self, info: TrackInfo, artist_ids: List[str]) -> int:
+        index = self._track_index.get(info['id'])
+        if index is None:
+            index = self._track_index[info['id']] = len(self._tracks)
+            self._tracks.append(info)
+            self._track_artists.append([
+                self._artist_index[a] if a in self._artist_index else self._add_artist(a, []) for a in artist_ids
+            ])
+        return index
+
+    def _build_arrays(self) -> None:
+        """Flatten the playlists and artist credits into the index arrays used for scoring."""
+        playlist_tracks = [tracks for _, tracks in self._playlists.values()]
+        entry_track = np.concatenate(playlist_tracks) if playlist_tracks else np.zeros(0, dtype=np.int32)
+        entry_playlist = np.repeat(np.arange(len(playlist_tracks), dtype=np.int32), [len(t) for t in playlist_tracks])
+        # Count a track once per playlist it is in, however many times it appears there.
+        if len(entry_track):
+            pairs = np.unique(np.stack([entry_playlist, entry_track], axis=1), axis=0)
+            entry_playlist, entry_track = pairs[:, 0], pairs[:, 1]
+
+        n_tracks, n_artists = len(self._tracks), len(self._artist_index)
+        ta_track = np.repeat(np.arange(n_tracks, dtype=np.int32), [len(a) for a in self._track_artists])
+        ta_artist = np.fromiter((a for artists in self._track_artists for a in artists), dtype=np.int32, count=len(ta_track))
+        ag_artist = np.fromiter(
+            (a for a, genres in self._artist_genres.items() for _ in genres), dtype=np.int32
+        )
+        ag_genre = np.fromiter((g for genres in self._artist_genres.values() for g in genres), dtype=np.int32)
+        self._arrays = {
+            'n_playlists': len(playlist_tracks),
+            'n_artists': n_artists,
+            'n_genres': len(self._genre_index),
+            'entry_playlist': entry_playlist,
+            'entry_track': entry_track,
+            'degree': np.bincount(entry_track, minlength=n_tracks),
+            'ta_track': ta_track,
+            'ta_artist': ta_artist,
+            'artist_count': np.bincount(ta_track, minlength=n_tracks),
+            'ag_artist': ag_artist,
+            'ag_genre': ag_genre,
+            'artist_norm': np.sqrt(np.maximum(np.bincount(ag_artist, minlength=n_artists), 1)),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            arrays = self._arrays
+            return {
+                'playlists': len(self._playlists),
+                'tracks': int(np.count_nonzero(arrays['degree'])) if arrays else 0,
+                'artists': len(self._artist_index),
+                'genres': len(self._genre_index),
+                'updated_at': self.updated_at,
+            }
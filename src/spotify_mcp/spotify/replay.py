@@ -0,0 +1,474 @@
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from spotipy import SpotifyException
+
+from .http import API_URL
+
+# Spotify caps the page sizes the managers request; the stand-in enforces the same limits.
+MAX_PAGE = {'playlist_tracks': 100, 'default': 50}
+
+MARKETS = (
+    "AD AE AG AL AM AO AR AT AU AZ BA BB BD BE BF BG BH BI BJ BN BO BR BS BT BW BY BZ CA CD CG CH CI CL "
+    "CM CO CR CV CW CY CZ DE DJ DK DM DO DZ EC EE EG ES ET FI FJ FM FR GA GB GD GE GH GM GN GQ GR GT GW "
+    "GY HK HN HR HT HU ID IE IL IN IQ IS IT JM JO JP KE KG KH KI KM KN KR KW KZ LA LB LC LI LK LR LS LT "
+    "LU LV LY MA MC MD ME MG MH MK ML MN MO MR MT MU MV MW MX MY MZ NA NE NG NI NL NO NP NR NZ OM PA PE "
+    "PG PH PK PL PR PS PT PW PY QA RO RS RW SA SB SC SE SG SI SK SL SM SN SR ST SV SZ TD TG TH TJ TL TN "
+    "TO TR TT TV TW TZ UA UG US UY UZ VC VE VN VU WS XK ZA ZM ZW"
+).split()
+
+WORDS = (
+    "midnight city blue summer river heart golden light dream fire echo wild night ocean static "
+    "neon ghost velvet silver storm paper garden electric shadow winter highway honey glass moon "
+    "desert signal hollow cherry thunder satellite northern lost young slow broken bright season"
+).split()
+
+_ID_CHARS = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+def parse_fields(spec: str) -> Dict[str, Any]:
+    """Parse a Web API `fields=` filter, e.g. 'total,items(track(id,name))', into a nested dict."""
+    def parse(i: int) -> Tuple[Dict[str, Any], int]:
+        tree: Dict[str, Any] = {}
+        name = ""
+        while i < len(spec):
+            c = spec[i]
+            if c == ",":
+                if name.strip():
+                    tree[name.strip()] = None
+                name = ""
+                i += 1
+            elif c == "(":
+                tree[name.strip()], i = parse(i + 1)
+                name = ""
+            elif c == ")":
+                if name.strip():
+                    tree[name.strip()] = None
+                return tree, i + 1
+            else:
+                name += c
+                i += 1
+        if name.strip():
+            tree[name.strip()] = None
+        return tree, i
+
+    return parse(0)[0]
+
+def filter_fields(obj: Any, tree: Optional[Dict[str, Any]]) -> Any:
+    """Apply a parsed `fields=` filter the way Spotify does: lists are filtered item by item."""
+    if tree is None:
+        return obj
+    if isinstance(obj, list):
+        return [filter_fields(o, tree) for o in obj]
+    if isinstance(obj, dict):
+        return {k: filter_fields(obj[k], sub) for k, sub in tree.items() if k in obj}
+    return obj
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]]) -> str:
+    """Stable key for a request: method, path relative to the API root, and sorted query."""
+    path, _, query = url.removeprefix(API_URL).partition("?")
+    merged = dict(parse_qsl(query))
+    merged.update({k: v for k, v in (params or {}).items() if v is not None})
+    return f"{method} {path.strip('/')}?{urlencode(sorted((k, str(v)) for k, v in merged.items()))}"
+
+def _page(items: List[Any], params: Dict[str, Any], href: str, max_limit: int = MAX_PAGE['default']) -> Dict[str, Any]:
+    limit = min(int(params.get('limit') or 20), max_limit)
+    offset = int(params.get('offset') or 0)
+    has_next = offset + limit < len(items)
+    return {
+        'href': f"{API_URL}{href}?offset={offset}&limit={limit}",
+        'items': items[offset:offset + limit],
+        'limit': limit,
+        'next': f"{API_URL}{href}?offset={offset + limit}&limit={limit}" if has_next else None,
+        'offset': offset,
+        'previous': f"{API_URL}{href}?offset={max(0, offset - limit)}&limit={limit}" if offset else None,
+        'total': len(items),
+    }
+
+def _not_found(method: str, url: str) -> SpotifyException:
+    return SpotifyException(404, -1, f"{url}:\n No fixture for {method} {url}", reason="Not Found")
+
+
+class FixtureSet:
+    """
+    Canned Spotify Web API responses for offline runs.
+
+    Two sources are consulted, in order:
+    - recorded responses, keyed by `request_key` (captured from a live client with
+      `SpotifyClient(recorder=fixtures)` and persisted with `save`/`load`);
+    - an optional synthetic catalog built by `synthetic()`, served by route for every endpoint
+      the managers use, including paging, `fields=` filtering and playlist edits.
+    """
+
+    def __init__(self, recorded: Optional[Dict[str, Any]] = None) -> None:
+        self.recorded: Dict[str, Any] = dict(recorded or {})
+        self._lock = threading.Lock()
+        self.user: Dict[str, Any] = {}
+        self.artists: Dict[str, Dict[str, Any]] = {}
+        self.albums: Dict[str, Dict[str, Any]] = {}
+        self.album_tracks: Dict[str, List[Dict[str, Any]]] = {}
+        self.artist_albums: Dict[str, List[Dict[str, Any]]] = {}
+        self.artist_tracks: Dict[str, List[Dict[str, Any]]] = {}
+        self.tracks: Dict[str, Dict[str, Any]] = {}
+        self.playlists: Dict[str, Dict[str, Any]] = {}
+        self.playlist_items: Dict[str, List[Dict[str, Any]]] = {}
+        self.saved_tracks: List[Dict[str, Any]] = []
+        self.saved_albums: List[Dict[str, Any]] = []
+        self.player: Optional[Dict[str, Any]] = None
+        self.queue: List[Dict[str, Any]] = []
+
+    # Recording
+
+    def record(self, method: str, url: str, params: Optional[Dict[str, Any]], response: Any) -> None:
+        with self._lock:
+            self.recorded[request_key(method, url, params)] = response
+
+    def save(self, path: str) -> None:
+        with self._lock, open(path, "w") as f:
+            json.dump({'recorded': self.recorded}, f)
+
+    @classmethod
+    def load(cls, path: str) -> "FixtureSet":
+        with open(path) as f:
+            return cls(recorded=json.load(f).get('recorded'))
+
+    # Synthetic catalog
+
+    @classmethod
+    def synthetic(
+        cls,
+        playlist_size: int = 10_000,
+        playlists: int = 20,
+        saved_tracks: int = 500,
+        saved_albums: int = 100,
+        queue_size: int = 20,
+        seed: int = 0
+    ) -> "FixtureSet":
+        """
+        Build a deterministic catalog shaped like real Web API responses: full track objects
+        (with `available_markets`, external ids, ...), artists with albums and top tracks, one
+        playlist of `playlist_size` tracks ('big') plus `playlists` smaller ones, a saved
+        library and an active playback session with a queue.
+        """
+        rng = random.Random(seed)
+        fx = cls()
+
+        def new_id() -> str:
+            return "".join(rng.choice(_ID_CHARS) for _ in range(22))
+
+        def title(words: int) -> str:
+            return " ".join(rng.choice(WORDS) for _ in range(words)).title()
+
+        fx.user = {
+            'display_name': "Offline User", 'id': "offline", 'type': "user", 'uri': "spotify:user:offline",
+            'external_urls': {'spotify': "https://open.spotify.com/user/offline"},
+            'followers': {'href': None, 'total': 12}, 'href': f"{API_URL}users/offline", 'images': [],
+        }
+
+        album_count = playlist_size // 10 + 50
+        for _ in range(max(50, album_count // 4)):
+            aid = new_id()
+            fx.artists[aid] = {
+                'external_urls': {'spotify': f"https://open.spotify.com/artist/{aid}"},
+                'followers': {'href': None, 'total': rng.randint(100, 5_000_000)},
+                'genres': rng.sample(["indie rock", "synthpop", "dream pop", "alt z", "modern rock", "electropop"], 2),
+                'href': f"{API_URL}artists/{aid}", 'id': aid,
+                'images': [{'height': s, 'url': f"https://i.scdn.co/image/{aid}{s}", 'width': s} for s in (640, 320, 160)],
+                'name': title(rng.randint(1, 2)), 'popularity': rng.randint(10, 90),
+                'type': "artist", 'uri': f"spotify:artist:{aid}",
+            }
+        artist_ids = list(fx.artists)
+
+        for _ in range(album_count):
+            alid = new_id()
+            credited = [fx._simple_artist(fx.artists[a]) for a in rng.sample(artist_ids, rng.choice((1, 1, 1, 2)))]
+            album = {
+                'album_type': "album", 'artists': credited, 'available_markets': MARKETS,
+                'external_urls': {'spotify': f"https://open.spotify.com/album/{alid}"},
+                'href': f"{API_URL}albums/{alid}", 'id': alid,
+                'images': [{'height': s, 'url': f"https://i.scdn.co/image/{alid}{s}", 'width': s} for s in (640, 300, 64)],
+                'name': title(rng.randint(1, 3)), 'release_date': f"{rng.randint(1970, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                'release_date_precision': "day", 'total_tracks': rng.randint(8, 14),
+                'type': "album", 'uri': f"spotify:album:{alid}",
+            }
+            fx.albums[alid] = album
+            fx.album_tracks[alid] = []
+            for artist in credited:
+                fx.artist_albums.setdefault(artist['id'], []).append(album)
+            for n in range(1, album['total_tracks'] + 1):
+                tid = new_id()
+                track = {
+                    'album': album, 'artists': credited, 'available_markets': MARKETS,
+                    'disc_number': 1, 'duration_ms': rng.randint(120_000, 360_000), 'explicit': rng.random() < 0.2,
+                    'external_ids': {'isrc': f"US{rng.randint(10**9, 10**10 - 1)}"},
+                    'external_urls': {'spotify': f"https://open.spotify.com/track/{tid}"},
+                    'href': f"{API_URL}tracks/{tid}", 'id': tid, 'is_local': False,
+                    'name': title(rng.randint(1, 4)), 'popularity': rng.randint(0, 100),
+                    'preview_url': f"https://p.scdn.co/mp3-preview/{tid}", 'track_number': n,
+                    'type': "track", 'uri': f"spotify:track:{tid}",
+                }
+                fx.tracks[tid] = track
+                fx.album_tracks[alid].append(track)
+                for artist in credited:
+                    fx.artist_tracks.setdefault(artist['id'], []).append(track)
+
+        all_tracks = list(fx.tracks.values())
+        fx._add_playlist("big", "Everything", rng.sample(all_tracks, min(playlist_size, len(all_tracks))))
+        for _ in range(playlists):
+            fx._add_playlist(new_id(), title(2), rng.sample(all_tracks, rng.randint(20, 200)))
+
+        fx.saved_tracks = [{'added_at': "2024-01-01T00:00:00Z", 'track': t} for t in rng.sample(all_tracks, saved_tracks)]
+        fx.saved_albums = [
+            {'added_at': "2024-01-01T00:00:00Z", 'album': {**fx.albums[a], 'tracks': _page(fx.album_tracks[a], {'limit': 50}, f"albums/{a}/tracks")}}
+            for a in rng.sample(list(fx.albums), min(saved_albums, len(fx.albums)))
+        ]
+
+        big = fx.playlist_items["big"]
+        fx.player = {
+            'device': {'id': "offline-device", 'is_active': True, 'is_private_session': False, 'is_restricted': False,
+                       'name': "Offline Speaker", 'type': "Speaker", 'volume_percent': 50, 'supports_volume': True},
+            'shuffle_state': False, 'repeat_state': "off", 'timestamp': 0, 'progress_ms': 42_000,
+            'context': {'type': "playlist", 'uri': "spotify:playlist:big", 'href': f"{API_URL}playlists/big",
+                        'external_urls': {'spotify': "https://open.spotify.com/playlist/big"}},
+            'item': big[0]['track'], 'currently_playing_type': "track", 'is_playing': True,
+            'actions': {'disallows': {'resuming': True}},
+        }
+        fx.queue = [item['track'] for item in big[1:queue_size + 1]]
+        return fx
+
+    @staticmethod
+    def _simple_artist(artist: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: artist[k] for k in ('external_urls', 'href', 'id', 'name', 'type', 'uri')}
+
+    def _add_playlist(self, pid: str, name: str, tracks: List[Dict[str, Any]]) -> None:
+        self.playlists[pid] = {
+            'collaborative': False, 'description': "", 'external_urls': {'spotify': f"https://open.spotify.com/playlist/{pid}"},
+            'href': f"{API_URL}playlists/{pid}", 'id': pid, 'images': [], 'name': name,
+            'owner': {k: self.user[k] for k in ('display_name', 'external_urls', 'href', 'id', 'type', 'uri')},
+            'primary_color': None, 'public': True, 'snapshot_id': f"{pid}-0", 'type': "playlist", 'uri': f"spotify:playlist:{pid}",
+        }
+        self.playlist_items[pid] = [self._playlist_item(t) for t in tracks]
+
+    def _playlist_item(self, track: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'added_at': "2024-01-01T00:00:00Z", 'added_by': {'id': self.user['id'], 'type': "user"},
+            'is_local': False, 'primary_color': None, 'track': track, 'video_thumbnail': {'url': None},
+        }
+
+    def _playlist_header(self, pid: str) -> Dict[str, Any]:
+        return {**self.playlists[pid], 'tracks': {'href': f"{API_URL}playlists/{pid}/tracks", 'total': len(self.playlist_items[pid])}}
+
+    def _bump_snapshot(self, pid: str) -> Dict[str, str]:
+        version = int(self.playlists[pid]['snapshot_id'].rsplit("-", 1)[1]) + 1
+        self.playlists[pid]['snapshot_id'] = f"{pid}-{version}"
+        return {'snapshot_id': self.playlists[pid]['snapshot_id']}
+
+    def _search(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        words = [w for w in str(params.get('q', '')).lower().split() if ":" not in w]
+        pools = {
+            'track': list(self.tracks.values()),
+            'album': list(self.albums.values()),
+            'artist': list(self.artists.values()),
+            'playlist': [self._playlist_header(p) for p in self.playlists],
+        }
+        results = {}
+        for qtype in str(params.get('type', 'track')).split(","):
+            pool = pools[qtype]
+            matches = [item for item in pool if any(w in item['name'].lower() for w in words)] or pool
+            results[f"{qtype}s"] = _page(matches, params, "search")
+        return results
+
+    # Routing
+
+    def respond(self, method: str, url: str, payload: Optional[Any], params: Dict[str, Any]) -> Any:
+        """
+        Answer one Web API request the way Spotify would.
+
+        Raises:
+            SpotifyException: 404 if neither a recording nor the synthetic catalog covers it
+        """
+        key = request_key(method, url, params)
+        path, _, query = url.removeprefix(API_URL).partition("?")
+        params = {**dict(parse_qsl(query)), **{k: v for k, v in params.items() if v is not None}}
+        parts = [p for p in path.split("/") if p]
+
+        with self._lock:
+            if key in self.recorded:
+                return self.recorded[key]
+            if not self.user:
+                raise _not_found(method, url)
+            return self._route(method, url, parts, payload, params)
+
+    def _route(self, method: str, url: str, parts: List[str], payload: Any, params: Dict[str, Any]) -> Any:
+        ids = [i for i in str(params.get('ids', '')).split(",") if i]
+        match method, parts:
+            case 'GET', ['search']:
+                return self._search(params)
+            case 'GET', ['tracks']:
+                return {'tracks': [self.tracks.get(i) for i in ids]}
+            case 'GET', ['tracks', tid] if tid in self.tracks:
+                return self.tracks[tid]
+            case 'GET', ['albums']:
+                return {'albums': [self._full_album(i) if i in self.albums else None for i in ids]}
+            case 'GET', ['albums', alid] if alid in self.albums:
+                return self._full_album(alid)
+            case 'GET', ['albums', alid, 'tracks'] if alid in self.albums:
+                return _page(self.album_tracks[alid], params, f"albums/{alid}/tracks")
+            case 'GET', ['artists']:
+                return {'artists': [self.artists.get(i) for i in ids]}
+            case 'GET', ['artists', aid] if aid in self.artists:
+                return self.artists[aid]
+            case 'GET', ['artists', aid, 'albums'] if aid in self.artists:
+                return _page(self.artist_albums.get(aid, []), params, f"artists/{aid}/albums")
+            case 'GET', ['artists', aid, 'top-tracks'] if aid in self.artists:
+                tracks = self.artist_tracks.get(aid, [])
+                return {'tracks': sorted(tracks, key=lambda t: -t['popularity'])[:10]}
+            case 'GET', ['playlists', pid] if pid in self.playlists:
+                playlist = {**self._playlist_header(pid), 'tracks': self._playlist_page(pid, {'limit': 100})}
+                return filter_fields(playlist, parse_fields(params['fields'])) if params.get('fields') else playlist
+            case 'GET', ['playlists', pid, 'tracks'] if pid in self.playlists:
+                page = self._playlist_page(pid, params)
+                return filter_fields(page, parse_fields(params['fields'])) if params.get('fields') else page
+            case 'POST', ['playlists', pid, 'tracks'] if pid in self.playlists:
+                uris = payload['uris'] if isinstance(payload, dict) else payload
+                added = [self._playlist_item(self.tracks[u.rsplit(":", 1)[1]]) for u in uris]
+                position = params.get('position')
+                items = self.playlist_items[pid]
+                at = len(items) if position is None else int(position)
+                items[at:at] = added
+                return self._bump_snapshot(pid)
+            case 'PUT', ['playlists', pid, 'tracks'] if pid in self.playlists:
+                items = self.playlist_items[pid]
+                if 'uris' in payload:
+                    items[:] = [self._playlist_item(self.tracks[u.rsplit(":", 1)[1]]) for u in payload['uris']]
+                else:
+                    start, length, before = payload['range_start'], payload.get('range_length', 1), payload['insert_before']
+                    moved = items[start:start + length]
+                    del items[start:start + length]
+                    at = before if before < start else before - length
+                    items[at:at] = moved
+                return self._bump_snapshot(pid)
+            case 'DELETE', ['playlists', pid, 'tracks'] if pid in self.playlists:
+                removed = {t['uri'] for t in payload['tracks']}
+                self.playlist_items[pid] = [i for i in self.playlist_items[pid] if i['track']['uri'] not in removed]
+                return self._bump_snapshot(pid)
+            case 'GET', ['users', uid, 'playlists']:
+                owned = [self._playlist_header(p) for p, pl in self.playlists.items() if pl['owner']['id'] == uid]
+                return _page(owned, params, f"users/{uid}/playlists")
+            case 'GET', ['me']:
+                return self.user
+            case 'GET', ['me', 'playlists']:
+                return _page([self._playlist_header(p) for p in self.playlists], params, "me/playlists")
+            case 'GET', ['me', 'tracks']:
+                return _page(self.saved_tracks, params, "me/tracks")
+            case 'GET', ['me', 'albums']:
+                return _page(self.saved_albums, params, "me/albums")
+            case 'GET', ['me', 'player']:
+                return self.player
+            case 'GET', ['me', 'player', 'currently-playing']:
+                return self.player and {k: v for k, v in self.player.items() if k != 'device'}
+            case 'GET', ['me', 'player', 'queue']:
+                return {'currently_playing': self.player and self.player['item'], 'queue': self.queue}
+            case 'GET', ['me', 'player', 'devices']:
+                return {'devices': [self.player['device']] if self.player else []}
+            case 'PUT', ['me', 'player', 'play']:
+                return self._play(payload or {})
+            case 'PUT', ['me', 'player', 'pause']:
+                if self.player:
+                    self.player['is_playing'] = False
+                return None
+            case 'POST', ['me', 'player', 'next']:
+                if self.player and self.queue:
+                    self.player['item'] = self.queue.pop(0)
+                return None
+            case 'POST', ['me', 'player', 'previous']:
+                return None
+            case 'POST', ['me', 'player', 'queue']:
+                tid = str(params.get('uri', '')).rsplit(":", 1)[-1]
+                if tid not in self.tracks:
+                    raise SpotifyException(400, -1, f"{url}:\n Invalid track uri", reason="Bad Request")
+                self.queue.append(self.tracks[tid])
+                return None
+        raise _not_found(method, url)
+
+    def _full_album(self, alid: str) -> Dict[str, Any]:
+        return {**self.albums[alid], 'tracks': _page(self.album_tracks[alid], {'limit': 50}, f"albums/{alid}/tracks")}
+
+    def _playlist_page(self, pid: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return _page(self.playlist_items[pid], params, f"playlists/{pid}/tracks", max_limit=MAX_PAGE['playlist_tracks'])
+
+    def _play(self, payload: Dict[str, Any]) -> None:
+        if self.player is None:
+            raise SpotifyException(404, -1, "me/player/play:\n Player command failed: No active device found", reason="NO_ACTIVE_DEVICE")
+        if uris := payload.get('uris'):
+            self.player['item'] = self.tracks[uris[0].rsplit(":", 1)[1]]
+        elif context := payload.get('context_uri'):
+            pid = context.rsplit(":", 1)[1]
+            offset = payload.get('offset') or {}
+            items = [i['track'] for i in self.playlist_items.get(pid, [])] or self.album_tracks.get(pid, [])
+            if 'position' in offset:
+                position = offset['position']
+            else:
+                position = next((n for n, t in enumerate(items) if t['uri'] == offset.get('uri')), 0)
+            if items:
+                self.player['item'] = items[position]
+                self.queue = items[position + 1:position + 1 + len(self.queue)]
+        self.player['is_playing'] = True
+        return None
+
+
+class Replay:
+    """
+    Transport for `SpotifyClient(transport=...)` that answers from a FixtureSet.
+
+    Each call sleeps `latency` (± `jitter`) seconds to model the network round trip, and
+    fails with `error_status` at `error_rate` so retry and error paths can be exercised.
+    """
+
+    def __init__(
+        self,
+        fixtures: FixtureSet,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        retry_after: float = 0.0,
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        Args:
+            fixtures: Responses to serve
+            latency: Mean simulated round-trip time in seconds
+            jitter: Maximum deviation from `latency`, uniformly distributed
+            error_rate: Fraction of calls (0-1) that fail instead of answering
+            error_status: HTTP status of injected failures (e.g. 429, 500, 503)
+            retry_after: Retry-After header sent with injected 429s
+            seed: Seed for latency and error draws, for repeatable runs
+        """
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def __call__(self, method: str, url: str, payload: Optional[Any], params: Dict[str, Any]) -> Any:
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        if delay:
+            time.sleep(delay)
+        if fail:
+            headers = {'Retry-After': str(self.retry_after)} if self.error_status == 429 else None
+            raise SpotifyException(self.error_status, -1, f"{url}:\n Injected error", headers=headers)
+        return self.fixtures.respond(method, url, payload, params)
@@ -0,0 +1,238 @@
+from enum import IntEnum
+import heapq
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+import spotipy
+from spotipy import SpotifyException
+
+from ..metrics import metrics
+from .http import API_URL
+
+T = TypeVar('T')
+
+# Stand-in for the HTTP layer: called as transport(method, url, payload, params) and returns the
+# decoded JSON response, or raises SpotifyException (see replay.Replay).
+Transport = Callable[[str, str, Optional[Dict[str, Any]], Dict[str, Any]], Any]
+
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 20
+DEFAULT_MAX_RETRIES = 3
+# Longest Retry-After (seconds) we are willing to sit out before failing the request instead.
+DEFAULT_MAX_WAIT = 60.0
+
+class Priority(IntEnum):
+    """Request classes, lowest value is served first."""
+    PLAYBACK = 0
+    METADATA = 1
+    BULK = 2
+
+
+def classify(method: str, url: str, params: Optional[Dict[str, Any]]) -> Priority:
+    """
+    Picks the priority class for a Web API call: player control first, then single lookups
+    and searches, then follow-up pages of paginated listings.
+    """
+    if "me/player" in url:
+        return Priority.PLAYBACK
+    if params and params.get("offset"):
+        return Priority.BULK
+    return Priority.METADATA
+
+
+# Top-level resources whose next path segment is an item id (or user name).
+ID_RESOURCES = frozenset({'albums', 'artists', 'audiobooks', 'episodes', 'playlists', 'shows', 'tracks', 'users'})
+
+def endpoint_name(method: str, url: str) -> str:
+    """Endpoint template for metrics, e.g. 'GET playlists/{id}/tracks' for any playlist."""
+    if url.startswith("http") and not url.startswith(API_URL):
+        # Token endpoint and other hosts: keep host and path as they are.
+        parts = urlsplit(url)
+        return f"{method} {parts.netloc}{parts.path}"
+    parts = [p for p in url.removeprefix(API_URL).partition("?")[0].split("/") if p]
+    if len(parts) > 1 and parts[0] in ID_RESOURCES:
+        parts[1] = "{id}"
+    return f"{method} {'/'.join(parts)}"
+
+
+class RequestScheduler:
+    """
+    Gate that every outgoing Spotify Web API request passes through.
+
+    - A token bucket (`rate` requests/second, bursts up to `burst`) paces traffic.
+    - Waiting requests are released strictly by priority, then arrival order, so playback
+      control is never stuck behind bulk pagination.
+    - A 429 response blocks the whole bucket for its Retry-After (or an exponential backoff
+      when the header is missing), with jitter, and the request is retried up to `max_retries`.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        logger: Optional[logging.Logger] = None
+    ) -> None:
+        """
+        Args:
+            rate: Sustained requests per second. If None, reads SPOTIFY_MCP_RATE_LIMIT from the
+                environment, falling back to DEFAULT_RATE.
+            burst: Bucket size. If None, reads SPOTIFY_MCP_RATE_BURST, falling back to DEFAULT_BURST.
+            max_retries: Retries per request after a 429.
+            max_wait: Requests fail instead of waiting when the bucket is blocked for longer than this.
+            logger: Optional logger instance
+        """
+        self.rate = rate if rate is not None else float(os.getenv("SPOTIFY_MCP_RATE_LIMIT", DEFAULT_RATE))
+        self.burst = burst if burst is not None else int(os.getenv("SPOTIFY_MCP_RATE_BURST", DEFAULT_BURST))
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._cond = threading.Condition()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiting: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.throttle_seconds = 0.0
+        self.max_queue_depth = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: Priority = Priority.METADATA) -> float:
+        """Block until this request may be sent. Returns the time spent waiting, in seconds."""
+        started = time.monotonic()
+        with self._cond:
+            ticket = (int(priority), next(self._seq))
+            heapq.heappush(self._waiting, ticket)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiting))
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self._blocked_until - now > self.max_wait:
+                        raise SpotifyException(429, -1, "Rate limited by Spotify; retry later",
+                                               headers={"Retry-After": str(int(self._blocked_until - now) + 1)})
+                    self._refill(now)
+                    if self._waiting[0] == ticket and now >= self._blocked_until and self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    if self._waiting[0] == ticket:
+                        wait = max(self._blocked_until - now, (1 - self._tokens) / self.rate, 0.001)
+                        self._cond.wait(timeout=wait)
+                    else:
+                        self._cond.wait()
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+            waited = time.monotonic() - started
+            self.requests += 1
+            if waited > 0.001:
+                self.throttled += 1
+                self.throttle_seconds += waited
+            return waited
+
+    def block(self, seconds: float) -> None:
+        """Stop releasing requests for `seconds` (e.g. after a 429)."""
+        with self._cond:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def backoff(self, error: SpotifyException, attempt: int) -> float:
+        """Delay before retrying after a 429: Retry-After when present, else exponential, plus jitter."""
+        retry_after = (error.headers or {}).get("Retry-After")
+        try:
+            delay = float(retry_after) if retry_after is not None else 2 ** attempt
+        except ValueError:
+            delay = 2 ** attempt
+        return delay + random.uniform(0, min(1.0, delay / 4))
+
+    def run(self, priority: Priority, fn: Callable[[], T]) -> T:
+        """Send one request through the scheduler, retrying on 429."""
+        for attempt in range(self.max_retries + 1):
+            self.acquire(priority)
+            try:
+                return fn()
+            except SpotifyException as e:
+                if e.http_status != 429 or attempt == self.max_retries:
+                    raise
+                delay = self.backoff(e, attempt)
+                self.block(delay)
+                if delay > self.max_wait:
+                    raise
+                self.retries += 1
+                self.logger.warning("Rate limited by Spotify, retrying in %.1fs (attempt %d)", delay, attempt + 1)
+        raise AssertionError("unreachable")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'requests': self.requests,
+                'queue_depth': len(self._waiting),
+                'max_queue_depth': self.max_queue_depth,
+                'throttled': self.throttled,
+                'throttle_seconds': round(self.throttle_seconds, 3),
+                'retries': self.retries,
+                'blocked_for': max(0.0, round(self._blocked_until - time.monotonic(), 3)),
+            }
+
+
+class ScheduledSpotify(spotipy.Spotify):
+    """
+    spotipy client whose every Web API call is paced by a RequestScheduler.
+
+    If `transport` is given, requests are answered by it instead of going over HTTP (used for
+    offline replay); if `recorder` is given, every response is also passed to
+    `recorder.record(method, url, params, response)`.
+    """
+
+    # 429s are handled by the scheduler (shared backoff, Retry-After), so urllib3 only
+    # retries server errors.
+    retry_codes = (500, 502, 503, 504)
+
+    def __init__(
+        self,
+        *args,
+        scheduler: RequestScheduler,
+        transport: Optional[Transport] = None,
+        recorder: Optional[Any] = None,
+        **kwargs
+    ) -> None:
+        kwargs.setdefault("status_forcelist", self.retry_codes)
+        super().__init__(*args, **kwargs)
+        self.scheduler = scheduler
+        self.transport = transport
+        self.recorder = recorder
+
+    def _internal_call(self, method, url, payload, params):
+        priority = classify(method, url, params)
+        return self.scheduler.run(priority, lambda: self._send(method, url, payload, params))
+
+    def _send(self, method, url, payload, params):
+        started = time.perf_counter()
+        try:
+            if self.transport is not None:
+                response = self.transport(method, url, payload, dict(params))
+            else:
+                response = super()._internal_call(method, url, payload, params)
+        except Exception as e:
+            metrics.upstream(endpoint_name(method, url), time.perf_counter() - started, error=e)
+            raise
+        metrics.upstream(endpoint_name(method, url), time.perf_counter() - started)
+        if self.recorder is not None:
+            self.recorder.record(method, url, params, response)
+        return response
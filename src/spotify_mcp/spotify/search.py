@@ -1,30 +1,67 @@
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from spotipy import SpotifyException
 
 from .. import utils
 from .client import SpotifyClient
 from .models import AlbumInfo, ArtistInfo, PlaylistInfo, QType, TrackInfo
+from .pagination import paginate
+from .playlists import PlaylistManager
+from .recommend import RecommendationIndex
+
+DEFAULT_SEARCH_LIMIT = 10
+
+# Maximum number of IDs Spotify accepts per multi-get request.
+BATCH_LIMITS = {
+    'track': 50,
+    'album': 20,
+    'artist': 50,
+}
 
 class SearchManager:
-    def __init__(self, client: SpotifyClient):
+    def __init__(self, client: SpotifyClient, playlists: Optional[PlaylistManager] = None):
         self.client = client
+        self.playlists = playlists or PlaylistManager(client)
         self.sp = client.sp
-        self.logger = client.logger
+        self.logger = client.logger.getChild("search")
+        self.recommender = RecommendationIndex(
+            client, self.playlists, lambda ids: self.get_info_batch(ids, 'artist')
+        )
 
-    def search(self, query: str, qtype: Union[QType, str] = 'track', limit: int = 10) -> Dict[str, List[Union[TrackInfo, ArtistInfo, PlaylistInfo, AlbumInfo]]]:
+    def search(self, query: str, qtype: Union[QType, str] = 'track', limit: Optional[int] = DEFAULT_SEARCH_LIMIT) -> Dict[str, List[Union[TrackInfo, ArtistInfo, PlaylistInfo, AlbumInfo]]]:
         """
         Searches based of query term.
         - query: query term
         - qtype: the types of items to return. One or more of 'artist', 'album',  'track', 'playlist'.
                  If multiple types are desired, pass in a comma separated string; e.g. 'track,album'
-        - limit: max # items to return
+        - limit: max # items to return (None means DEFAULT_SEARCH_LIMIT)
+
+        Results are cached per normalized query and qtype set, and concurrent searches for
+        the same query and qtypes share upstream requests whatever their limits.
         """
-        results = self.sp.search(q=query, limit=limit, type=qtype)
-        return utils.parse_search_results(results, qtype)
+        limit = limit or DEFAULT_SEARCH_LIMIT
+        cache = self.client.search_cache
+        return cache.fetch(
+            cache.key(query, qtype),
+            limit,
+            lambda fetch_limit: self.sp.search(q=query, limit=fetch_limit, type=qtype),
+            lambda response: utils.parse_search_results(response, qtype)
+        )
 
     def recommendations(self, 
                        artists: Optional[List[str]] = None, 
                        tracks: Optional[List[str]] = None, 
                        limit: int = 20) -> Dict[str, List[TrackInfo]]:
+        """
+        Tracks similar to the seed artists and tracks. Answered from the local index of the
+        user's playlists when numpy is installed and a seed is known to it; otherwise from
+        Spotify's recommendations endpoint.
+        """
+        if self.recommender.available:
+            local = self.recommender.recommend(tracks=tracks, artists=artists, limit=limit)
+            if local is not None:
+                return {'tracks': local}
+
         recs = self.sp.recommendations(seed_artists=artists, seed_tracks=tracks, limit=limit)
         if 'tracks' not in recs:
             return {'tracks': []}
@@ -35,49 +72,174 @@ class SearchManager:
                 tracks.append(parsed)
         return {'tracks': tracks}
 
-    def get_info(self, item_id: str, qtype: QType = 'track') -> Optional[Union[TrackInfo, AlbumInfo, ArtistInfo, PlaylistInfo]]:
+    def get_info(
+        self,
+        item_id: str,
+        qtype: QType = 'track',
+        fields: Optional[List[str]] = None
+    ) -> Optional[Union[TrackInfo, AlbumInfo, ArtistInfo, PlaylistInfo]]:
         """
-        Returns more info about item.
+        Returns more info about item. Results are served from the client's metadata cache
+        when a fresh entry exists.
         - item_id: id.
         - qtype: Either 'track', 'album', 'artist', or 'playlist'.
+        - fields: if given, only these keys are needed. Sub-requests that only feed other keys
+                  (album/playlist tracks, artist albums and top tracks) are skipped.
+        """
+        cache = self.client.metadata_cache
+        if (cached := cache.get_item(qtype, item_id)) is not None:
+            return cached
+
+        info, complete = self._fetch_info(item_id, qtype, fields)
+        if complete:
+            cache.set_item(qtype, item_id, info)
+        return info
+
+    def iter_album_tracks(self, album_id: str, first_page: Optional[Dict[str, Any]] = None) -> Iterator[TrackInfo]:
+        """
+        Yields the tracks of an album in order, 50 per page with pages fetched concurrently.
+        - album_id: id of the album.
+        - first_page: the `tracks` paging object embedded in a full album response, if already
+                      fetched; it is used instead of requesting offset 0 again.
+        """
+        def fetch_page(offset: int, limit: int) -> Dict[str, Any]:
+            if offset == 0 and first_page is not None:
+                return first_page
+            return self.sp.album_tracks(album_id, limit=limit, offset=offset, market="from_token")
+
+        return paginate(fetch_page, utils.parse_track, self.client.fanout, page_size=50)
+
+    def get_info_batch(self, item_ids: List[str], qtype: QType = 'track') -> List[Dict[str, Any]]:
+        """
+        Returns info about many items of one type, in input order.
+        - item_ids: ids.
+        - qtype: Either 'track', 'album', 'artist', or 'playlist'.
+
+        Tracks, albums and artists are fetched through Spotify's multi-get endpoints in chunks of
+        BATCH_LIMITS[qtype], with the chunks requested concurrently. Playlists have no multi-get
+        endpoint and are looked up individually in parallel. Albums and artists are returned
+        without the tracks/albums/top tracks keys that a single `get_info` call adds. IDs that could
+        not be resolved are returned as `{'id': ..., 'error': 'not found'}`; any other Spotify
+        error is raised.
+        """
+        if qtype != 'playlist' and qtype not in BATCH_LIMITS:
+            raise ValueError(f"unknown qtype {qtype}")
+        cache = self.client.metadata_cache
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        for item_id in dict.fromkeys(item_ids):
+            if (cached := cache.get_item(qtype, item_id)) is not None:
+                found[item_id] = cached
+            else:
+                missing.append(item_id)
+
+        if missing:
+            if qtype == 'playlist':
+                for item_id, info in zip(missing, self.client.fanout.map(lambda i: self.get_info(i, 'playlist'), missing)):
+                    if info is not None:
+                        found[item_id] = info
+            else:
+                size = BATCH_LIMITS[qtype]
+                chunks = [missing[i:i + size] for i in range(0, len(missing), size)]
+                for parsed in self.client.fanout.map(lambda chunk: self._fetch_batch(chunk, qtype), chunks):
+                    found.update(parsed)
+
+        return [found.get(item_id) or {'id': item_id, 'error': 'not found'} for item_id in item_ids]
+
+    def _fetch_batch(self, item_ids: List[str], qtype: QType) -> Dict[str, Any]:
+        """Fetches one multi-get chunk and returns the parsed items keyed by requested id."""
+        try:
+            match qtype:
+                case 'track':
+                    items = self.sp.tracks(item_ids)['tracks']
+                    parse = utils.parser('track', detailed=True)
+                case 'album':
+                    items = self.sp.albums(item_ids)['albums']
+                    parse = utils.parser('album', detailed=True)
+                case 'artist':
+                    items = self.sp.artists(item_ids)['artists']
+                    parse = utils.parser('artist', detailed=True)
+        except SpotifyException as e:
+            # A malformed id fails its whole chunk with a 400; the other ids are not retried.
+            if e.http_status not in (400, 404):
+                raise
+            self.logger.error("Error getting %d %ss: %s", len(item_ids), qtype, e)
+            return {}
+
+        parsed: Dict[str, Any] = {}
+        # Spotify returns one slot per requested id, with null for ids it does not know.
+        for item_id, item in zip(item_ids, items):
+            if info := parse(item):
+                if qtype == 'artist':
+                    # Only get_info fills these in; empty lists here would read as "none".
+                    del info['top_tracks'], info['albums']
+                parsed[item_id] = info
+                # Single album/artist lookups also carry tracks/albums, so only tracks are
+                # complete enough to share the get_info cache entry.
+                if qtype == 'track':
+                    self.client.metadata_cache.set_item(qtype, item_id, info)
+        return parsed
+
+    def _fetch_info(
+        self,
+        item_id: str,
+        qtype: QType,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[Optional[Union[TrackInfo, AlbumInfo, ArtistInfo, PlaylistInfo]], bool]:
+        """
+        Fetches and parses an item. The flag is False when the result is partial, either
+        because a sub-request failed or because `fields` let us skip one.
         """
+        wants = lambda key: not fields or key in fields
         try:
             match qtype:
                 case 'track':
                     track = self.sp.track(item_id)
-                    return utils.parse_track(track, detailed=True)
+                    return utils.parse_track(track, detailed=True), True
                     
                 case 'album':
-                    album = self.sp.album(item_id)
+                    album = self.sp.album(item_id, market="from_token")
                     if album_info := utils.parse_album(album, detailed=True):
-                        return album_info
-                    return None
+                        if not wants('tracks'):
+                            return album_info, False
+                        album_info['tracks'] = list(self.iter_album_tracks(item_id, first_page=album.get('tracks')))
+                        return album_info, True
+                    return None, True
                     
                 case 'artist':
-                    artist = self.sp.artist(item_id)
-                    if not (artist_info := utils.parse_artist(artist, detailed=True)):
-                        return None
-                        
-                    albums = self.sp.artist_albums(item_id)
-                    top_tracks = self.sp.artist_top_tracks(item_id)['tracks']
-                    
+                    calls = {'artist': lambda: self.sp.artist(item_id)}
+                    if wants('albums'):
+                        calls['albums'] = lambda: self.sp.artist_albums(item_id)
+                    if wants('top_tracks'):
+                        calls['top_tracks'] = lambda: self.sp.artist_top_tracks(item_id)['tracks']
+                    results, errors = self.client.fanout.gather(calls)
+                    if 'artist' in errors:
+                        raise errors['artist']
+                    if not (artist_info := utils.parse_artist(results['artist'], detailed=True)):
+                        return None, True
+
+                    # Albums and top tracks are best-effort; return what we have if either failed or was skipped.
                     albums_and_tracks = {
-                        'albums': albums,
-                        'tracks': {'items': top_tracks}
+                        'albums': results.get('albums') or {'items': []},
+                        'tracks': {'items': results.get('top_tracks') or []}
                     }
                     parsed_info = utils.parse_search_results(albums_and_tracks, qtype="album,track")
                     artist_info['top_tracks'] = parsed_info.get('tracks', [])
                     artist_info['albums'] = parsed_info.get('albums', [])
-                    return artist_info
+                    return artist_info, not errors and len(calls) == 3
                     
                 case 'playlist':
-                    playlist = self.sp.playlist(item_id)
+                    playlist = self.sp.playlist(item_id, fields=utils.PLAYLIST_FIELDS)
                     if playlist_info := utils.parse_playlist(playlist, detailed=True):
-                        return playlist_info
-                    return None
+                        if not wants('tracks'):
+                            return playlist_info, False
+                        playlist_info['tracks'] = self.playlists.get_playlist_tracks(
+                            item_id, snapshot_id=playlist_info.get('snapshot_id'), fields=fields)
+                        return playlist_info, utils.playlist_item_fields(fields) == utils.PLAYLIST_ITEM_FIELDS
+                    return None, True
 
             raise ValueError(f"unknown qtype {qtype}")
             
         except Exception as e:
-            self.logger.error(f"Error getting info for {qtype} {item_id}: {str(e)}")
-            return None
+            self.logger.error("Error getting info for %s %s: %s", qtype, item_id, e)
+            return None, False
@@ -2,6 +2,9 @@ from .info import GetInfo
 from .playback import Playback
 from .playlist import Playlist
 from .queue import Queue
+from .recommend import Recommend
+from .registry import InvalidToolCall, ToolRegistry
 from .search import Search
+from .stats import Stats, stats_report
 from .tool_model import ToolModel
 from .user import User
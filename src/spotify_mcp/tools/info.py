@@ -1,29 +1,46 @@
-import json
+from typing import List, Optional
 
-from mcp.server import logger
 import mcp.types as types
 from pydantic import Field
 
-from .tool_model import ToolModel
+from ..log import get_logger
+from .tool_model import FIELDS_DESCRIPTION, ToolModel
+
+logger = get_logger("tools")
 
 class GetInfo(ToolModel):
-    """Get detailed information about a Spotify item (track, album, artist, or playlist)."""
+    """Get detailed information about one or more Spotify items (tracks, albums, artists, or playlists)."""
 
     class Schema(ToolModel.Schema):
         action: str = Field(description="Action to perform: 'get'")
-        item_id: str = Field(description="ID of the item to get information about")
+        item_id: Optional[str] = Field(default=None, description="ID of the item to get information about")
+        item_ids: Optional[List[str]] = Field(default=None, description="IDs of several items of the same qtype to look up "
+                                                                      "in one call. Results are returned in the same order; "
+                                                                      "IDs that cannot be found are marked with an error.")
         qtype: str = Field(default="track", description="Type of item: 'track', 'album', 'artist', or 'playlist'. "
                                                     "If 'playlist' or 'album', returns its tracks. If 'artist',"
                                                     "returns albums and top tracks.")
+        fields: Optional[List[str]] = Field(default=None, description=FIELDS_DESCRIPTION)
 
     def get(self, arguments):
-        logger.info(f"Getting item info with arguments: {arguments}")
-        item_info = self._spotify.search.get_info(
-            item_id=arguments.get("item_id"),
-            qtype=arguments.get("qtype", "track")
-        )
-        return [types.TextContent(
-            type="text",
-            text=json.dumps(item_info, indent=2)
-        )]
+        logger.info("Getting item info with arguments: %s", arguments)
+        item_ids = arguments.get("item_ids")
+        if item_ids:
+            item_info = self._spotify.search.get_info_batch(
+                item_ids=item_ids,
+                qtype=arguments.get("qtype", "track")
+            )
+        elif arguments.get("item_id"):
+            item_info = self._spotify.search.get_info(
+                item_id=arguments.get("item_id"),
+                qtype=arguments.get("qtype", "track"),
+                fields=arguments.get("fields")
+            )
+        else:
+            logger.error("item_id or item_ids is required for get action.")
+            return [types.TextContent(
+                type="text",
+                text="item_id or item_ids is required for get action"
+            )]
+        return self.json_response(item_info, arguments)
 
@@ -1,12 +1,13 @@
-import json
 from typing import Optional
 
-from mcp.server import logger
 import mcp.types as types
 from pydantic import Field
 
+from ..log import get_logger
 from .tool_model import ToolModel
 
+logger = get_logger("tools")
+
 class Playback(ToolModel):
     """Manages the current playback with the following actions:
     - get: Get information about user's current track.
@@ -24,11 +25,8 @@ class Playback(ToolModel):
         logger.info("Attempting to get current track")
         curr_track = self._spotify.playback.get_current_track()
         if curr_track:
-            logger.info(f"Current track retrieved: {curr_track.get('name', 'Unknown')}")
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(curr_track, indent=2)
-            )]
+            logger.info("Current track retrieved: %s", curr_track.get('name', 'Unknown'))
+            return self.json_response(curr_track, arguments)
         logger.info("No track currently playing")
         return [types.TextContent(
             type="text",
@@ -36,7 +34,7 @@ class Playback(ToolModel):
         )]
 
     def start(self, arguments):
-        logger.info(f"Starting playback with arguments: {arguments}")
+        logger.info("Starting playback with arguments: %s", arguments)
         self._spotify.playback.start_playback(track_id=arguments.get("track_id"))
         logger.info("Playback started successfully")
         return [types.TextContent(
@@ -54,10 +52,10 @@ class Playback(ToolModel):
         )]
 
     def skip(self, arguments):
-        num_skips = int(arguments.get("num_skips", 1))
-        logger.info(f"Skipping {num_skips} tracks.")
-        self._spotify.playback.skip_track(n=num_skips)
+        num_skips = int(arguments.get("num_skips") or 1)
+        logger.info("Skipping %d tracks.", num_skips)
+        result = self._spotify.playback.skip_track(n=num_skips)
         return [types.TextContent(
             type="text",
-            text="Skipped to next track."
+            text=f"Skipped {num_skips} track(s) via {result['method']} in {result['elapsed_ms']}ms."
         )]
@@ -1,19 +1,23 @@
 from typing import List
 
-from mcp.server import logger
 import mcp.types as types
 from pydantic import Field
 
+from ..log import get_logger
 from .tool_model import ToolModel
 
+logger = get_logger("tools")
+
 class Playlist(ToolModel):
     """Manage a playlist with the following actions:
-    - add: adds a list of tracks to a playlist"""
+    - add: adds a list of tracks to a playlist
+    - remove: removes every occurrence of a list of tracks from a playlist
+    - sync: makes the playlist hold exactly the given tracks in the given order, changing only what differs"""
 
     class Schema(ToolModel.Schema):
-        action: str = Field(description="Action to perform: 'add', 'remove'.")
+        action: str = Field(description="Action to perform: 'add', 'remove', 'sync'.")
         playlist_id: str = Field(description="ID of the playlist to add items to")
-        items: List[str] = Field(description="a list of tracks to add to the playlist`")
+        items: List[str] = Field(description="a list of track IDs to add or remove, or for 'sync' the playlist's full new track list")
 
     def add(self, arguments):
         playlist_id = arguments.get("playlist_id")
@@ -51,3 +55,21 @@ class Playlist(ToolModel):
             type="text",
             text=f"Items removed from playlist successfully."
         )]
+
+    def sync(self, arguments):
+        playlist_id = arguments.get("playlist_id")
+        if not playlist_id:
+            logger.error("playlist_id is required for sync action.")
+            return [types.TextContent(
+                type="text",
+                text="playlist_id is required for sync action"
+            )]
+        try:
+            summary = self._spotify.playlists.sync_items(playlist_id, arguments.get("items") or [])
+        except ValueError as e:
+            logger.error("%s", e)
+            return [types.TextContent(
+                type="text",
+                text=str(e)
+            )]
+        return self.json_response(summary, arguments)
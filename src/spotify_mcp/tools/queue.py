@@ -1,11 +1,12 @@
-import json
-from typing import Optional
+from typing import List, Optional
 
-from mcp.server import logger
 import mcp.types as types
 from pydantic import Field
 
-from .tool_model import ToolModel
+from ..log import get_logger
+from .tool_model import FIELDS_DESCRIPTION, ToolModel
+
+logger = get_logger("tools")
 
 class Queue(ToolModel):
     """Manage the playback queue - get the queue or add tracks."""
@@ -13,6 +14,7 @@ class Queue(ToolModel):
     class Schema(ToolModel.Schema):
         action: str = Field(description="Action to perform: 'add' or 'get'.")
         track_id: Optional[str] = Field(default=None, description="Track ID to add to queue (required for add action)")
+        fields: Optional[List[str]] = Field(default=None, description=FIELDS_DESCRIPTION)
 
     def add(self, arguments):
         track_id = arguments.get("track_id")
@@ -30,7 +32,4 @@ class Queue(ToolModel):
 
     def get(self, arguments):
         queue = self._spotify.playback.get_queue()
-        return [types.TextContent(
-            type="text",
-            text=json.dumps(queue, indent=2)
-        )]
+        return self.json_response(queue, arguments)
@@ -0,0 +1,37 @@
+from typing import List, Optional
+
+import mcp.types as types
+from pydantic import Field
+
+from ..log import get_logger
+from .tool_model import FIELDS_DESCRIPTION, ToolModel
+
+logger = get_logger("tools")
+
+class Recommend(ToolModel):
+    """Recommend tracks similar to seed tracks and/or artists, drawn from the user's own playlists
+    by a local similarity index (falls back to Spotify's recommendations when no seed is known to it).
+    - get: get recommended tracks"""
+
+    class Schema(ToolModel.Schema):
+        action: str = Field(description="Action to perform: 'get'.")
+        track_ids: Optional[List[str]] = Field(default=None, description="Seed track IDs")
+        artist_ids: Optional[List[str]] = Field(default=None, description="Seed artist IDs")
+        limit: Optional[int] = Field(default=20, description="Maximum number of tracks to return")
+        fields: Optional[List[str]] = Field(default=None, description=FIELDS_DESCRIPTION)
+
+    def get(self, arguments):
+        track_ids = arguments.get("track_ids")
+        artist_ids = arguments.get("artist_ids")
+        if not track_ids and not artist_ids:
+            logger.error("track_ids or artist_ids is required for get action.")
+            return [types.TextContent(
+                type="text",
+                text="track_ids or artist_ids is required for get action"
+            )]
+        recommendations = self._spotify.search.recommendations(
+            artists=artist_ids,
+            tracks=track_ids,
+            limit=arguments.get("limit") or 20
+        )
+        return self.json_response(recommendations, arguments)
@@ -0,0 +1,85 @@
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Type
+
+import mcp.types as types
+from pydantic import ValidationError
+
+from .tool_model import ToolModel
+
+Handler = Callable[[Dict[str, Any]], Any]
+
+class InvalidToolCall(ValueError):
+    """Raised when a tool call names an unknown tool/action or its arguments fail validation."""
+
+
+@dataclass
+class ToolEntry:
+    tool: ToolModel
+    schema: Type[ToolModel.Schema]
+    actions: Dict[str, Handler] = field(default_factory=dict)
+
+
+def _actions(tool: ToolModel) -> Dict[str, Handler]:
+    """Public methods defined on the tool subclass, keyed by action name."""
+    actions: Dict[str, Handler] = {}
+    for klass in type(tool).__mro__:
+        if klass is ToolModel:
+            break
+        for name, member in vars(klass).items():
+            # pydantic reserves the `model_` prefix for its own hooks (e.g. model_post_init)
+            if name.startswith(("_", "model_")) or name in actions or not inspect.isfunction(member):
+                continue
+            actions[name] = getattr(tool, name)
+    return actions
+
+
+class ToolRegistry:
+    """
+    Lookup table for tools, built once at startup.
+
+    Maps the full tool name (e.g. 'SpotifySearch') and action to a bound handler, caches the
+    serialized `types.Tool` listing, and validates arguments against each tool's Schema so
+    malformed calls are rejected before any Spotify request is made.
+    """
+
+    def __init__(self, tools: Iterable[ToolModel]) -> None:
+        self._entries: Dict[str, ToolEntry] = {}
+        self._listing: List[types.Tool] = []
+        for tool in tools:
+            spec = tool.as_tool()
+            if spec.name in self._entries:
+                raise ValueError(f"Duplicate tool name: {spec.name}")
+            self._entries[spec.name] = ToolEntry(tool=tool, schema=type(tool).Schema, actions=_actions(tool))
+            self._listing.append(spec)
+
+    @property
+    def tools(self) -> List[types.Tool]:
+        return self._listing
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def resolve(self, name: str, arguments: Dict[str, Any] | None) -> Tuple[Handler, Dict[str, Any]]:
+        """
+        Returns the handler for the requested action along with the validated arguments.
+
+        Raises:
+            InvalidToolCall: If the tool or action is unknown or the arguments do not match the schema
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            raise InvalidToolCall(f"Unknown tool: {name}")
+
+        try:
+            validated = entry.schema.model_validate(arguments or {})
+        except ValidationError as e:
+            raise InvalidToolCall(f"Invalid arguments for {name}: {e}") from e
+
+        action = getattr(validated, "action", None)
+        handler = entry.actions.get(action) if action else None
+        if handler is None:
+            raise InvalidToolCall(
+                f"Unknown action '{action}' for {name}. Expected one of: {', '.join(entry.actions)}"
+            )
+        return handler, validated.model_dump()
@@ -1,31 +1,55 @@
-import json
-from typing import Optional
+import os
+from typing import List, Literal, Optional
 
-from mcp.server import logger
 import mcp.types as types
 from pydantic import Field
 
-from .tool_model import ToolModel
+from ..log import get_logger
+from .tool_model import FIELDS_DESCRIPTION, ToolModel
+
+logger = get_logger("tools")
+
+# Resync the local library index before a library search once it is older than this (seconds).
+LIBRARY_MAX_AGE = float(os.getenv("SPOTIFY_MCP_LIBRARY_MAX_AGE", 24 * 60 * 60))
 
 class Search(ToolModel):
-    """Search for tracks, albums, artists, or playlists on Spotify."""
+    """Search for tracks, albums, artists, or playlists on Spotify, or only within the user's own library
+    (playlists, saved tracks and saved albums) using a local index."""
 
     class Schema(ToolModel.Schema):
         action: str = Field(description="Action to perform: 'search'.")
         query: str = Field(description="query term")
         qtype: Optional[str] = Field(default="track", description="Type of items to search for (track, album, artist, playlist, or comma-separated combination)")
         limit: Optional[int] = Field(default=10, description="Maximum number of items to return")
+        fields: Optional[List[str]] = Field(default=None, description=FIELDS_DESCRIPTION)
+        source: Optional[Literal['spotify', 'library']] = Field(default="spotify", description="'spotify' searches the whole catalog. "
+                                                                        "'library' searches only the user's playlists, saved tracks and "
+                                                                        "saved albums from a local index, without a network request.")
+        refresh: Optional[bool] = Field(default=False, description="For source='library': resync the local index before searching.")
 
     def search(self, arguments):
-        logger.info(f"Performing search with arguments: {arguments}")
+        logger.info("Performing search with arguments: %s", arguments)
+        if arguments.get("source") == "library":
+            return self._search_library(arguments)
         search_results = self._spotify.search.search(
             query=arguments.get("query", ""),
             qtype=arguments.get("qtype", "track"),
-            limit=arguments.get("limit", 10)
+            limit=arguments.get("limit") or 10
         )
         logger.info("Search completed successfully")
-        return [types.TextContent(
-            type="text",
-            text=json.dumps(search_results, indent=2)
-        )]
+        return self.json_response(search_results, arguments)
+
 
+    def _search_library(self, arguments):
+        library = self._spotify.library
+        stats = library.stats()
+        if arguments.get("refresh") or stats['synced_at'] is None or stats['age_seconds'] > LIBRARY_MAX_AGE:
+            logger.info("Syncing library index")
+            stats = library.sync()
+        search_results = library.search(
+            query=arguments.get("query", ""),
+            qtype=arguments.get("qtype", "track"),
+            limit=arguments.get("limit") or 10
+        )
+        search_results['index'] = stats
+        return self.json_response(search_results, arguments)
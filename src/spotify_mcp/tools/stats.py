@@ -0,0 +1,37 @@
+from typing import Any, Dict
+
+import mcp.types as types
+from pydantic import Field
+
+from ..log import get_logger
+from ..metrics import metrics
+from ..spotify import Spotify
+from .tool_model import ToolModel
+
+logger = get_logger("tools")
+
+def stats_report(spotify: Spotify) -> Dict[str, Any]:
+    """Tool and endpoint metrics plus the facade's own counters (see Spotify.stats and PooledSpotify.stats)."""
+    return {**metrics.snapshot(), **spotify.stats()}
+
+
+class Stats(ToolModel):
+    """Server performance statistics with the following actions:
+    - get: latency percentiles (ms) per tool action and Spotify endpoint, Spotify requests per tool call,
+      bytes received, cache hit ratios, rate limiting and errors by type.
+    - reset: clear the tool and endpoint statistics.
+    """
+
+    class Schema(ToolModel.Schema):
+        action: str = Field(description="Action to perform: 'get' or 'reset'.")
+
+    def get(self, arguments):
+        return self.json_response(stats_report(self._spotify), arguments)
+
+    def reset(self, arguments):
+        logger.info("Resetting statistics")
+        metrics.reset()
+        return [types.TextContent(
+            type="text",
+            text="Statistics reset."
+        )]
@@ -1,15 +1,21 @@
-from typing import Any
+from typing import Any, Dict, List, Optional
 
 import mcp.types as types
-from pydantic import BaseModel, PrivateAttr
+from pydantic import BaseModel, Field, PrivateAttr
 
+from .. import utils
+from ..encoding import ResponseFormat, encoder
 from ..spotify import Spotify
 
+FIELDS_DESCRIPTION = ("Optional list of keys to keep on each returned item, e.g. ['id', 'name']. "
+                      "If omitted, returns every field.")
+
 class ToolModel(BaseModel):
     _spotify: Spotify = PrivateAttr()
 
     class Schema(BaseModel):
-        pass
+        response_format: Optional[ResponseFormat] = Field(default=None, description="JSON output style: 'compact' or 'pretty'. "
+                                                                                     "Defaults to the server setting.")
 
     def __init__(self, spotify: Spotify) -> None:
         super().__init__()
@@ -23,6 +29,17 @@ class ToolModel(BaseModel):
             inputSchema=cls.Schema.model_json_schema()
         )
 
+    def json_response(self, data: Any, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """
+        Wrap `data` as a JSON text result using the shared response encoder, projected down to
+        `arguments['fields']` when the tool accepts a field list.
+        """
+        data = utils.project_fields(data, arguments.get("fields"))
+        return [types.TextContent(
+            type="text",
+            text=encoder.encode(data, arguments.get("response_format"))
+        )]
+
     def execute(self, method_name: str, *args, **kwargs) -> Any:
         if not hasattr(self, method_name):
             raise AttributeError(f"Method '{method_name}' not found in {self.__class__.__name__}")
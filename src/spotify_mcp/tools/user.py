@@ -1,10 +1,12 @@
-import json
+from typing import List, Optional
 
-from mcp.server import logger
 import mcp.types as types
 from pydantic import Field
 
-from .tool_model import ToolModel
+from ..log import get_logger
+from .tool_model import FIELDS_DESCRIPTION, ToolModel
+
+logger = get_logger("tools")
 
 class User(ToolModel):
     """Search for playlists belonging to the user on Spotify.
@@ -13,6 +15,8 @@ class User(ToolModel):
     class Schema(ToolModel.Schema):
         action: str = Field(description="Action to perform: 'get'.")
         user: str = Field(description="Username of user")
+        limit: Optional[int] = Field(default=None, description="Maximum number of playlists to return. If omitted, returns all of them.")
+        fields: Optional[List[str]] = Field(default=None, description=FIELDS_DESCRIPTION)
 
     def get(self, arguments):
         user = arguments.get("user")
@@ -22,8 +26,5 @@ class User(ToolModel):
                 type="text",
                 text="user is required for get action"
             )]
-        playlists = self._spotify.playlists.get_user_playlists(user) 
-        return [types.TextContent(
-            type="text",
-            text=json.dumps(playlists, indent=2)
-        )]
+        playlists = self._spotify.playlists.get_user_playlists(user, max_items=arguments.get("limit"))
+        return self.json_response(playlists, arguments)
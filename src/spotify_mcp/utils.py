@@ -1,4 +1,3 @@
-from collections import defaultdict
 import functools
 from typing import Optional, Dict, List, Callable, TypeVar, Tuple, Any, cast, Union
 from urllib.parse import quote
@@ -13,116 +12,180 @@ from .spotify.models import (
 
 T = TypeVar('T')
 
-def parse_track(track_item: Dict[str, Any], detailed: bool = False) -> Optional[TrackInfo]:
-    if not track_item:
-        return None
-    narrowed_item: TrackInfo = {
-        'name': track_item['name'],
-        'id': track_item['id'],
-    }
-
-    if 'is_playing' in track_item:
-        narrowed_item['is_playing'] = track_item['is_playing']
-
-    if detailed:
-        narrowed_item['album'] = parse_album(track_item.get('album'))
-        for k in ['track_number', 'duration_ms']:
-            if k in track_item:
-                narrowed_item[k] = track_item[k]
+# Spotify `fields=` filters covering exactly what the parsers below read, so list endpoints
+# that support field filtering do not send (and we do not decode) anything else.
+TRACK_FIELDS = "id,name,artists(name),is_playable"
+PLAYLIST_ITEM_FIELDS = f"total,items(track({TRACK_FIELDS}))"
+PLAYLIST_FIELDS = "id,name,owner(display_name),public,snapshot_id,tracks(total)"
 
-    if not track_item.get('is_playable', True):
-        narrowed_item['is_playable'] = False
+# The part of TRACK_FIELDS each key of a compact parsed track is read from.
+_TRACK_KEY_SOURCES = {'artist': 'artists(name)', 'artists': 'artists(name)', 'is_playable': 'is_playable'}
 
-    artists = [a['name'] for a in track_item['artists']]
-    if detailed:
-        artists = [parse_artist(a) for a in track_item['artists']]
-
-    if len(artists) == 1:
-        narrowed_item['artist'] = artists[0] if isinstance(artists[0], str) else artists[0]['name']
-    else:
-        narrowed_item['artists'] = artists
+def playlist_item_fields(fields: Optional[List[str]] = None) -> str:
+    """
+    PLAYLIST_ITEM_FIELDS narrowed to the track keys in `fields` (as in project_fields), so a
+    caller that keeps only some keys does not download the rest. id and name are always read.
+    """
+    if not fields:
+        return PLAYLIST_ITEM_FIELDS
+    wanted = {'id', 'name'} | {_TRACK_KEY_SOURCES[f] for f in fields if f in _TRACK_KEY_SOURCES}
+    track_fields = ",".join(part for part in TRACK_FIELDS.split(",") if part in wanted)
+    return f"total,items(track({track_fields}))"
+
+# Parsers are compiled once per model and detail level: each is a closure with the detail
+# level already resolved, so a raw item is walked once with no per-item flag checks, and keys
+# are written directly in their output order instead of being assembled and patched up.
+
+def _compile_artist(detailed: bool) -> Callable[[Dict[str, Any]], Optional[ArtistInfo]]:
+    def parse(item: Dict[str, Any]) -> Optional[ArtistInfo]:
+        if not item:
+            return None
+        return {
+            'name': item['name'],
+            'id': item['id'],
+            'genres': item.get('genres', []),
+            'popularity': item.get('popularity', 0),
+            'top_tracks': [],
+            'albums': []
+        }
+    return parse
+
+def _compile_album(detailed: bool) -> Callable[[Dict[str, Any]], Optional[AlbumInfo]]:
+    def parse(item: Dict[str, Any]) -> Optional[AlbumInfo]:
+        if not item:
+            return None
+        artists = item['artists']
+        return {
+            'name': item['name'],
+            'id': item['id'],
+            'artist': artists[0]['name'] if len(artists) == 1 else ', '.join([a['name'] for a in artists]),
+            'release_date': item.get('release_date', ''),
+            'total_tracks': item.get('total_tracks', 0)
+        }
+    return parse
+
+def _compile_playlist(detailed: bool) -> Callable[[Dict[str, Any]], Optional[PlaylistInfo]]:
+    def parse(item: Dict[str, Any]) -> Optional[PlaylistInfo]:
+        if not item:
+            return None
+        info: PlaylistInfo = {
+            'name': item['name'],
+            'id': item['id'],
+            'owner': item['owner']['display_name'],
+            'tracks_total': item['tracks']['total'],
+            'public': item.get('public', False)
+        }
+        if 'snapshot_id' in item:
+            info['snapshot_id'] = item['snapshot_id']
+        return info
+    return parse
+
+def _compile_track(detailed: bool) -> Callable[[Dict[str, Any]], Optional[TrackInfo]]:
+    if not detailed:
+        def parse(item: Dict[str, Any]) -> Optional[TrackInfo]:
+            if not item:
+                return None
+            info: TrackInfo = {'name': item['name'], 'id': item['id']}
+            if 'is_playing' in item:
+                info['is_playing'] = item['is_playing']
+            if not item.get('is_playable', True):
+                info['is_playable'] = False
+            # Absent only when a narrowed `fields=` filter left the artists out.
+            artists = item.get('artists')
+            if artists is not None:
+                if len(artists) == 1:
+                    info['artist'] = artists[0]['name']
+                else:
+                    info['artists'] = [a['name'] for a in artists]
+            return info
+        return parse
+
+    album = _compile_album(True)
+    artist = _compile_artist(True)
+
+    def parse_detailed(item: Dict[str, Any]) -> Optional[TrackInfo]:
+        if not item:
+            return None
+        info: TrackInfo = {'name': item['name'], 'id': item['id']}
+        if 'is_playing' in item:
+            info['is_playing'] = item['is_playing']
+        info['album'] = album(item.get('album'))
+        if 'track_number' in item:
+            info['track_number'] = item['track_number']
+        if 'duration_ms' in item:
+            info['duration_ms'] = item['duration_ms']
+        if not item.get('is_playable', True):
+            info['is_playable'] = False
+        artists = item['artists']
+        if len(artists) == 1:
+            # A single artist collapses to its name, so there is nothing to parse.
+            info['artist'] = artists[0]['name']
+        else:
+            info['artists'] = [artist(a) for a in artists]
+        return info
+    return parse_detailed
+
+_PARSERS: Dict[Tuple[str, bool], Callable[[Dict[str, Any]], Any]] = {
+    (model, detailed): compile(detailed)
+    for model, compile in (
+        ('track', _compile_track),
+        ('artist', _compile_artist),
+        ('playlist', _compile_playlist),
+        ('album', _compile_album),
+    )
+    for detailed in (False, True)
+}
+
+def parser(model: QType, detailed: bool = False) -> Callable[[Dict[str, Any]], Any]:
+    """The compiled parser for `model` ('track', 'artist', 'playlist' or 'album') at a detail level."""
+    return _PARSERS[(model, detailed)]
 
-    return narrowed_item
+def parse_track(track_item: Dict[str, Any], detailed: bool = False) -> Optional[TrackInfo]:
+    return _PARSERS[('track', detailed)](track_item)
 
 def parse_artist(artist_item: Dict[str, Any], detailed: bool = False) -> Optional[ArtistInfo]:
-    if not artist_item:
-        return None
-    narrowed_item: ArtistInfo = {
-        'name': artist_item['name'],
-        'id': artist_item['id'],
-        'genres': artist_item.get('genres', []),
-        'popularity': artist_item.get('popularity', 0),
-        'top_tracks': [],
-        'albums': []
-    }
-    
-    return narrowed_item
+    return _PARSERS[('artist', detailed)](artist_item)
 
 def parse_playlist(playlist_item: Dict[str, Any], detailed: bool = False) -> Optional[PlaylistInfo]:
-    if not playlist_item:
-        return None
-    narrowed_item: PlaylistInfo = {
-        'name': playlist_item['name'],
-        'id': playlist_item['id'],
-        'owner': playlist_item['owner']['display_name'],
-        'tracks_total': playlist_item['tracks']['total'],
-        'public': playlist_item.get('public', False)
-    }
-    
-    return narrowed_item
+    return _PARSERS[('playlist', detailed)](playlist_item)
 
 def parse_album(album_item: Dict[str, Any], detailed: bool = False) -> Optional[AlbumInfo]:
-    if not album_item:
-        return None
-        
-    narrowed_item: AlbumInfo = {
-        'name': album_item['name'],
-        'id': album_item['id'],
-        'artist': '',  # Will be set below
-        'release_date': album_item.get('release_date', ''),
-        'total_tracks': album_item.get('total_tracks', 0)
-    }
-
-    artists = [a['name'] for a in album_item['artists']]
-    if len(artists) == 1:
-        narrowed_item['artist'] = artists[0]
-    else:
-        narrowed_item['artist'] = ', '.join(artists)
-
-    return narrowed_item
+    return _PARSERS[('album', detailed)](album_item)
+
+_parse_track = _PARSERS[('track', False)]
+
+def parse_playlist_item(item: Dict[str, Any]) -> Optional[TrackInfo]:
+    """Parses the track of one playlist or saved-tracks item ({'track': {...}, ...})."""
+    return _parse_track(item.get('track')) if item else None
+
+def parse_playlist_tracks(items: List[Dict[str, Any]]) -> List[TrackInfo]:
+    """Parses a page (or a whole dump) of playlist items, skipping local and removed tracks."""
+    return [t for item in items if item and (t := _parse_track(item.get('track')))]
+
+# Result key in a search response and in parse_search_results' output, per qtype.
+_SEARCH_KEYS = {'track': 'tracks', 'artist': 'artists', 'playlist': 'playlists', 'album': 'albums'}
+
+@functools.lru_cache(maxsize=64)
+def _search_plan(qtype: str) -> Tuple[Tuple[str, Callable[[Dict[str, Any]], Any]], ...]:
+    plan = []
+    for q in qtype.split(","):
+        if q not in _SEARCH_KEYS:
+            raise ValueError(f"unknown qtype {qtype}")
+        plan.append((_SEARCH_KEYS[q], _PARSERS[(q, False)]))
+    return tuple(plan)
 
 def parse_search_results(
     results: Dict[str, Any], 
     qtype: Union[QType, str]
 ) -> Dict[str, List[Union[TrackInfo, ArtistInfo, PlaylistInfo, AlbumInfo]]]:
-    _results: Dict[str, List[Any]] = defaultdict(list)
+    _results: Dict[str, List[Any]] = {}
 
-    for q in qtype.split(","):
-        match q:
-            case "track":
-                for item in results['tracks']['items']:
-                    if not item: continue
-                    if parsed := parse_track(item):
-                        _results['tracks'].append(parsed)
-            case "artist":
-                for item in results['artists']['items']:
-                    if not item: continue
-                    if parsed := parse_artist(item):
-                        _results['artists'].append(parsed)
-            case "playlist":
-                for item in results['playlists']['items']:
-                    if not item: continue
-                    if parsed := parse_playlist(item):
-                        _results['playlists'].append(parsed)
-            case "album":
-                for item in results['albums']['items']:
-                    if not item: continue
-                    if parsed := parse_album(item):
-                        _results['albums'].append(parsed)
-            case _:
-                raise ValueError(f"unknown qtype {qtype}")
-
-    return dict(_results)
+    for key, parse in _search_plan(qtype):
+        parsed = [p for item in results[key]['items'] if item and (p := parse(item))]
+        if parsed:
+            _results.setdefault(key, []).extend(parsed)
+
+    return _results
 
 def build_search_query(
     base_query: str,
@@ -160,6 +223,23 @@ def build_search_query(
     query_parts = [base_query] + filters
     return quote(" ".join(query_parts))
 
+def project_fields(data: Any, fields: Optional[List[str]]) -> Any:
+    """
+    Narrows every item record (a dict with an 'id') in `data` down to the given keys.
+    Container dicts and lists are walked, and kept values are projected recursively, so
+    e.g. a playlist's 'tracks' are narrowed to the same fields.
+    """
+    if not fields:
+        return data
+    if isinstance(data, list):
+        return [project_fields(item, fields) for item in data]
+    if isinstance(data, dict):
+        if 'id' in data:
+            # 'error' marks an unresolved item (see get_info_batch) and is always kept.
+            return {k: project_fields(v, fields) for k, v in data.items() if k in fields or k == 'error'}
+        return {k: project_fields(v, fields) for k, v in data.items()}
+    return data
+
 def validate(func: Callable[..., T]) -> Callable[..., T]:
     """
     Decorator for Spotify API methods that handles authentication validation.
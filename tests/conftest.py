@@ -0,0 +1,39 @@
+import os
+
+# Placeholder credentials, no network and no rate limit: everything runs against the
+# synthetic Spotify stand-in (spotify_mcp.spotify.replay).
+os.environ.update({
+    "SPOTIFY_CLIENT_ID": "offline",
+    "SPOTIFY_CLIENT_SECRET": "offline",
+    "SPOTIFY_REDIRECT_URI": "http://127.0.0.1:8080/callback",
+    "SPOTIFY_MCP_HTTP_WARM_UP": "false",
+    "SPOTIFY_MCP_RATE_LIMIT": "1000000",
+    "SPOTIFY_MCP_RATE_BURST": "1000000",
+    "SPOTIFY_MCP_LIBRARY_DB": ":memory:",
+})
+
+import pytest
+
+from spotify_mcp.spotify import Spotify, SpotifyClient
+from spotify_mcp.spotify.replay import FixtureSet, Replay
+
+
+def offline_client(fixtures: FixtureSet, **replay) -> SpotifyClient:
+    return SpotifyClient(
+        client_id="offline",
+        client_secret="offline",
+        redirect_uri="http://127.0.0.1:8080/callback",
+        transport=Replay(fixtures, seed=0, **replay)
+    )
+
+
+@pytest.fixture
+def fixtures() -> FixtureSet:
+    return FixtureSet.synthetic(playlist_size=300, playlists=5, saved_tracks=20, saved_albums=5)
+
+
+@pytest.fixture
+def spotify(fixtures):
+    spotify = Spotify(client=offline_client(fixtures))
+    yield spotify
+    spotify.close()
@@ -0,0 +1,159 @@
+import json
+import threading
+import time
+
+import pytest
+from spotipy.oauth2 import SpotifyOauthError
+
+from spotify_mcp.spotify.auth import TokenRefresher, TokenStore
+
+
+def token(access, expires_in=3600, refresh="refresh"):
+    info = {"access_token": access, "token_type": "Bearer", "expires_at": time.time() + expires_in}
+    if refresh:
+        info["refresh_token"] = refresh
+    return info
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TokenStore(cache_path=str(tmp_path / "token.json"))
+
+
+def test_cache_file_is_read_once(tmp_path):
+    path = tmp_path / "token.json"
+    path.write_text(json.dumps(token("a")))
+    store = TokenStore(cache_path=str(path))
+    assert store.get_cached_token()["access_token"] == "a"
+    path.write_text(json.dumps(token("b")))
+    assert store.get_cached_token()["access_token"] == "a"
+    assert not store.is_expired(margin=60)
+
+
+def test_cache_file_is_written_only_when_the_access_token_changes(store, monkeypatch):
+    writes = []
+    monkeypatch.setattr(store._file, "save_token_to_cache", writes.append)
+    store.save_token_to_cache(token("a"))
+    store.save_token_to_cache({**token("a"), "scope": "other"})
+    assert [w["access_token"] for w in writes] == ["a"]
+    assert store.get_cached_token()["scope"] == "other"
+    store.save_token_to_cache(token("b"))
+    assert [w["access_token"] for w in writes] == ["a", "b"]
+
+
+def test_seed_never_touches_the_file(store, monkeypatch):
+    monkeypatch.setattr(store._file, "get_cached_token", lambda: pytest.fail("read the cache file"))
+    monkeypatch.setattr(store._file, "save_token_to_cache", lambda info: pytest.fail("wrote the cache file"))
+    store.seed(token("offline"))
+    assert store.get_cached_token()["access_token"] == "offline"
+
+
+class Refresh:
+    """Stands in for SpotifyClient.auth_refresh: fails with `errors` in turn, then rotates the token."""
+
+    def __init__(self, store, errors=()):
+        self.store = store
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        self.store.save_token_to_cache(token(f"rotated{self.calls}"))
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def refresher(store):
+    refreshers = []
+
+    def start(refresh, **kwargs):
+        refresher = TokenRefresher(store, refresh, **{'margin': 60, 'retry_delay': 0.01, 'max_retry_delay': 0.05, **kwargs})
+        refreshers.append(refresher)
+        refresher.start()
+        return refresher
+
+    yield start
+    for refresher in refreshers:
+        refresher.stop()
+
+
+def test_refreshes_before_expiry(store, refresher):
+    store.seed(token("old", expires_in=30))
+    refresh = Refresh(store)
+    r = refresher(refresh)
+    wait_for(lambda: store.get_cached_token()["access_token"] == "rotated1")
+    wait_for(lambda: r.stats()['state'] == 'ok' and r.stats()['refreshed_at'])
+    assert refresh.calls == 1
+
+
+def test_transient_failures_back_off_and_recover(store, refresher):
+    store.seed(token("old", expires_in=30))
+    refresh = Refresh(store, [ConnectionError("down")] * 3)
+    r = refresher(refresh)
+    wait_for(lambda: refresh.calls == 4)
+    wait_for(lambda: r.stats()['state'] == 'ok')
+    assert r.stats()['failures'] == 0
+    assert r.stats()['last_error'] == "down"
+
+
+def test_backoff_doubles_up_to_the_cap(store, refresher):
+    store.seed(token("old", expires_in=30))
+    times = []
+    release = threading.Event()
+
+    def refresh():
+        times.append(time.monotonic())
+        if len(times) == 6:
+            release.set()
+        raise ConnectionError("down")
+
+    r = refresher(refresh, retry_delay=0.02, max_retry_delay=0.16)
+    assert release.wait(5)
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert gaps[2] > gaps[0] * 2
+    assert max(gaps) < 0.16 * 3
+    assert r.stats()['state'] == 'retrying'
+    assert r.stats()['failures'] >= 5
+
+
+def test_invalid_grant_stops_retrying_until_a_new_token(store, refresher):
+    store.seed(token("old", expires_in=30))
+    refresh = Refresh(store, [SpotifyOauthError("error: invalid_grant, error_description: Refresh token revoked", error="invalid_grant")])
+    r = refresher(refresh)
+    wait_for(lambda: r.stats()['state'] == 'failed')
+    time.sleep(0.1)
+    assert refresh.calls == 1
+    assert "invalid_grant" in r.stats()['last_error']
+
+    # Authorizing again gives the refresher a new token to look after.
+    store.save_token_to_cache(token("reauthorized", expires_in=30))
+    wait_for(lambda: refresh.calls == 2)
+    wait_for(lambda: r.stats()['state'] == 'ok')
+
+
+def test_token_without_refresh_token_is_never_refreshed(store, refresher):
+    store.seed(token("old", expires_in=30, refresh=None))
+    refresh = Refresh(store)
+    r = refresher(refresh)
+    wait_for(lambda: r.stats()['state'] == 'failed')
+    time.sleep(0.05)
+    assert refresh.calls == 0
+    assert r.stats()['last_error'] == "token has no refresh token"
+
+
+def test_client_stats_report_the_refresher(store):
+    from spotify_mcp.spotify import SpotifyClient
+
+    client = SpotifyClient(client_id="id", client_secret="secret", redirect_uri="http://127.0.0.1:8080/callback", cache_path=store.cache_path)
+    try:
+        assert client.stats()['auth']['state'] == 'no_token'
+    finally:
+        client.close()
@@ -0,0 +1,117 @@
+from spotify_mcp.spotify.cache import MetadataCache, PlaylistContentsCache, approx_size
+
+
+def age(cache, seconds):
+    """Move every entry's expiry `seconds` closer, as if that much time had passed."""
+    for key, (expires_at, size, value) in list(cache._data.items()):
+        cache._data[key] = (expires_at - seconds, size, value)
+
+
+def test_entries_expire_after_their_type_ttl():
+    cache = MetadataCache(ttls={'track': 100, 'playlist': 10})
+    cache.set_item('track', "t", {'id': "t"})
+    cache.set_item('playlist', "p", {'id': "p"})
+    age(cache, 11)
+    assert cache.get_item('playlist', "p") is None
+    assert cache.get_item('track', "t") == {'id': "t"}
+    age(cache, 90)
+    assert cache.get_item('track', "t") is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_zero_ttl_and_none_are_not_cached():
+    cache = MetadataCache(ttls={'artist': 0})
+    cache.set_item('artist', "a", {'id': "a"})
+    cache.set_item('track', "t", None)
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = MetadataCache(max_entries=2)
+    cache.set_item('track', "a", {'id': "a"})
+    cache.set_item('track', "b", {'id': "b"})
+    cache.get_item('track', "a")
+    cache.set_item('track', "c", {'id': "c"})
+    assert cache.get_item('track', "b") is None
+    assert cache.get_item('track', "a") and cache.get_item('track', "c")
+    assert cache.stats()['evictions'] == 1
+
+
+def test_max_bytes_evicts_until_the_new_entry_fits():
+    value = lambda n: {'id': str(n), 'name': "x" * 1000}
+    size = approx_size(value(0))
+    cache = MetadataCache(max_bytes=size * 3)
+    for n in range(5):
+        cache.set_item('track', str(n), value(n))
+    assert [n for n in range(5) if cache.get_item('track', str(n))] == [2, 3, 4]
+    assert cache.stats()['bytes'] <= size * 3
+    cache.set_item('track', "big", {'id': "big", 'name': "x" * size * 4})
+    assert cache.get_item('track', "big") is None
+    assert len(cache) == 3
+
+
+def test_replacing_an_entry_keeps_the_byte_count_exact():
+    cache = MetadataCache()
+    cache.set_item('track', "a", {'id': "a", 'name': "short"})
+    cache.set_item('track', "a", {'id': "a", 'name': "a much longer name"})
+    assert cache.stats()['bytes'] == approx_size({'id': "a", 'name': "a much longer name"})
+    assert cache.invalidate_item('track', "a")
+    assert cache.stats()['bytes'] == 0
+
+
+def test_get_info_is_served_from_the_cache(spotify, fixtures):
+    track_id = next(iter(fixtures.tracks))
+    transport = spotify.client.sp.transport
+    first = spotify.search.get_info(track_id, 'track')
+    calls = transport.calls
+    assert spotify.search.get_info(track_id, 'track') == first
+    assert transport.calls == calls
+    assert spotify.client.metadata_cache.stats()['hits'] == 1
+
+
+def test_playlist_contents_hit_only_at_the_cached_snapshot():
+    cache = PlaylistContentsCache()
+    cache.set_contents("p", "p-1", [{'id': "a"}])
+    assert cache.get_contents("p", "p-1") == [{'id': "a"}]
+    assert cache.get_contents("p", "p-2") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.peek("p") == ("p-1", [{'id': "a"}])
+
+
+def playlist_ids(fixtures, pid):
+    return [item['track']['id'] for item in fixtures.playlist_items[pid]]
+
+
+def test_unchanged_playlist_is_read_from_the_cache(spotify, fixtures):
+    transport = spotify.client.sp.transport
+    first = spotify.playlists.get_playlist_tracks("big")
+    calls = transport.calls
+    assert spotify.playlists.get_playlist_tracks("big") == first
+    # Only the header, to learn the current snapshot_id.
+    assert transport.calls - calls == 1
+    spotify.playlists.get_playlist_tracks("big", snapshot_id="big-0")
+    assert transport.calls - calls == 1
+
+
+def test_playlist_changed_elsewhere_is_read_again(spotify, fixtures):
+    spotify.playlists.get_playlist_tracks("big")
+    removed = fixtures.playlist_items["big"].pop(0)
+    fixtures._bump_snapshot("big")
+    tracks = spotify.playlists.get_playlist_tracks("big")
+    assert [t['id'] for t in tracks] == playlist_ids(fixtures, "big")
+    assert removed['track']['id'] != tracks[0]['id']
+    assert spotify.client.playlist_cache.peek("big")[0] == "big-1"
+
+
+def test_own_edits_update_the_cached_contents(spotify, fixtures):
+    spotify.playlists.get_playlist_tracks("big")
+    new = [t for t in fixtures.tracks if t not in set(playlist_ids(fixtures, "big"))][:3]
+    spotify.playlists.add_items("big", new)
+    snapshot, tracks = spotify.client.playlist_cache.peek("big")
+    assert snapshot == fixtures.playlists["big"]['snapshot_id']
+    assert [t['id'] for t in tracks] == playlist_ids(fixtures, "big")
+
+    spotify.playlists.remove_items("big", new[:2])
+    snapshot, tracks = spotify.client.playlist_cache.peek("big")
+    assert snapshot == fixtures.playlists["big"]['snapshot_id']
+    assert [t['id'] for t in tracks] == playlist_ids(fixtures, "big")
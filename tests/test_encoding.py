@@ -0,0 +1,31 @@
+import pytest
+
+from spotify_mcp.encoding import ResponseEncoder
+
+pytest.importorskip("orjson")
+
+PAYLOAD = {
+    'name': "Björk — Jóga",
+    'artists': [{'id': "7w", 'name': "坂本龍一"}, {'id': "x", 'name': "Sigur Rós 🎵"}],
+    'quote': 'say "hi"\n\ttab \\ slash  ',
+    'popularity': 71,
+    'duration_ms': 305000,
+    'ratio': 0.125,
+    'large': 1e+22,
+    'explicit': False,
+    'preview_url': None,
+    'genres': [],
+    'images': {},
+}
+
+
+@pytest.mark.parametrize("format", ["compact", "pretty"])
+def test_backends_produce_the_same_text(format):
+    fast = ResponseEncoder(format, backend='orjson').encode(PAYLOAD)
+    stdlib = ResponseEncoder(format, backend='json').encode(PAYLOAD)
+    assert fast == stdlib
+    assert "Björk" in stdlib and "坂本龍一" in stdlib
+
+
+def test_compact_has_no_whitespace_between_tokens():
+    assert ResponseEncoder('compact', backend='json').encode({'a': [1, 2]}) == '{"a":[1,2]}'
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from spotify_mcp import utils
+from spotify_mcp.tools import GetInfo
+
+
+@pytest.fixture
+def item_fields(fixtures, monkeypatch):
+    """The `fields=` filter of each playlist items page the stand-in answers."""
+    seen = []
+    respond = fixtures.respond
+
+    def record(method, url, payload, params):
+        if url.endswith("/tracks") and params.get('fields', '').startswith("total,items"):
+            seen.append(params['fields'])
+        return respond(method, url, payload, params)
+
+    monkeypatch.setattr(fixtures, "respond", record)
+    return seen
+
+
+def get_info(spotify, **arguments):
+    return json.loads(GetInfo(spotify).get({'action': 'get', **arguments})[0].text)
+
+
+@pytest.mark.parametrize("fields, selector", [
+    (None, utils.PLAYLIST_ITEM_FIELDS),
+    (['name', 'tracks'], "total,items(track(id,name))"),
+    (['id', 'tracks', 'artist'], "total,items(track(id,name,artists(name)))"),
+    (['id', 'name', 'artist', 'is_playable'], utils.PLAYLIST_ITEM_FIELDS),
+])
+def test_playlist_item_fields_keep_only_what_is_projected(fields, selector):
+    assert utils.playlist_item_fields(fields) == selector
+
+
+def test_playlist_pages_request_only_the_projected_fields(spotify, fixtures, item_fields):
+    info = get_info(spotify, item_id="big", qtype="playlist", fields=['name', 'tracks'])
+    assert set(item_fields) == {"total,items(track(id,name))"}
+    assert len(info['tracks']) == len(fixtures.playlist_items["big"])
+    assert info['tracks'][0] == {'name': fixtures.playlist_items["big"][0]['track']['name']}
+
+
+def test_narrowed_playlist_tracks_are_not_cached(spotify, fixtures, item_fields):
+    get_info(spotify, item_id="big", qtype="playlist", fields=['tracks'])
+    assert spotify.client.playlist_cache.peek("big") is None
+    full = get_info(spotify, item_id="big", qtype="playlist")
+    assert item_fields[-1] == utils.PLAYLIST_ITEM_FIELDS
+    assert 'artist' in full['tracks'][0] or 'artists' in full['tracks'][0]
+    assert spotify.client.playlist_cache.peek("big") is not None
@@ -0,0 +1,61 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+import pytest
+from spotipy import SpotifyException
+
+from spotify_mcp.spotify.http import HttpConfig, build_session
+from spotify_mcp.spotify.scheduler import RequestScheduler, ScheduledSpotify
+
+
+@pytest.fixture
+def rate_limited():
+    """Local server answering 429 (Retry-After: 0) to the first request, then 200."""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            status, body = (429, b'{"error": {"status": 429, "message": "slow down"}}') if len(hits) == 1 else (200, b'{"id": "me"}')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/v1/me", hits
+    server.shutdown()
+    server.server_close()
+
+
+def client(scheduler):
+    session = build_session(HttpConfig(warm_up=False))
+    return ScheduledSpotify(auth="token", requests_session=session, scheduler=scheduler)
+
+
+def test_429_reaches_the_scheduler_after_one_request(rate_limited):
+    url, hits = rate_limited
+    with pytest.raises(SpotifyException) as raised:
+        client(RequestScheduler(rate=1000, burst=10, max_retries=0))._get(url)
+    assert raised.value.http_status == 429
+    assert len(hits) == 1
+
+
+def test_scheduler_retries_the_429(rate_limited):
+    url, hits = rate_limited
+    scheduler = RequestScheduler(rate=1000, burst=10, max_retries=1)
+    assert client(scheduler)._get(url) == {'id': "me"}
+    assert len(hits) == 2
+    assert scheduler.retries == 1
+
+
+def test_5xx_retried_only_for_get_and_delete():
+    retry = build_session(HttpConfig(warm_up=False)).get_adapter("https://api.spotify.com/v1/").max_retries
+    assert retry.is_retry("GET", 503) and retry.is_retry("DELETE", 503)
+    assert not retry.is_retry("POST", 503) and not retry.is_retry("PUT", 503)
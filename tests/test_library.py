@@ -0,0 +1,92 @@
+from collections import Counter
+import json
+import sqlite3
+
+import pytest
+
+from spotify_mcp.spotify.library import LibraryIndex
+from spotify_mcp.tools import search as search_tool
+
+
+def indexed_tracks(fixtures):
+    items = [item for items in fixtures.playlist_items.values() for item in items] + fixtures.saved_tracks
+    return {item['track']['id']: item['track'] for item in items}
+
+
+def test_sync_indexes_playlists_saved_tracks_and_albums(spotify, fixtures):
+    stats = spotify.library.sync()
+    assert stats['tracks'] == len(indexed_tracks(fixtures))
+    assert stats['albums'] == len(fixtures.saved_albums)
+    assert stats['playlists'] == len(fixtures.playlists)
+    assert stats['age_seconds'] < 5
+    assert spotify.library.is_synced
+
+
+def test_track_search_matches_word_prefixes(spotify, fixtures):
+    spotify.library.sync()
+    track = next(iter(indexed_tracks(fixtures).values()))
+    query = " ".join(word[:3] for word in track['name'].split())
+    found = spotify.library.search(query, 'track', limit=50)['tracks']
+    assert track['id'] in [t['id'] for t in found]
+    assert spotify.library.search("zzzz-no-such-word", 'track') == {'tracks': []}
+    assert spotify.library.search("  !! ") == {}
+
+
+def test_artists_are_indexed_individually(spotify, fixtures):
+    spotify.library.sync()
+    tracks = indexed_tracks(fixtures)
+    credits = Counter(a['id'] for t in tracks.values() for a in t['artists'])
+    # An artist who shares credits: grouping by the joined credit string would split their count.
+    artist_id = next(a['id'] for t in tracks.values() if len(t['artists']) > 1 for a in t['artists'])
+    name = fixtures.artists[artist_id]['name']
+
+    found = spotify.library.search(name, 'artist', limit=50)['artists']
+    match = next(a for a in found if a['id'] == artist_id)
+    assert match == {'id': artist_id, 'name': name, 'tracks_in_library': credits[artist_id]}
+    assert all(', ' not in a['name'] for a in found)
+
+
+def test_search_returns_one_key_per_type(spotify, fixtures):
+    spotify.library.sync()
+    playlist = fixtures.playlists["big"]
+    album = fixtures.saved_albums[0]['album']
+    results = spotify.library.search(playlist['name'], 'playlist,album')
+    assert set(results) == {'playlists', 'albums'}
+    assert results['playlists'][0]['id'] == "big"
+    assert album['id'] in [a['id'] for a in spotify.library.search(album['name'], 'album', limit=50)['albums']]
+    with pytest.raises(ValueError, match="unknown qtype"):
+        spotify.library.search("x", 'show')
+
+
+def test_library_search_resyncs_once_the_index_is_too_old(spotify, monkeypatch):
+    tool = search_tool.Search(spotify)
+    syncs = []
+    sync = spotify.library.sync
+    monkeypatch.setattr(spotify.library, "sync", lambda: syncs.append(1) or sync())
+
+    def search(**arguments):
+        return json.loads(tool.search({'action': 'search', 'query': "a", 'source': 'library', **arguments})[0].text)
+
+    search()
+    search()
+    assert len(syncs) == 1
+    monkeypatch.setattr(search_tool, "LIBRARY_MAX_AGE", -1)
+    assert search()['index']['age_seconds'] < 5
+    assert len(syncs) == 2
+    monkeypatch.setattr(search_tool, "LIBRARY_MAX_AGE", 3600)
+    search(refresh=True)
+    assert len(syncs) == 3
+
+
+def test_index_from_an_older_schema_counts_as_unsynced(spotify, tmp_path):
+    path = str(tmp_path / "library.db")
+    db = sqlite3.connect(path)
+    db.executescript("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT); INSERT INTO meta VALUES ('synced_at', '1');")
+    db.commit()
+    db.close()
+    library = LibraryIndex(spotify.client, spotify.playlists, path=path)
+    try:
+        assert not library.is_synced
+        assert library.sync()['tracks'] > 0
+    finally:
+        library.close()
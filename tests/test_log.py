@@ -0,0 +1,128 @@
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from spotify_mcp import log
+from spotify_mcp.log import DeferredQueueHandler, SamplingFilter
+
+
+def record(msg="fetched %d items", level=logging.INFO, name="spotify_mcp.spotify", args=(1,)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture
+def restore_loggers():
+    names = [log.ROOT, "mcp", "spotify_mcp.spotify.scheduler", "spotify_mcp.tools"]
+    saved = [(logging.getLogger(n), logging.getLogger(n).handlers, logging.getLogger(n).propagate, logging.getLogger(n).level) for n in names]
+    yield
+    for logger, handlers, propagate, level in saved:
+        logger.handlers, logger.propagate = handlers, propagate
+        logger.setLevel(level)
+
+
+def test_logger_names():
+    assert log.get_logger("spotify.scheduler").name == "spotify_mcp.spotify.scheduler"
+    assert log.get_logger("mcp.server").name == "mcp.server"
+    assert log.get_logger("spotify_mcp.tools").name == "spotify_mcp.tools"
+
+
+def test_parse_levels():
+    assert log._parse_levels(" spotify.scheduler=DEBUG, tools=info,,bad") == {'spotify.scheduler': 'DEBUG', 'tools': 'info'}
+
+
+def test_sampling_limits_each_template_per_second():
+    sampler = SamplingFilter(per_second=3)
+    passed = [sampler.filter(record(args=(i,))) for i in range(5)]
+    assert passed == [True, True, True, False, False]
+    # Another template, and warnings, are not held back by the first one.
+    assert sampler.filter(record("other"))
+    assert sampler.filter(record(level=logging.WARNING))
+
+
+def test_sampling_reports_suppressed_count_in_next_window():
+    sampler = SamplingFilter(per_second=1)
+    assert sampler.filter(record())
+    assert not sampler.filter(record())
+    assert not sampler.filter(record())
+    # Move the window into the past instead of waiting a second.
+    sampler._windows[("spotify_mcp.spotify", "fetched %d items")][0] -= 1
+    next_window = record()
+    assert sampler.filter(next_window)
+    assert next_window.suppressed == 2
+
+
+def test_sampling_disabled():
+    sampler = SamplingFilter(per_second=0)
+    assert all(sampler.filter(record()) for _ in range(100))
+
+
+def test_sampling_table_is_bounded(monkeypatch):
+    monkeypatch.setattr(log, "MAX_SAMPLED_KEYS", 4)
+    sampler = SamplingFilter(per_second=1)
+    for i in range(10):
+        sampler.filter(record(f"template {i}"))
+    assert len(sampler._windows) <= 4
+
+
+def test_deferred_handler_leaves_formatting_to_the_writer():
+    records = queue.SimpleQueue()
+    handler = DeferredQueueHandler(records)
+    try:
+        raise KeyError("boom")
+    except KeyError:
+        failed = logging.LogRecord("spotify_mcp.tools", logging.ERROR, __file__, 1, "call %s failed", ("x",), None)
+        failed.exc_info = sys.exc_info()
+    handler.handle(failed)
+    queued = records.get_nowait()
+    assert queued is failed
+    assert queued.args == ("x",)
+    assert queued.exc_info is not None
+    assert not hasattr(queued, 'message')
+
+
+def test_configure_per_subsystem_levels_and_json(tmp_path, restore_loggers):
+    path = tmp_path / "server.log"
+    listener = log.configure(
+        level="WARNING", levels={'spotify.scheduler': 'debug'}, path=str(path), format="json", sample_rate=0
+    )
+    try:
+        log.get_logger("spotify.scheduler").debug("waited %.1f s", 0.5, extra={'endpoint': 'GET me'})
+        log.get_logger("tools").info("not logged below WARNING")
+        try:
+            raise KeyError("boom")
+        except KeyError:
+            log.get_logger("server").error("Tool failed", exc_info=True)
+    finally:
+        listener.stop()
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e['message'] for e in entries] == ["waited 0.5 s", "Tool failed"]
+    assert entries[0]['logger'] == "spotify_mcp.spotify.scheduler"
+    assert entries[0]['level'] == "DEBUG"
+    assert entries[0]['endpoint'] == "GET me"
+    assert "KeyError: 'boom'" in entries[1]['exc']
+
+
+def test_configure_text_format_and_env(tmp_path, monkeypatch, restore_loggers):
+    path = tmp_path / "server.log"
+    monkeypatch.setenv("SPOTIFY_MCP_LOG_LEVEL", "info")
+    monkeypatch.setenv("SPOTIFY_MCP_LOG_LEVELS", "tools=ERROR")
+    monkeypatch.setenv("SPOTIFY_MCP_LOG_FILE", str(path))
+    monkeypatch.setenv("SPOTIFY_MCP_LOG_FORMAT", "text")
+    listener = log.configure()
+    try:
+        log.get_logger("server").info("Starting")
+        log.get_logger("tools").warning("below the tools override")
+    finally:
+        listener.stop()
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1
+    assert lines[0].endswith("INFO spotify_mcp.server: Starting")
+
+
+def test_configure_rejects_unknown_format(restore_loggers):
+    with pytest.raises(ValueError):
+        log.configure(format="xml")
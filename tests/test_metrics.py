@@ -0,0 +1,147 @@
+import asyncio
+import json
+
+import pytest
+from pydantic import AnyUrl
+
+from spotify_mcp import server
+from spotify_mcp.metrics import BUCKETS, Histogram, Metrics, StatsDumper, metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def read_stats():
+    return json.loads(asyncio.run(server.handle_read_resource(AnyUrl(server.STATS_URI))))
+
+
+class Failed(Exception):
+    http_status = 429
+
+
+def test_histogram_percentiles_within_a_bucket():
+    histogram = Histogram()
+    for value in range(1, 1001):
+        histogram.record(float(value))
+    for q, exact in [(0.50, 500), (0.95, 950), (0.99, 990)]:
+        assert exact <= histogram.percentile(q) <= exact * 1.12
+    assert histogram.summary()['max'] == 1000
+    assert histogram.summary()['count'] == 1000
+    assert histogram.summary()['mean'] == 500.5
+
+
+def test_histogram_percentiles_never_exceed_max():
+    histogram = Histogram()
+    histogram.record(3.0)
+    assert histogram.percentile(0.99) == 3.0
+    histogram.record(BUCKETS[-1] * 10)
+    assert histogram.percentile(0.99) == BUCKETS[-1] * 10
+
+
+def test_empty_histogram():
+    assert Histogram().summary() == {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+
+
+def test_tool_call_records_latency_upstream_and_bytes():
+    m = Metrics()
+    with m.tool_call("SpotifyQueue.get") as call:
+        m.upstream("GET me/player/queue", 0.02)
+        m.upstream("GET me/player/queue", 0.03, error=Failed())
+        m.received("GET me/player/queue", 512)
+    assert (call.upstream, call.bytes) == (2, 512)
+
+    snapshot = m.snapshot()
+    tool = snapshot['tools']['SpotifyQueue.get']
+    assert tool['latency_ms']['count'] == 1
+    assert tool['upstream_per_call']['max'] == 2
+    assert tool['bytes_received'] == 512
+    assert tool['errors'] == 0
+    endpoint = snapshot['endpoints']['GET me/player/queue']
+    assert endpoint['latency_ms']['count'] == 2
+    assert 30 <= endpoint['latency_ms']['max'] <= 30 * 1.12
+    assert endpoint['errors'] == 1
+    assert snapshot['errors'] == {'Failed 429': 1}
+
+
+def test_tool_call_counts_raised_and_handled_errors():
+    m = Metrics()
+    with pytest.raises(KeyError):
+        with m.tool_call("SpotifySearch.get"):
+            raise KeyError("boom")
+    with m.tool_call("SpotifySearch.get") as call:
+        call.fail(Failed())
+    assert m.snapshot()['tools']['SpotifySearch.get']['errors'] == 2
+    assert m.snapshot()['errors'] == {'KeyError': 1, 'Failed 429': 1}
+
+
+def test_tool_call_renamed_inside_the_block():
+    m = Metrics()
+    with m.tool_call("SpotifyQueue") as call:
+        call.name = "SpotifyQueue.get"
+    assert list(m.snapshot()['tools']) == ["SpotifyQueue.get"]
+
+
+def test_upstream_outside_a_tool_call_is_counted_per_endpoint_only():
+    m = Metrics()
+    m.upstream("GET me", 0.01)
+    snapshot = m.snapshot()
+    assert snapshot['tools'] == {}
+    assert snapshot['endpoints']['GET me']['latency_ms']['count'] == 1
+
+
+def test_client_requests_are_attributed_to_the_tool_call(spotify):
+    with metrics.tool_call("SpotifyPlayback.get") as call:
+        spotify.playback.get_current_track()
+    assert call.upstream == 1
+    snapshot = metrics.snapshot()
+    assert snapshot['tools']['SpotifyPlayback.get']['upstream_per_call']['max'] == 1
+    assert snapshot['endpoints']['GET me/player']['latency_ms']['count'] == 1
+
+
+def test_reset_clears_everything():
+    m = Metrics()
+    with m.tool_call("SpotifyQueue.get") as call:
+        call.fail(Failed())
+    m.upstream("GET me", 0.01)
+    m.reset()
+    snapshot = m.snapshot()
+    assert (snapshot['tools'], snapshot['endpoints'], snapshot['errors']) == ({}, {}, {})
+
+
+def test_stats_resource_reports_tool_calls_and_reset():
+    asyncio.run(server.handle_call_tool("SpotifyNope", {"action": "get"}))
+    stats = read_stats()
+    assert stats['tools']['unknown']['errors'] == 1
+    assert stats['errors'] == {'InvalidToolCall': 1}
+    assert stats['clients']['max'] == server.pool.max_clients
+
+    result = asyncio.run(server.handle_call_tool("SpotifyStats", {"action": "reset"}))
+    assert result[0].text == "Statistics reset."
+    # Only the reset call itself, recorded as it finished.
+    assert list(read_stats()['tools']) == ["SpotifyStats.reset"]
+
+
+def test_unknown_resource_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(server.handle_read_resource(AnyUrl("spotify-mcp://nope")))
+
+
+def test_stats_dumper_writes_json(tmp_path):
+    path = tmp_path / "stats.json"
+    dumper = StatsDumper(str(path), lambda: {'tools': {'SpotifyQueue.get': 1}}, interval=60)
+    dumper.dump()
+    assert json.loads(path.read_text()) == {'tools': {'SpotifyQueue.get': 1}}
+    assert not (tmp_path / "stats.json.tmp").exists()
+
+
+def test_stats_dumper_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("SPOTIFY_MCP_STATS_FILE", raising=False)
+    assert StatsDumper.from_env(dict) is None
+    monkeypatch.setenv("SPOTIFY_MCP_STATS_FILE", str(tmp_path / "stats.json"))
+    monkeypatch.setenv("SPOTIFY_MCP_STATS_INTERVAL", "5")
+    dumper = StatsDumper.from_env(dict)
+    assert (dumper.path, dumper.interval) == (str(tmp_path / "stats.json"), 5.0)
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from spotify_mcp.spotify.pagination import paginate
+
+
+class Pages:
+    """A paging endpoint over `total` numbered items that records its requests and concurrency."""
+
+    def __init__(self, total, delay=lambda offset: 0.0):
+        self.total = total
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, offset, limit):
+        with self._lock:
+            self.requests.append((offset, limit))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay(offset))
+        with self._lock:
+            self.in_flight -= 1
+        return {'total': self.total, 'items': [{'n': n} for n in range(offset, min(offset + limit, self.total))]}
+
+
+@pytest.fixture
+def fanout(spotify):
+    return spotify.client.fanout
+
+
+def test_items_come_out_in_order_whatever_order_pages_arrive(fanout):
+    # Later pages answer first.
+    pages = Pages(1000, delay=lambda offset: 0.02 - offset / 100_000)
+    items = list(paginate(pages, lambda item: item, fanout, page_size=50, max_concurrency=8))
+    assert [item['n'] for item in items] == list(range(1000))
+    assert sorted(pages.requests) == [(offset, 50) for offset in range(0, 1000, 50)]
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_pages_in_flight_never_exceed_max_concurrency(fanout, max_concurrency):
+    pages = Pages(500, delay=lambda offset: 0.005)
+    assert len(list(paginate(pages, lambda item: item, fanout, page_size=20, max_concurrency=max_concurrency))) == 500
+    assert pages.max_in_flight == max_concurrency
+
+
+def test_max_items_trims_the_requests(fanout):
+    pages = Pages(1000)
+    items = list(paginate(pages, lambda item: item, fanout, page_size=50, max_items=120))
+    assert [item['n'] for item in items] == list(range(120))
+    assert sorted(pages.requests) == [(0, 50), (50, 50), (100, 20)]
+    pages = Pages(1000)
+    assert len(list(paginate(pages, lambda item: item, fanout, page_size=50, max_items=30))) == 30
+    assert pages.requests == [(0, 30)]
+
+
+def test_null_items_and_falsy_parses_are_skipped(fanout):
+    page = {'total': 4, 'items': [{'n': 1}, None, {'n': 0}, {'n': 3}]}
+    assert list(paginate(lambda offset, limit: page, lambda item: item['n'], fanout)) == [1, 3]
+    assert list(paginate(lambda offset, limit: {}, lambda item: item, fanout)) == []
+
+
+def test_playlist_tracks_keep_playlist_order(spotify, fixtures):
+    expected = [item['track']['id'] for item in fixtures.playlist_items["big"]]
+    assert [t['id'] for t in spotify.playlists.iter_playlist_tracks("big")] == expected
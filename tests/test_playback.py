@@ -0,0 +1,115 @@
+import pytest
+
+from spotify_mcp.tools import Playback
+
+
+@pytest.fixture
+def playlist(fixtures):
+    """A 12-track playlist now playing from its first track, with its 6th track repeated at 3."""
+    tracks = list(fixtures.tracks.values())[:11]
+    tracks.insert(3, tracks[6])
+    fixtures._add_playlist("dupes", "Dupes", tracks)
+    fixtures.player['context'] = {'type': "playlist", 'uri': "spotify:playlist:dupes"}
+    fixtures.player['item'] = tracks[0]
+    fixtures.queue[:] = tracks[1:]
+    return tracks
+
+
+def test_jump_lands_on_position_when_target_repeats(spotify, fixtures, playlist):
+    result = spotify.playback.skip_track(7)
+    assert result['method'] == 'jump'
+    assert fixtures.player['item'] is playlist[7]
+    assert fixtures.queue[0] is playlist[8]
+
+
+def test_manually_queued_track_falls_back_to_next(spotify, fixtures, playlist):
+    fixtures.queue.insert(0, playlist[10])
+    result = spotify.playback.skip_track(7)
+    assert result['method'] == 'next'
+    assert fixtures.player['item'] is playlist[6]
+
+
+def test_current_track_repeated_falls_back_to_next(spotify, fixtures, playlist):
+    fixtures.player['item'] = playlist[3]
+    fixtures.queue[:] = playlist[4:]
+    assert spotify.playback.skip_track(5)['method'] == 'next'
+
+
+def test_skip_with_null_count_skips_once(spotify, fixtures, playlist):
+    text = Playback(spotify).skip({'action': "skip", 'num_skips': None})[0].text
+    assert text.startswith("Skipped 1 track(s)")
+    assert fixtures.player['item'] is playlist[1]
+
+
+def upstream_calls(spotify):
+    return spotify.client.sp.transport.calls
+
+
+@pytest.mark.parametrize("warm", [False, True])
+def test_jump_abandoned_on_a_long_context_costs_at_most_n(spotify, fixtures, warm):
+    # 'big' has 300 tracks: three pages, more than skipping 5 can pay for.
+    assert fixtures.player['context']['uri'] == "spotify:playlist:big"
+    if warm:
+        spotify.playlists.get_playlist_tracks("big")
+        spotify.playback.snapshot.get()
+    before = upstream_calls(spotify)
+    result = spotify.playback.skip_track(5)
+    spent = upstream_calls(spotify) - before
+    assert result['method'] == 'next'
+    assert spent == result['requests']
+    # Cold, the playback state and the first page (which tells the length) are unavoidable.
+    assert spent == (5 if warm else 5 + 2)
+    assert fixtures.player['item'] is fixtures.playlist_items["big"][5]['track']
+
+
+def test_shuffle_falls_back_without_reading_the_context(spotify, fixtures, playlist):
+    fixtures.player['shuffle_state'] = True
+    spotify.playback.snapshot.get()
+    before = upstream_calls(spotify)
+    assert spotify.playback.skip_track(7)['method'] == 'next'
+    assert upstream_calls(spotify) - before == 7
+
+
+def age(snapshot, seconds):
+    """Pretend the snapshot was fetched `seconds` earlier."""
+    snapshot._fetched_at -= seconds
+
+
+def test_calls_within_the_ttl_share_one_state_fetch(spotify):
+    transport = spotify.client.sp.transport
+    before = transport.calls
+    spotify.playback.get_current_track()
+    spotify.playback.start_playback()  # already playing: only reads the state
+    assert spotify.playback.is_track_playing()
+    assert transport.calls - before == 1
+
+
+def test_state_is_refetched_after_the_ttl(spotify, fixtures):
+    snapshot = spotify.playback.snapshot
+    assert snapshot.get()['is_playing']
+    # The stand-in serves the player dict itself, so replace it rather than edit it.
+    fixtures.player = {**fixtures.player, 'is_playing': False}
+    age(snapshot, snapshot.ttl / 2)
+    assert snapshot.peek()['is_playing']
+    age(snapshot, snapshot.ttl)
+    assert snapshot.peek() is None
+    assert not snapshot.get()['is_playing']
+
+
+def test_playback_changes_invalidate_the_state(spotify, fixtures):
+    assert spotify.playback.get_current_track()['id'] == fixtures.player['item']['id']
+    spotify.playback.pause_playback()
+    assert spotify.playback.snapshot.peek() is None
+    assert spotify.playback.get_current_track()['is_playing'] is False
+    upcoming = fixtures.queue[0]['id']
+    spotify.playback.skip_track()
+    assert spotify.playback.get_current_track()['id'] == upcoming
+
+
+def test_queue_takes_is_playing_from_a_fresh_state_only(spotify):
+    transport = spotify.client.sp.transport
+    before = transport.calls
+    assert 'is_playing' not in spotify.playback.get_queue()['currently_playing']
+    spotify.playback.snapshot.get()
+    assert spotify.playback.get_queue()['currently_playing']['is_playing'] is True
+    assert transport.calls - before == 3
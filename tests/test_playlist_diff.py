@@ -0,0 +1,132 @@
+import random
+
+import pytest
+
+from spotify_mcp.spotify.playlist_diff import WRITE_LIMIT, SyncPlan, chunks, plan_sync
+
+
+def apply(current, plan: SyncPlan):
+    """Run a plan the way Spotify applies each request; returns the result and the request count."""
+    if plan.replace is not None:
+        result = plan.replace[:WRITE_LIMIT]
+        for chunk in chunks(plan.replace[WRITE_LIMIT:]):
+            result = result + chunk
+        return result, len(chunks(plan.replace)) or 1
+    result, requests = list(current), 0
+    for chunk in chunks(plan.remove):
+        removed = set(chunk)
+        result = [i for i in result if i not in removed]
+        requests += 1
+    for start, before, length in plan.moves:
+        block = result[start:start + length]
+        del result[start:start + length]
+        at = before if before < start else before - length
+        result[at:at] = block
+        requests += 1
+    for position, ids in plan.inserts:
+        assert len(ids) <= WRITE_LIMIT
+        result[position:position] = ids
+        requests += 1
+    return result, requests
+
+
+def ids(n, prefix="t"):
+    return [f"{prefix}{i}" for i in range(n)]
+
+
+def check(current, target):
+    plan = plan_sync(current, target)
+    result, requests = apply(current, plan)
+    assert result == target
+    assert requests == plan.requests
+    return plan
+
+
+def test_chunks():
+    assert chunks([]) == []
+    assert chunks(ids(250)) == [ids(250)[:100], ids(250)[100:200], ids(250)[200:]]
+    assert chunks(ids(3), size=2) == [["t0", "t1"], ["t2"]]
+
+
+def test_no_op():
+    plan = check(ids(500), ids(500))
+    assert plan.requests == 0
+
+
+def test_pure_reorder_moves_one_range():
+    current = ids(300)
+    target = current[:10] + current[50:60] + current[10:50] + current[60:]
+    plan = check(current, target)
+    assert not plan.remove and not plan.inserts and plan.replace is None
+    assert len(plan.moves) == 1
+
+
+def test_surplus_copies_are_removed_and_the_wanted_one_reinserted():
+    target = ids(150)
+    current = target[:50] + ["t5"] + target[50:100] + ["t5"] + target[100:]
+    plan = check(current, target)
+    assert plan.remove == ["t5"]
+    assert plan.inserts == [(5, ["t5"])]
+
+
+def test_added_copy_is_inserted():
+    current = ids(150)
+    plan = check(current, current[:100] + ["t5"] + current[100:])
+    assert not plan.remove and plan.inserts == [(100, ["t5"])]
+
+
+def test_small_playlists_are_replaced():
+    plan = check(["a", "b", "a", "c", "a"], ["a", "b", "c"])
+    assert plan.replace == ["a", "b", "c"]
+
+
+def test_inserts_past_the_write_limit_are_chunked():
+    current = ids(400)
+    target = current[:200] + ids(250, "new") + current[200:]
+    plan = check(current, target)
+    assert [len(chunk) for _, chunk in plan.inserts] == [100, 100, 50]
+
+
+def test_replace_fallback_when_patching_costs_more():
+    current = ids(150)
+    target = list(reversed(current))
+    plan = check(current, target)
+    assert plan.replace == target
+    assert plan.requests == 2
+
+
+def test_empty_target_replaces_with_nothing():
+    plan = check(ids(5), [])
+    assert plan.requests == 1
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_random_edits(seed):
+    rng = random.Random(seed)
+    pool = ids(60)
+    current = [rng.choice(pool) for _ in range(rng.randint(0, 250))]
+    target = list(current)
+    for _ in range(rng.randint(0, 8)):
+        edit = rng.choice(("insert", "delete", "move"))
+        if edit == "insert":
+            position = rng.randint(0, len(target))
+            target[position:position] = [rng.choice(pool) for _ in range(rng.randint(1, 120))]
+        elif target:
+            start = rng.randrange(len(target))
+            block = target[start:start + rng.randint(1, 20)]
+            del target[start:start + len(block)]
+            if edit == "move":
+                position = rng.randint(0, len(target))
+                target[position:position] = block
+    plan = check(current, target)
+    assert plan.requests <= max(1, len(chunks(target)))
+
+
+def test_sync_items_against_the_stand_in(spotify, fixtures):
+    current = [item['track']['id'] for item in fixtures.playlist_items['big']]
+    extra = next(t for t in fixtures.tracks if t not in set(current))
+    target = current[:40] + current[45:200] + [current[40]] + current[200:250] + [extra] + current[250:]
+    summary = spotify.playlists.sync_items("big", target)
+    assert [item['track']['id'] for item in fixtures.playlist_items['big']] == target
+    assert summary['requests'] == 3 and not summary['replaced']
+    assert [t['id'] for t in spotify.playlists.get_playlist_tracks("big")] == target
@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+
+import pytest
+
+from spotify_mcp.spotify.pool import DEFAULT_USER, ClientPool, PooledSpotify, UserNotAuthorized
+
+
+def authorize(token_dir, *users):
+    for user in users:
+        (token_dir / f"{user}.json").write_text(json.dumps({
+            "access_token": f"token-{user}",
+            "token_type": "Bearer",
+            "refresh_token": f"refresh-{user}",
+            "expires_at": time.time() + 3600,
+        }))
+
+
+@pytest.fixture
+def pool(tmp_path):
+    authorize(tmp_path, "alice", "bob", "carol")
+    pool = ClientPool(max_clients=2, idle_timeout=3600, token_dir=str(tmp_path), acquire_timeout=0.2)
+    yield pool
+    pool.close()
+
+
+def open_users(pool):
+    return list(pool._entries)
+
+
+def test_least_recently_used_idle_client_is_evicted(pool):
+    with pool.acquire("alice"):
+        pass
+    with pool.acquire("bob"):
+        pass
+    with pool.acquire("alice"):
+        pass
+    with pool.acquire("carol"):
+        pass
+    assert open_users(pool) == ["alice", "carol"]
+    assert pool.stats()['clients'] == {'open': 2, 'in_use': 0, 'max': 2, 'opened': 3, 'evicted': 1}
+
+
+def test_idle_clients_expire(pool):
+    pool.idle_timeout = 0
+    with pool.acquire("alice"):
+        pass
+    with pool.acquire("bob"):
+        assert open_users(pool) == ["bob"]
+
+
+def test_client_in_use_is_never_evicted(pool):
+    with pool.acquire("alice") as alice, pool.acquire("bob"):
+        with pytest.raises(RuntimeError, match="All 2 Spotify clients are busy"):
+            with pool.acquire("carol"):
+                pass
+        assert open_users(pool) == ["alice", "bob"]
+        assert pool._entries["alice"].spotify is alice
+
+
+def test_busy_pool_waits_for_a_release(pool):
+    pool.acquire_timeout = 5
+    acquired = threading.Event()
+
+    def hold():
+        with pool.acquire("alice"), pool.acquire("bob"):
+            acquired.set()
+            time.sleep(0.1)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    acquired.wait()
+    with pool.acquire("carol"):
+        assert "carol" in open_users(pool)
+    holder.join()
+
+
+def test_users_get_their_own_token_cache_and_library(pool, tmp_path, monkeypatch):
+    monkeypatch.setenv("SPOTIFY_MCP_LIBRARY_DB", str(tmp_path / "library.db"))
+    with pool.acquire("alice") as alice, pool.acquire("bob") as bob:
+        assert alice is not bob
+        assert alice._cache_path == str(tmp_path / "alice.json")
+        assert bob._cache_path == str(tmp_path / "bob.json")
+        assert alice._library_path == str(tmp_path / "library-alice.db")
+        assert bob._library_path == str(tmp_path / "library-bob.db")
+        assert alice._shared is bob._shared
+
+
+def test_default_user_keeps_the_single_user_files(pool):
+    with pool.acquire() as spotify:
+        assert spotify._cache_path is None
+        assert spotify._library_path is None
+    assert open_users(pool) == [DEFAULT_USER]
+
+
+def test_cache_path_without_token_dir():
+    assert ClientPool(token_dir="").cache_path("alice") == ".cache-alice"
+
+
+@pytest.mark.parametrize("user", ["", "../alice", "alice/bob", "a b", "x" * 129])
+def test_invalid_user_keys_are_rejected(pool, user):
+    with pytest.raises(ValueError, match="Invalid Spotify user key"):
+        with pool.acquire(user):
+            pass
+    assert open_users(pool) == []
+
+
+def test_user_without_token_is_not_authorized(pool, tmp_path):
+    with pytest.raises(UserNotAuthorized, match="'dave' is not authorized"):
+        with pool.acquire("dave"):
+            pass
+    assert open_users(pool) == []
+    assert pool.stats()['clients']['opened'] == 0
+
+
+def test_expired_token_without_refresh_token_is_not_authorized(pool, tmp_path):
+    (tmp_path / "dave.json").write_text(json.dumps({"access_token": "old", "expires_at": time.time() - 60}))
+    assert not pool.authorized("dave")
+    authorize(tmp_path, "dave")
+    assert pool.authorized("dave")
+
+
+def test_pooled_spotify_forwards_to_the_bound_user(pool):
+    pooled = PooledSpotify(pool)
+    with pytest.raises(RuntimeError, match="No Spotify user is bound"):
+        pooled.playback
+    with pool.bind("alice") as alice:
+        assert pooled.current is alice
+    assert not pooled.loaded
@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+
+def test_recommends_from_playlists_sharing_the_seed(spotify, fixtures):
+    seed = fixtures.playlist_items['big'][0]['track']['id']
+    tracks = spotify.search.recommendations(tracks=[seed], limit=5)['tracks']
+    assert tracks and seed not in [t['id'] for t in tracks]
+
+
+def test_failed_artist_lookup_is_not_repeated_until_update(spotify):
+    index = spotify.search.recommender
+    index.update()
+    looked_up = []
+    lookup = index.lookup_artists
+
+    def counting(ids):
+        looked_up.append(list(ids))
+        return lookup(ids)
+
+    index.lookup_artists = counting
+    for _ in range(2):
+        assert index.recommend(artists=["0000000000000000000000"]) is None
+    assert looked_up == [["0000000000000000000000"]]
+
+    index.update()
+    index.recommend(artists=["0000000000000000000000"])
+    assert len(looked_up) == 2
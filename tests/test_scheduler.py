@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+from spotipy import SpotifyException
+
+from spotify_mcp.spotify.scheduler import Priority, RequestScheduler
+
+
+def rate_limited(retry_after=None):
+    return SpotifyException(429, -1, "slow down", headers={'Retry-After': retry_after} if retry_after is not None else {})
+
+
+def test_burst_is_free_then_requests_are_paced():
+    scheduler = RequestScheduler(rate=50, burst=5)
+    assert all(scheduler.acquire() < 0.005 for _ in range(5))
+    assert scheduler.acquire() == pytest.approx(1 / 50, abs=0.01)
+    assert scheduler.stats()['throttled'] == 1
+
+
+def test_waiting_requests_are_released_by_priority():
+    scheduler = RequestScheduler(rate=1000, burst=1)
+    scheduler.block(0.1)
+    order = []
+
+    def send(priority):
+        scheduler.acquire(priority)
+        order.append(priority)
+
+    threads = []
+    for priority in (Priority.BULK, Priority.METADATA, Priority.PLAYBACK):
+        threads.append(threading.Thread(target=send, args=(priority,)))
+        threads[-1].start()
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join()
+    assert order == [Priority.PLAYBACK, Priority.METADATA, Priority.BULK]
+
+
+def test_429_blocks_the_bucket_for_retry_after_and_retries():
+    scheduler = RequestScheduler(rate=1000, burst=10)
+    attempts = []
+
+    def send():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise rate_limited("0.1")
+        return "ok"
+
+    assert scheduler.run(Priority.METADATA, send) == "ok"
+    assert attempts[1] - attempts[0] >= 0.1
+    assert scheduler.retries == 1
+
+
+def test_429_gives_up_after_max_retries():
+    scheduler = RequestScheduler(rate=1000, burst=10, max_retries=2)
+    calls = []
+
+    def send():
+        calls.append(1)
+        raise rate_limited("0")
+
+    with pytest.raises(SpotifyException):
+        scheduler.run(Priority.METADATA, send)
+    assert len(calls) == 3
+
+
+def test_429_longer_than_max_wait_fails_fast():
+    scheduler = RequestScheduler(rate=1000, burst=10, max_wait=1)
+    started = time.monotonic()
+
+    def send():
+        raise rate_limited("120")
+
+    with pytest.raises(SpotifyException):
+        scheduler.run(Priority.METADATA, send)
+    # Later requests fail at once too instead of queueing behind the block.
+    with pytest.raises(SpotifyException) as raised:
+        scheduler.acquire()
+    assert raised.value.http_status == 429
+    assert time.monotonic() - started < 0.5
+
+
+def test_other_errors_are_not_retried():
+    scheduler = RequestScheduler(rate=1000, burst=10)
+    calls = []
+
+    def send():
+        calls.append(1)
+        raise SpotifyException(404, -1, "not found")
+
+    with pytest.raises(SpotifyException):
+        scheduler.run(Priority.METADATA, send)
+    assert calls == [1]
+
+
+@pytest.mark.parametrize("attempt", [0, 1, 2])
+def test_backoff_without_retry_after_is_exponential_with_jitter(attempt):
+    delay = RequestScheduler(rate=1000, burst=10).backoff(rate_limited(), attempt)
+    assert 2 ** attempt <= delay <= 2 ** attempt * 1.25
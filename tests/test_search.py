@@ -0,0 +1,105 @@
+import threading
+from urllib.parse import parse_qs
+
+import pytest
+from spotipy import SpotifyException
+
+from spotify_mcp.spotify import Spotify
+from spotify_mcp.spotify.replay import FixtureSet
+
+from conftest import offline_client
+
+
+def test_batch_playlist_info_with_paged_tracks_does_not_deadlock():
+    fixtures = FixtureSet.synthetic(playlist_size=100, playlists=0)
+    tracks = list(fixtures.tracks.values())
+    ids = [f"long{n}" for n in range(10)]
+    for n, pid in enumerate(ids):
+        fixtures._add_playlist(pid, f"Long {n}", tracks[n:n + 250])
+    spotify = Spotify(client=offline_client(fixtures, latency=0.002))
+    result = []
+    worker = threading.Thread(target=lambda: result.append(spotify.search.get_info_batch(ids, 'playlist')), daemon=True)
+    worker.start()
+    worker.join(timeout=20)
+    try:
+        assert result, "get_info_batch did not return"
+        assert [len(info['tracks']) for info in result[0]] == [250] * 10
+    finally:
+        if result:
+            spotify.close()
+
+
+def multi_get(url):
+    """('tracks', [ids]) for a multi-get URL such as 'tracks/?ids=a,b'; None for other requests."""
+    path, _, query = url.partition('?')
+    ids = parse_qs(query).get('ids')
+    return (path.strip('/').rsplit('/', 1)[-1], ids[0].split(',')) if ids else None
+
+
+@pytest.fixture
+def requests(fixtures, monkeypatch):
+    """The (path, ids) of each multi-get the stand-in answers."""
+    seen = []
+    respond = fixtures.respond
+
+    def record(method, url, payload, params):
+        if request := multi_get(url):
+            seen.append(request)
+        return respond(method, url, payload, params)
+
+    monkeypatch.setattr(fixtures, "respond", record)
+    return seen
+
+
+@pytest.mark.parametrize("qtype, endpoint, size", [('track', 'tracks', 50), ('album', 'albums', 20), ('artist', 'artists', 50)])
+def test_batch_lookups_are_chunked_at_the_endpoint_limit(spotify, fixtures, requests, qtype, endpoint, size):
+    catalog = {'track': fixtures.tracks, 'album': fixtures.albums, 'artist': fixtures.artists}[qtype]
+    known = list(catalog)[:size * 2]
+    ids = known + [f"missing{n}" for n in range(size * 2 + 1 - len(known))]
+
+    result = spotify.search.get_info_batch(ids + ids[:3], qtype)
+
+    assert [info['id'] for info in result] == ids + ids[:3]
+    assert [info['id'] for info in result if 'error' not in info] == known + known[:3]
+    assert sorted(len(chunk) for path, chunk in requests) == [1, size, size]
+    assert {path for path, _ in requests} == {endpoint}
+    assert sorted(i for _, chunk in requests for i in chunk) == sorted(ids)
+
+
+def test_batch_artists_leave_out_what_only_get_info_fills_in(spotify, fixtures):
+    artist_id = next(iter(fixtures.artists))
+    [artist] = spotify.search.get_info_batch([artist_id], 'artist')
+    assert artist['id'] == artist_id
+    assert 'top_tracks' not in artist and 'albums' not in artist
+
+
+def test_batch_marks_ids_of_a_not_found_chunk(spotify, fixtures, monkeypatch):
+    ids = list(fixtures.tracks)[:60]
+    respond = fixtures.respond
+
+    def fail_second_chunk(method, url, payload, params):
+        if multi_get(url)[1][0] == ids[50]:
+            raise SpotifyException(400, -1, f"{url}:\n Invalid base62 id", reason="Bad Request")
+        return respond(method, url, payload, params)
+
+    monkeypatch.setattr(fixtures, "respond", fail_second_chunk)
+    result = spotify.search.get_info_batch(ids, 'track')
+    assert [info['id'] for info in result[:50]] == ids[:50]
+    assert 'error' not in result[0]
+    assert result[50:] == [{'id': i, 'error': 'not found'} for i in ids[50:]]
+
+
+def test_batch_raises_other_spotify_errors(fixtures):
+    spotify = Spotify(client=offline_client(fixtures, error_rate=1, error_status=503))
+    try:
+        with pytest.raises(SpotifyException) as failure:
+            spotify.search.get_info_batch(list(fixtures.tracks)[:3], 'track')
+        assert failure.value.http_status == 503
+    finally:
+        spotify.close()
+
+
+def test_batch_rejects_unknown_qtype_before_any_request(spotify, requests):
+    with pytest.raises(ValueError, match="unknown qtype show"):
+        spotify.search.get_info_batch(["x"], 'show')
+    assert requests == []
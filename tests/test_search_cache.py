@@ -0,0 +1,97 @@
+import threading
+import time
+
+from spotify_mcp import utils
+from spotify_mcp.spotify.cache import SearchCache
+
+
+def track(n):
+    return {'id': f"t{n}", 'name': f"Track {n}", 'artists': [{'id': "a", 'name': "Artist"}]}
+
+
+def page(items, next_url):
+    return {'tracks': {'items': items, 'next': next_url, 'total': 100}}
+
+
+def test_full_page_with_null_items_is_not_complete():
+    cache, calls = SearchCache(), []
+
+    def fetch(limit):
+        calls.append(limit)
+        return page([track(n) if n % 4 else None for n in range(limit)], "https://api.spotify.com/v1/search?offset=10")
+
+    key = cache.key("night", "track")
+    parse = lambda response: utils.parse_search_results(response, "track")
+    first = cache.fetch(key, 10, fetch, parse)
+    assert len(first['tracks']) < 10
+    cache.fetch(key, 20, fetch, parse)
+    assert calls == [10, 20]
+
+
+def test_last_page_answers_larger_limits():
+    cache, calls = SearchCache(), []
+
+    def fetch(limit):
+        calls.append(1)
+        return page([track(n) for n in range(3)], None)
+
+    key = cache.key("night", "track")
+    parse = lambda response: utils.parse_search_results(response, "track")
+    cache.fetch(key, 10, fetch, parse)
+    assert len(cache.fetch(key, 50, fetch, parse)['tracks']) == 3
+    assert calls == [1]
+
+
+def test_search_without_limit_uses_default(spotify):
+    results = spotify.search.search("night", "track", limit=None)
+    assert len(results['tracks']) == 10
+    assert spotify.search.search("night", "track", limit=5)['tracks'] == results['tracks'][:5]
+
+
+def concurrent_fetches(cache, first, limits, fetch, ready):
+    """Fetch "night" with limit `first`, then with each of `limits` on its own thread while the
+    first request is upstream; release it once `ready()` and return the results by limit."""
+    key = cache.key("night", "track")
+    parse = lambda response: utils.parse_search_results(response, "track")
+    results = {}
+    leader = threading.Thread(target=lambda: results.__setitem__(first, cache.fetch(key, first, fetch, parse)))
+    leader.start()
+    while not fetch.calls:
+        time.sleep(0.001)
+    threads = [threading.Thread(target=lambda n=n: results.__setitem__(n, cache.fetch(key, n, fetch, parse))) for n in limits]
+    for thread in threads:
+        thread.start()
+    while not ready():
+        time.sleep(0.001)
+    fetch.released.set()
+    for thread in [leader, *threads]:
+        thread.join()
+    return results
+
+
+class Upstream:
+    """A search endpoint that blocks until released and records the limits it was asked for."""
+
+    def __init__(self):
+        self.calls = []
+        self.released = threading.Event()
+
+    def __call__(self, limit):
+        self.calls.append(limit)
+        self.released.wait()
+        return page([track(n) for n in range(limit)], "https://api.spotify.com/v1/search?offset=50")
+
+
+def test_concurrent_searches_with_different_limits_share_one_request():
+    cache, fetch = SearchCache(), Upstream()
+    results = concurrent_fetches(cache, 20, [5, 10, 20], fetch, ready=lambda: cache.flights.shared == 3)
+    assert fetch.calls == [20]
+    assert {n: len(r['tracks']) for n, r in results.items()} == {5: 5, 10: 10, 20: 20}
+
+
+def test_larger_searches_queued_behind_a_flight_fetch_once_with_the_largest_limit():
+    cache, fetch = SearchCache(), Upstream()
+    key = cache.key("night", "track")
+    results = concurrent_fetches(cache, 10, [30, 40, 20], fetch, ready=lambda: cache.flights._wanted.get(key) == 40)
+    assert fetch.calls == [10, 40]
+    assert {n: len(r['tracks']) for n, r in results.items()} == {10: 10, 20: 20, 30: 30, 40: 40}
@@ -0,0 +1,24 @@
+import asyncio
+
+from spotify_mcp import server
+
+
+def call(name, arguments):
+    return asyncio.run(server.handle_call_tool(name, arguments))
+
+
+def test_unknown_tool_returns_error_text():
+    result = call("SpotifyNope", {"action": "get"})
+    assert result[0].text == "Unknown tool: SpotifyNope"
+
+
+def test_unknown_action_returns_error_text():
+    result = call("SpotifyQueue", {"action": "nope"})
+    assert result[0].text.startswith("Unknown action 'nope' for SpotifyQueue")
+
+
+def test_unauthorized_user_returns_error_text(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "request_user", lambda: "nobody")
+    monkeypatch.setattr(server.pool, "token_dir", str(tmp_path))
+    result = call("SpotifyQueue", {"action": "get"})
+    assert result[0].text.startswith("Spotify user 'nobody' is not authorized")
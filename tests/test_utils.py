@@ -0,0 +1,102 @@
+import pytest
+
+from spotify_mcp import utils
+
+
+def track_with(fixtures, artists):
+    """A raw catalog track credited to `artists` artists."""
+    return next(t for t in fixtures.tracks.values() if len(t['artists']) == artists)
+
+
+def test_compact_track_collapses_a_single_artist(fixtures):
+    raw = track_with(fixtures, 1)
+    assert utils.parser('track')(raw) == {'name': raw['name'], 'id': raw['id'], 'artist': raw['artists'][0]['name']}
+
+
+def test_compact_track_lists_several_artists_by_name(fixtures):
+    raw = track_with(fixtures, 2)
+    assert utils.parse_track(raw)['artists'] == [a['name'] for a in raw['artists']]
+
+
+def test_detailed_track_adds_album_and_artist_records(fixtures):
+    raw = track_with(fixtures, 2)
+    info = utils.parser('track', detailed=True)(raw)
+    assert list(info) == ['name', 'id', 'album', 'track_number', 'duration_ms', 'artists']
+    assert info['album'] == utils.parse_album(raw['album'])
+    assert [a['id'] for a in info['artists']] == [a['id'] for a in raw['artists']]
+    assert info['artists'][0]['top_tracks'] == []
+
+    single = utils.parse_track(track_with(fixtures, 1), detailed=True)
+    assert isinstance(single['artist'], str)
+
+
+def test_is_playable_only_reported_when_false(fixtures):
+    raw = track_with(fixtures, 1)
+    assert 'is_playable' not in utils.parse_track({**raw, 'is_playable': True})
+    for detailed in (False, True):
+        assert utils.parse_track({**raw, 'is_playable': False}, detailed)['is_playable'] is False
+
+
+def test_is_playing_kept(fixtures):
+    info = utils.parse_track({**track_with(fixtures, 1), 'is_playing': True})
+    assert list(info)[:3] == ['name', 'id', 'is_playing']
+
+
+def test_empty_items_parse_to_none():
+    for model in ('track', 'artist', 'playlist', 'album'):
+        for detailed in (False, True):
+            assert utils.parser(model, detailed)(None) is None
+    assert utils.parse_playlist_item(None) is None
+
+
+def test_playlist_tracks_skip_null_items_and_removed_tracks(fixtures):
+    items = fixtures.playlist_items["big"][:3]
+    parsed = utils.parse_playlist_tracks([items[0], None, {'track': None}, items[1], {}, items[2]])
+    assert [t['id'] for t in parsed] == [item['track']['id'] for item in items]
+
+
+def test_playlist_keeps_snapshot_when_present(fixtures):
+    header = fixtures._playlist_header("big")
+    info = utils.parse_playlist(header)
+    assert info['tracks_total'] == len(fixtures.playlist_items["big"])
+    assert info['snapshot_id'] == header['snapshot_id']
+    assert 'snapshot_id' not in utils.parse_playlist({k: v for k, v in header.items() if k != 'snapshot_id'})
+
+
+def test_search_results_by_qtype(fixtures):
+    results = fixtures._search({'q': '', 'type': 'track,artist', 'limit': 3})
+    results['artists']['items'].append(None)
+    parsed = utils.parse_search_results(results, "track,artist")
+    assert set(parsed) == {'tracks', 'artists'}
+    assert len(parsed['tracks']) == 3
+    assert parsed['artists'] == [utils.parse_artist(a) for a in results['artists']['items'][:3]]
+
+
+def test_search_results_drop_empty_result_keys(fixtures):
+    results = {'albums': {'items': [None]}}
+    assert utils.parse_search_results(results, "album") == {}
+
+
+def test_search_plan_rejects_unknown_qtype():
+    with pytest.raises(ValueError, match="unknown qtype track,episode"):
+        utils.parse_search_results({}, "track,episode")
+
+
+def test_project_fields_narrows_records_and_recurses():
+    data = {
+        'playlists': [{
+            'id': "p1", 'name': "Mix", 'owner': "me",
+            'tracks': [{'id': "t1", 'name': "Song", 'artist': "A"}, {'id': "t2", 'error': "not found"}],
+        }],
+        'total': 1,
+    }
+    assert utils.project_fields(data, ['id', 'tracks']) == {
+        'playlists': [{'id': "p1", 'tracks': [{'id': "t1"}, {'id': "t2", 'error': "not found"}]}],
+        'total': 1,
+    }
+
+
+def test_project_fields_without_fields_returns_data_as_is():
+    data = [{'id': "t1", 'name': "Song"}]
+    assert utils.project_fields(data, None) is data
+    assert utils.project_fields(data, []) is data